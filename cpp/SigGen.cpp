@@ -279,6 +279,13 @@ int SigGen_i::serviceFunction()
 		Waveform::whitenoise(floatData, magnitude, cache.xfer_len, 1);
 	} else if (cache.shape == "lrs") {
 		Waveform::lrs(floatData, magnitude, cache.xfer_len, 1, 1);
+	} else {
+		// The other shapes are only generated by the python implementation
+		if (cache.shape != unsupported_shape) {
+			LOG_WARN(SigGen_i, "Shape " << cache.shape << " is not supported by this implementation; no output");
+			unsupported_shape = cache.shape;
+		}
+		return NOOP;
 	}
 
 	phase += delta_phase * cache.xfer_len; // increment phase
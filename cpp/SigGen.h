@@ -64,6 +64,7 @@ class SigGen_i : public SigGen_base
         boost::mutex sigGenLock_;
         bool stream_created;
         std::string eos_stream_id;
+        std::string unsupported_shape;
 
         void stream_idChanged(const std::string *oldValue, const std::string *newValue);
         void keywordUpdate(const double *oldValue, const double *newValue);
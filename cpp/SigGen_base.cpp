@@ -37,6 +37,10 @@ SigGen_base::SigGen_base(const char *uuid, const char *label) :
     addPort("dataFloat_out", dataFloat_out);
     dataShort_out = new bulkio::OutShortPort("dataShort_out");
     addPort("dataShort_out", dataShort_out);
+    dataOctet_out = new bulkio::OutOctetPort("dataOctet_out");
+    addPort("dataOctet_out", dataOctet_out);
+    dataDouble_out = new bulkio::OutDoublePort("dataDouble_out");
+    addPort("dataDouble_out", dataDouble_out);
 }
 
 SigGen_base::~SigGen_base()
@@ -45,6 +49,10 @@ SigGen_base::~SigGen_base()
     dataFloat_out = 0;
     delete dataShort_out;
     dataShort_out = 0;
+    delete dataOctet_out;
+    dataOctet_out = 0;
+    delete dataDouble_out;
+    dataDouble_out = 0;
 }
 
 /*******************************************************************************************
@@ -169,6 +177,289 @@ void SigGen_base::loadProperties()
                 "external",
                 "configure");
 
+    addProperty(noise_generator,
+                "legacy",
+                "noise_generator",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(seed,
+                123456789,
+                "seed",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(throttle_spin,
+                false,
+                "throttle_spin",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(throttle_rate_error,
+                0.0,
+                "throttle_rate_error",
+                "",
+                "readonly",
+                "ppm",
+                "external",
+                "configure");
+
+    addProperty(workers,
+                1,
+                "workers",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(complex,
+                false,
+                "complex",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(stats_enabled,
+                false,
+                "stats_enabled",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(stats_log_interval,
+                0.0,
+                "stats_log_interval",
+                "",
+                "readwrite",
+                "s",
+                "external",
+                "configure");
+
+    addProperty(stats,
+                stats_struct(),
+                "stats",
+                "",
+                "readonly",
+                "",
+                "external",
+                "configure");
+
+    addProperty(file_path,
+                "",
+                "file_path",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(file_format,
+                "auto",
+                "file_format",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(file_loop,
+                true,
+                "file_loop",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(awg_table,
+                "awg_table",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(awg_file,
+                "",
+                "awg_file",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(chirp_start,
+                0.0,
+                "chirp_start",
+                "",
+                "readwrite",
+                "Hz",
+                "external",
+                "configure");
+
+    addProperty(chirp_stop,
+                1000.0,
+                "chirp_stop",
+                "",
+                "readwrite",
+                "Hz",
+                "external",
+                "configure");
+
+    addProperty(chirp_period,
+                1.0,
+                "chirp_period",
+                "",
+                "readwrite",
+                "s",
+                "external",
+                "configure");
+
+    addProperty(multitone_frequencies,
+                "multitone_frequencies",
+                "",
+                "readwrite",
+                "Hz",
+                "external",
+                "configure");
+
+    addProperty(multitone_amplitudes,
+                "multitone_amplitudes",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(multitone_phases,
+                "multitone_phases",
+                "",
+                "readwrite",
+                "rad",
+                "external",
+                "configure");
+
+    addProperty(band_limited,
+                false,
+                "band_limited",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(modulation_message,
+                "tone",
+                "modulation_message",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(message_frequency,
+                100.0,
+                "message_frequency",
+                "",
+                "readwrite",
+                "Hz",
+                "external",
+                "configure");
+
+    addProperty(modulation_index,
+                0.5,
+                "modulation_index",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(rolloff,
+                0.35,
+                "rolloff",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(add_noise,
+                false,
+                "add_noise",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(snr,
+                20.0,
+                "snr",
+                "",
+                "readwrite",
+                "dB",
+                "external",
+                "configure");
+
+    addProperty(channels,
+                "channels",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(pipeline_depth,
+                0,
+                "pipeline_depth",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(xfer_len_autotune,
+                "off",
+                "xfer_len_autotune",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "configure");
+
+    addProperty(latency_budget,
+                0.01,
+                "latency_budget",
+                "",
+                "readwrite",
+                "s",
+                "external",
+                "configure");
+
+    addProperty(autotuned_xfer_len,
+                0,
+                "autotuned_xfer_len",
+                "",
+                "readonly",
+                "",
+                "external",
+                "configure");
+
 }
 
 
@@ -23,6 +23,7 @@
 #include <ossie/ThreadedComponent.h>
 
 #include <bulkio/bulkio.h>
+#include "struct_props.h"
 
 class SigGen_base : public Resource_impl, protected ThreadedComponent
 {
@@ -50,10 +51,44 @@ class SigGen_base : public Resource_impl, protected ThreadedComponent
         double chan_rf;
         double col_rf;
         bool sri_blocking;
+        std::string noise_generator;
+        CORBA::Long seed;
+        bool throttle_spin;
+        double throttle_rate_error;
+        CORBA::Long workers;
+        bool complex;
+        bool stats_enabled;
+        double stats_log_interval;
+        stats_struct stats;
+        std::string file_path;
+        std::string file_format;
+        bool file_loop;
+        std::vector<double> awg_table;
+        std::string awg_file;
+        double chirp_start;
+        double chirp_stop;
+        double chirp_period;
+        std::vector<double> multitone_frequencies;
+        std::vector<double> multitone_amplitudes;
+        std::vector<double> multitone_phases;
+        bool band_limited;
+        std::string modulation_message;
+        double message_frequency;
+        double modulation_index;
+        double rolloff;
+        bool add_noise;
+        double snr;
+        std::vector<channel_struct> channels;
+        CORBA::Long pipeline_depth;
+        std::string xfer_len_autotune;
+        double latency_budget;
+        CORBA::Long autotuned_xfer_len;
 
         // Ports
         bulkio::OutFloatPort *dataFloat_out;
         bulkio::OutShortPort *dataShort_out;
+        bulkio::OutOctetPort *dataOctet_out;
+        bulkio::OutDoublePort *dataDouble_out;
 
     private:
 };
@@ -0,0 +1,262 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+ * source distribution.
+ *
+ * This file is part of REDHAWK Basic Components SigGen.
+ *
+ * REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+ * the GNU Lesser General Public License as published by the Free Software Foundation, either
+ * version 3 of the License, or (at your option) any later version.
+ *
+ * REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License along with this
+ * program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef STRUCTPROPS_H
+#define STRUCTPROPS_H
+
+/*******************************************************************************************
+
+    AUTO-GENERATED CODE. DO NOT MODIFY
+
+*******************************************************************************************/
+
+#include <ossie/CorbaUtils.h>
+#include <CF/cf.h>
+#include <ossie/PropertyMap.h>
+
+struct stats_struct {
+    stats_struct ()
+    {
+        packets = 0LL;
+        samples = 0LL;
+        generate_time = 0.0;
+        convert_time = 0.0;
+        push_float_time = 0.0;
+        push_short_time = 0.0;
+        push_octet_time = 0.0;
+        push_double_time = 0.0;
+        sleep_time = 0.0;
+        late_packets = 0;
+        resyncs = 0;
+        pipeline_occupancy = 0.0;
+        pipeline_wait_time = 0.0;
+        elapsed_time = 0.0;
+        achieved_rate = 0.0;
+        configured_rate = 0.0;
+    }
+
+    static std::string getId() {
+        return std::string("stats");
+    }
+
+    static const char* getFormat() {
+        return "QQdddddddIIddddd";
+    }
+
+    CORBA::ULongLong packets;
+    CORBA::ULongLong samples;
+    double generate_time;
+    double convert_time;
+    double push_float_time;
+    double push_short_time;
+    double push_octet_time;
+    double push_double_time;
+    double sleep_time;
+    CORBA::ULong late_packets;
+    CORBA::ULong resyncs;
+    double pipeline_occupancy;
+    double pipeline_wait_time;
+    double elapsed_time;
+    double achieved_rate;
+    double configured_rate;
+};
+
+inline bool operator>>= (const CORBA::Any& a, stats_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("stats::packets")) {
+        if (!(props["stats::packets"] >>= s.packets)) return false;
+    }
+    if (props.contains("stats::samples")) {
+        if (!(props["stats::samples"] >>= s.samples)) return false;
+    }
+    if (props.contains("stats::generate_time")) {
+        if (!(props["stats::generate_time"] >>= s.generate_time)) return false;
+    }
+    if (props.contains("stats::convert_time")) {
+        if (!(props["stats::convert_time"] >>= s.convert_time)) return false;
+    }
+    if (props.contains("stats::push_float_time")) {
+        if (!(props["stats::push_float_time"] >>= s.push_float_time)) return false;
+    }
+    if (props.contains("stats::push_short_time")) {
+        if (!(props["stats::push_short_time"] >>= s.push_short_time)) return false;
+    }
+    if (props.contains("stats::push_octet_time")) {
+        if (!(props["stats::push_octet_time"] >>= s.push_octet_time)) return false;
+    }
+    if (props.contains("stats::push_double_time")) {
+        if (!(props["stats::push_double_time"] >>= s.push_double_time)) return false;
+    }
+    if (props.contains("stats::sleep_time")) {
+        if (!(props["stats::sleep_time"] >>= s.sleep_time)) return false;
+    }
+    if (props.contains("stats::late_packets")) {
+        if (!(props["stats::late_packets"] >>= s.late_packets)) return false;
+    }
+    if (props.contains("stats::resyncs")) {
+        if (!(props["stats::resyncs"] >>= s.resyncs)) return false;
+    }
+    if (props.contains("stats::pipeline_occupancy")) {
+        if (!(props["stats::pipeline_occupancy"] >>= s.pipeline_occupancy)) return false;
+    }
+    if (props.contains("stats::pipeline_wait_time")) {
+        if (!(props["stats::pipeline_wait_time"] >>= s.pipeline_wait_time)) return false;
+    }
+    if (props.contains("stats::elapsed_time")) {
+        if (!(props["stats::elapsed_time"] >>= s.elapsed_time)) return false;
+    }
+    if (props.contains("stats::achieved_rate")) {
+        if (!(props["stats::achieved_rate"] >>= s.achieved_rate)) return false;
+    }
+    if (props.contains("stats::configured_rate")) {
+        if (!(props["stats::configured_rate"] >>= s.configured_rate)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const stats_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["stats::packets"] = s.packets;
+    props["stats::samples"] = s.samples;
+    props["stats::generate_time"] = s.generate_time;
+    props["stats::convert_time"] = s.convert_time;
+    props["stats::push_float_time"] = s.push_float_time;
+    props["stats::push_short_time"] = s.push_short_time;
+    props["stats::push_octet_time"] = s.push_octet_time;
+    props["stats::push_double_time"] = s.push_double_time;
+    props["stats::sleep_time"] = s.sleep_time;
+    props["stats::late_packets"] = s.late_packets;
+    props["stats::resyncs"] = s.resyncs;
+    props["stats::pipeline_occupancy"] = s.pipeline_occupancy;
+    props["stats::pipeline_wait_time"] = s.pipeline_wait_time;
+    props["stats::elapsed_time"] = s.elapsed_time;
+    props["stats::achieved_rate"] = s.achieved_rate;
+    props["stats::configured_rate"] = s.configured_rate;
+    a <<= props;
+}
+
+inline bool operator== (const stats_struct& s1, const stats_struct& s2) {
+    if (s1.packets!=s2.packets)
+        return false;
+    if (s1.samples!=s2.samples)
+        return false;
+    if (s1.generate_time!=s2.generate_time)
+        return false;
+    if (s1.convert_time!=s2.convert_time)
+        return false;
+    if (s1.push_float_time!=s2.push_float_time)
+        return false;
+    if (s1.push_short_time!=s2.push_short_time)
+        return false;
+    if (s1.push_octet_time!=s2.push_octet_time)
+        return false;
+    if (s1.push_double_time!=s2.push_double_time)
+        return false;
+    if (s1.sleep_time!=s2.sleep_time)
+        return false;
+    if (s1.late_packets!=s2.late_packets)
+        return false;
+    if (s1.resyncs!=s2.resyncs)
+        return false;
+    if (s1.pipeline_occupancy!=s2.pipeline_occupancy)
+        return false;
+    if (s1.pipeline_wait_time!=s2.pipeline_wait_time)
+        return false;
+    if (s1.elapsed_time!=s2.elapsed_time)
+        return false;
+    if (s1.achieved_rate!=s2.achieved_rate)
+        return false;
+    if (s1.configured_rate!=s2.configured_rate)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const stats_struct& s1, const stats_struct& s2) {
+    return !(s1==s2);
+}
+
+struct channel_struct {
+    channel_struct ()
+    {
+        shape = "sine";
+        frequency = 1000.0;
+        magnitude = 100.0;
+        stream_id = "";
+    }
+
+    static std::string getId() {
+        return std::string("channels::channel");
+    }
+
+    static const char* getFormat() {
+        return "sdds";
+    }
+
+    std::string shape;
+    double frequency;
+    double magnitude;
+    std::string stream_id;
+};
+
+inline bool operator>>= (const CORBA::Any& a, channel_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("channels::shape")) {
+        if (!(props["channels::shape"] >>= s.shape)) return false;
+    }
+    if (props.contains("channels::frequency")) {
+        if (!(props["channels::frequency"] >>= s.frequency)) return false;
+    }
+    if (props.contains("channels::magnitude")) {
+        if (!(props["channels::magnitude"] >>= s.magnitude)) return false;
+    }
+    if (props.contains("channels::stream_id")) {
+        if (!(props["channels::stream_id"] >>= s.stream_id)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const channel_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["channels::shape"] = s.shape;
+    props["channels::frequency"] = s.frequency;
+    props["channels::magnitude"] = s.magnitude;
+    props["channels::stream_id"] = s.stream_id;
+    a <<= props;
+}
+
+inline bool operator== (const channel_struct& s1, const channel_struct& s2) {
+    if (s1.shape!=s2.shape)
+        return false;
+    if (s1.frequency!=s2.frequency)
+        return false;
+    if (s1.magnitude!=s2.magnitude)
+        return false;
+    if (s1.stream_id!=s2.stream_id)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const channel_struct& s1, const channel_struct& s2) {
+    return !(s1==s2);
+}
+#endif // STRUCTPROPS_H
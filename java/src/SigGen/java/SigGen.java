@@ -51,6 +51,7 @@ public class SigGen extends SigGen_base {
 	
 	private String cached_stream_id;
 	private Boolean stream_created;
+	private String unsupported_shape;
     
 	/**
      * This is the component constructor. In this method, you may add additional
@@ -324,6 +325,13 @@ public class SigGen extends SigGen_base {
 				Waveform.whitenoise(floatData, this.magnitude.getValue(), floatData.length, 1);
 			} else if (this.shape.getValue().equals("lrs")) {
 				Waveform.lrs(floatData, this.magnitude.getValue(), floatData.length, 1, 1);
+			} else {
+				// The other shapes are only generated by the python implementation
+				if (!this.shape.getValue().equals(unsupported_shape)) {
+					logger.warn("Shape " + this.shape.getValue() + " is not supported by this implementation; no output");
+					unsupported_shape = this.shape.getValue();
+				}
+				return NOOP;
 			}
 
 			phase += delta_phase*floatData.length; // increment phase
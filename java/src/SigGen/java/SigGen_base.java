@@ -207,6 +207,840 @@ public abstract class SigGen_base extends ThreadedResource {
             new Kind[] {Kind.CONFIGURE} //kind
             );
     
+    /**
+     * The property noise_generator
+     * Random number generator used by the whitenoise shape. legacy is the original LCG and polar method; pcg64 and philox use numpy.random.Generator, which needs numpy 1.17 or later; with an older numpy they are not available and legacy is used instead, with a warning.
+     *
+     * @generated
+     */
+    public final StringProperty noise_generator =
+        new StringProperty(
+            "noise_generator", //id
+            null, //name
+            "legacy", //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property seed
+     * Seed for the whitenoise generator. Changing this property or noise_generator restarts the noise from this seed. Values less than 1 are ignored.
+     *
+     * @generated
+     */
+    public final LongProperty seed =
+        new LongProperty(
+            "seed", //id
+            null, //name
+            123456789, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property throttle_spin
+     * When throttling, busy wait for the last few milliseconds before each packet is due instead of sleeping. Improves pacing of short packets at the cost of CPU.
+     *
+     * @generated
+     */
+    public final BooleanProperty throttle_spin =
+        new BooleanProperty(
+            "throttle_spin", //id
+            null, //name
+            false, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property throttle_rate_error
+     * Difference between the achieved output rate and sample_rate while throttling, in parts per million of sample_rate, measured since throttling last started. Negative when the output is slower than sample_rate.
+     *
+     * @generated
+     */
+    public final DoubleProperty throttle_rate_error =
+        new DoubleProperty(
+            "throttle_rate_error", //id
+            null, //name
+            0.0, //default value
+            Mode.READONLY, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property workers
+     * Number of worker threads generating packets ahead of the output. With more than one worker, up to twice this many packets are generated ahead and pushed in order; whitenoise blocks then come from independent jumped-ahead generator streams (except for the legacy generator, which stays sequential).
+     *
+     * @generated
+     */
+    public final LongProperty workers =
+        new LongProperty(
+            "workers", //id
+            null, //name
+            1, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property complex
+     * Output complex data: each of the xfer_len samples in a packet is an interleaved I/Q pair and the SRI mode is set to 1. The sine shape is a complex exponential, so a negative frequency is a negative frequency tone.
+     *
+     * @generated
+     */
+    public final BooleanProperty complex =
+        new BooleanProperty(
+            "complex", //id
+            null, //name
+            false, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property stats_enabled
+     * Keep the timing and packet counters reported by the stats property. Counting costs about 0.2 us per packet: around 1.5% of the output loop at an xfer_len of 100, under 1% from 1000 samples up.
+     *
+     * @generated
+     */
+    public final BooleanProperty stats_enabled =
+        new BooleanProperty(
+            "stats_enabled", //id
+            null, //name
+            false, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property stats_log_interval
+     * Interval between log lines summarizing the stats counters, in seconds. 0 disables the log.
+     *
+     * @generated
+     */
+    public final DoubleProperty stats_log_interval =
+        new DoubleProperty(
+            "stats_log_interval", //id
+            null, //name
+            0.0, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The structure for property stats
+     * 
+     * @generated
+     */
+    public static class stats_struct extends StructDef {
+        /**
+         * @generated
+         */
+        public final ULongLongProperty packets =
+            new ULongLongProperty(
+                "stats::packets", //id
+                "packets", //name
+                0L, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final ULongLongProperty samples =
+            new ULongLongProperty(
+                "stats::samples", //id
+                "samples", //name
+                0L, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty generate_time =
+            new DoubleProperty(
+                "stats::generate_time", //id
+                "generate_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty convert_time =
+            new DoubleProperty(
+                "stats::convert_time", //id
+                "convert_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty push_float_time =
+            new DoubleProperty(
+                "stats::push_float_time", //id
+                "push_float_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty push_short_time =
+            new DoubleProperty(
+                "stats::push_short_time", //id
+                "push_short_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty push_octet_time =
+            new DoubleProperty(
+                "stats::push_octet_time", //id
+                "push_octet_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty push_double_time =
+            new DoubleProperty(
+                "stats::push_double_time", //id
+                "push_double_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty sleep_time =
+            new DoubleProperty(
+                "stats::sleep_time", //id
+                "sleep_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final ULongProperty late_packets =
+            new ULongProperty(
+                "stats::late_packets", //id
+                "late_packets", //name
+                0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final ULongProperty resyncs =
+            new ULongProperty(
+                "stats::resyncs", //id
+                "resyncs", //name
+                0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty pipeline_occupancy =
+            new DoubleProperty(
+                "stats::pipeline_occupancy", //id
+                "pipeline_occupancy", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty pipeline_wait_time =
+            new DoubleProperty(
+                "stats::pipeline_wait_time", //id
+                "pipeline_wait_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty elapsed_time =
+            new DoubleProperty(
+                "stats::elapsed_time", //id
+                "elapsed_time", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty achieved_rate =
+            new DoubleProperty(
+                "stats::achieved_rate", //id
+                "achieved_rate", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty configured_rate =
+            new DoubleProperty(
+                "stats::configured_rate", //id
+                "configured_rate", //name
+                0.0, //default value
+                Mode.READONLY, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public stats_struct() {
+            addElement(this.packets);
+            addElement(this.samples);
+            addElement(this.generate_time);
+            addElement(this.convert_time);
+            addElement(this.push_float_time);
+            addElement(this.push_short_time);
+            addElement(this.push_octet_time);
+            addElement(this.push_double_time);
+            addElement(this.sleep_time);
+            addElement(this.late_packets);
+            addElement(this.resyncs);
+            addElement(this.pipeline_occupancy);
+            addElement(this.pipeline_wait_time);
+            addElement(this.elapsed_time);
+            addElement(this.achieved_rate);
+            addElement(this.configured_rate);
+        }
+
+        public String getId() {
+            return "stats";
+        }
+
+        public boolean isStruct() {
+            return true;
+        }
+    };
+    
+    /**
+     * The property stats
+     * Counters for the output loop since the component was last started, refreshed about twice a second while running and on stop. Stage times are totals in seconds, measured on one packet in eight and scaled to all packets.
+     *
+     * @generated
+     */
+    public final StructProperty<stats_struct> stats =
+        new StructProperty<stats_struct>(
+            "stats", //id
+            null, //name
+            stats_struct.class, //type
+            new stats_struct(), //default value
+            Mode.READONLY, //mode
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property file_path
+     * File played by the file shape: raw samples, a BLUE file or a SigMF recording (the .sigmf-data or .sigmf-meta file). The file is memory mapped, so it may be larger than memory. Complex BLUE and SigMF data is output as complex; real data is output as complex, with a zero imaginary part, when complex is set. A BLUE or SigMF file that records its sample rate is played at that rate in place of sample_rate, for the SRI xdelta, the timestamps and throttling.
+     *
+     * @generated
+     */
+    public final StringProperty file_path =
+        new StringProperty(
+            "file_path", //id
+            null, //name
+            "", //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property file_format
+     * Sample format of file_path. auto recognizes BLUE and SigMF files by their headers and reads anything else as raw float32; float32 and int16 read the whole file as raw native byte order samples.
+     *
+     * @generated
+     */
+    public final StringProperty file_format =
+        new StringProperty(
+            "file_format", //id
+            null, //name
+            "auto", //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property file_loop
+     * Restart the file shape from the beginning of the file when it reaches the end. Otherwise the last packet is short and is followed by an end of stream.
+     *
+     * @generated
+     */
+    public final BooleanProperty file_loop =
+        new BooleanProperty(
+            "file_loop", //id
+            null, //name
+            true, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property awg_table
+     * One period of the waveform played by the arbitrary shape, repeated frequency times a second and scaled by magnitude. Samples between table entries are interpolated linearly, so any repetition rate works. For complex output the table is interleaved I/Q pairs.
+     *
+     * @generated
+     */
+    public final DoubleSequenceProperty awg_table =
+        new DoubleSequenceProperty(
+            "awg_table", //id
+            null, //name
+            DoubleSequenceProperty.asList(), //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property awg_file
+     * File holding the arbitrary shape table, in any layout the file shape reads (see file_format). Used instead of awg_table when set. The whole file is loaded.
+     *
+     * @generated
+     */
+    public final StringProperty awg_file =
+        new StringProperty(
+            "awg_file", //id
+            null, //name
+            "", //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property chirp_start
+     * Frequency at the start of each sweep of the chirp shape.
+     *
+     * @generated
+     */
+    public final DoubleProperty chirp_start =
+        new DoubleProperty(
+            "chirp_start", //id
+            null, //name
+            0.0, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property chirp_stop
+     * Frequency at the end of each sweep of the chirp shape.
+     *
+     * @generated
+     */
+    public final DoubleProperty chirp_stop =
+        new DoubleProperty(
+            "chirp_stop", //id
+            null, //name
+            1000.0, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property chirp_period
+     * Duration of one sweep of the chirp shape. The frequency rises (or falls) linearly from chirp_start to chirp_stop over the period and the sweep repeats; every sweep starts at phase 0.
+     *
+     * @generated
+     */
+    public final DoubleProperty chirp_period =
+        new DoubleProperty(
+            "chirp_period", //id
+            null, //name
+            1.0, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property multitone_frequencies
+     * Tone frequencies of the multitone shape.
+     *
+     * @generated
+     */
+    public final DoubleSequenceProperty multitone_frequencies =
+        new DoubleSequenceProperty(
+            "multitone_frequencies", //id
+            null, //name
+            DoubleSequenceProperty.asList(), //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property multitone_amplitudes
+     * Amplitude of each multitone tone, relative to magnitude. Tones without an entry have amplitude 1.
+     *
+     * @generated
+     */
+    public final DoubleSequenceProperty multitone_amplitudes =
+        new DoubleSequenceProperty(
+            "multitone_amplitudes", //id
+            null, //name
+            DoubleSequenceProperty.asList(), //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property multitone_phases
+     * Starting phase of each multitone tone. Tones without an entry start at phase 0.
+     *
+     * @generated
+     */
+    public final DoubleSequenceProperty multitone_phases =
+        new DoubleSequenceProperty(
+            "multitone_phases", //id
+            null, //name
+            DoubleSequenceProperty.asList(), //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property band_limited
+     * Generate the square, triangle and sawtooth shapes band-limited (PolyBLEP), which greatly reduces aliasing at high frequencies.
+     *
+     * @generated
+     */
+    public final BooleanProperty band_limited =
+        new BooleanProperty(
+            "band_limited", //id
+            null, //name
+            false, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property modulation_message
+     * Message carried by the am, fm, pm, bpsk and qpsk shapes: a tone at message_frequency, or symbols at message_frequency symbols per second from the LRS or from white noise. The PSK shapes alternate their symbols for a tone message.
+     *
+     * @generated
+     */
+    public final StringProperty modulation_message =
+        new StringProperty(
+            "modulation_message", //id
+            null, //name
+            "tone", //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property message_frequency
+     * Frequency of the message tone, or the symbol rate, of the modulation shapes. Must be below sample_rate. The carrier is at frequency.
+     *
+     * @generated
+     */
+    public final DoubleProperty message_frequency =
+        new DoubleProperty(
+            "message_frequency", //id
+            null, //name
+            100.0, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property modulation_index
+     * Modulation depth of the am shape, peak phase deviation in radians of the pm shape, and peak frequency deviation of the fm shape as a multiple of message_frequency.
+     *
+     * @generated
+     */
+    public final DoubleProperty modulation_index =
+        new DoubleProperty(
+            "modulation_index", //id
+            null, //name
+            0.5, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property rolloff
+     * Excess bandwidth of the root raised cosine pulse that shapes the symbols of the modulation shapes, from 0 to 1.
+     *
+     * @generated
+     */
+    public final DoubleProperty rolloff =
+        new DoubleProperty(
+            "rolloff", //id
+            null, //name
+            0.35, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property add_noise
+     * Add white noise to the output of any shape, at the SNR given by snr. The noise comes from the noise_generator and seed used by the whitenoise shape.
+     *
+     * @generated
+     */
+    public final BooleanProperty add_noise =
+        new BooleanProperty(
+            "add_noise", //id
+            null, //name
+            false, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property snr
+     * Signal to noise ratio of the noise added by add_noise, relative to the mean power of the shape. The power is worked out from magnitude for the periodic, noise and multitone shapes and measured block by block for file, arbitrary, am, bpsk and qpsk.
+     *
+     * @generated
+     */
+    public final DoubleProperty snr =
+        new DoubleProperty(
+            "snr", //id
+            null, //name
+            20.0, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The structure for property channel
+     * 
+     * @generated
+     */
+    public static class channel_struct extends StructDef {
+        /**
+         * @generated
+         */
+        public final StringProperty shape =
+            new StringProperty(
+                "channels::shape", //id
+                "shape", //name
+                "sine", //default value
+                Mode.READWRITE, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty frequency =
+            new DoubleProperty(
+                "channels::frequency", //id
+                "frequency", //name
+                1000.0, //default value
+                Mode.READWRITE, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final DoubleProperty magnitude =
+            new DoubleProperty(
+                "channels::magnitude", //id
+                "magnitude", //name
+                100.0, //default value
+                Mode.READWRITE, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public final StringProperty stream_id =
+            new StringProperty(
+                "channels::stream_id", //id
+                "stream_id", //name
+                "", //default value
+                Mode.READWRITE, //mode
+                Action.EXTERNAL, //action
+                new Kind[] {Kind.CONFIGURE} //kind
+                );
+    
+        /**
+         * @generated
+         */
+        public channel_struct() {
+            addElement(this.shape);
+            addElement(this.frequency);
+            addElement(this.magnitude);
+            addElement(this.stream_id);
+        }
+
+        public String getId() {
+            return "channels::channel";
+        }
+
+        public boolean isStruct() {
+            return true;
+        }
+    };
+    
+    /**
+     * The property channels
+     * Channels generated together in multi-channel mode. When the sequence is not empty, each channel is generated at sample_rate with xfer_len samples per packet and pushed on its own stream, in place of the single shape.
+     *
+     * @generated
+     */
+    public final StructSequenceProperty<channel_struct> channels =
+        new StructSequenceProperty<channel_struct> (
+            "channels", //id
+            null, //name
+            channel_struct.class, //type
+            StructSequenceProperty.<channel_struct>asList(), //defaultValue
+            Mode.READWRITE, //mode
+            new Kind[] {Kind.CONFIGURE} //kind
+        );
+    
+    /**
+     * The property pipeline_depth
+     * Number of packets a dedicated generator thread keeps ready ahead of the output. While pushPacket is blocked on a slow consumer, the next packets are being generated. 0 generates each packet on the processing thread just before it is pushed. Not used in multi-channel mode.
+     *
+     * @generated
+     */
+    public final LongProperty pipeline_depth =
+        new LongProperty(
+            "pipeline_depth", //id
+            null, //name
+            0, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property xfer_len_autotune
+     * Choose the packet size at run time instead of using xfer_len. The output runs briefly at a series of power of two packet sizes and times each. latency picks the largest size whose packets span and are produced within latency_budget, trying sizes from the largest that spans latency_budget down, so the output never runs at a larger size. throughput picks the smallest size within 5% of the best samples per second. Tuning starts over when the shape, rate or output configuration changes.
+     *
+     * @generated
+     */
+    public final StringProperty xfer_len_autotune =
+        new StringProperty(
+            "xfer_len_autotune", //id
+            null, //name
+            "off", //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property latency_budget
+     * Longest time from the first sample of a packet falling due to the packet being pushed, for the latency autotune mode.
+     *
+     * @generated
+     */
+    public final DoubleProperty latency_budget =
+        new DoubleProperty(
+            "latency_budget", //id
+            null, //name
+            0.01, //default value
+            Mode.READWRITE, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
+    /**
+     * The property autotuned_xfer_len
+     * Packet size in use while xfer_len_autotune is on: the size being tried, then the size chosen. 0 when autotuning is off.
+     *
+     * @generated
+     */
+    public final LongProperty autotuned_xfer_len =
+        new LongProperty(
+            "autotuned_xfer_len", //id
+            null, //name
+            0, //default value
+            Mode.READONLY, //mode
+            Action.EXTERNAL, //action
+            new Kind[] {Kind.CONFIGURE} //kind
+            );
+    
     // Uses/outputs
     /**
      * @generated
@@ -218,6 +1052,16 @@ public abstract class SigGen_base extends ThreadedResource {
      */
     public bulkio.OutShortPort port_dataShort_out;
 
+    /**
+     * @generated
+     */
+    public bulkio.OutOctetPort port_dataOctet_out;
+
+    /**
+     * @generated
+     */
+    public bulkio.OutDoublePort port_dataDouble_out;
+
     /**
      * @generated
      */
@@ -236,12 +1080,48 @@ public abstract class SigGen_base extends ThreadedResource {
         addProperty(chan_rf);
         addProperty(col_rf);
         addProperty(sri_blocking);
+        addProperty(noise_generator);
+        addProperty(seed);
+        addProperty(throttle_spin);
+        addProperty(throttle_rate_error);
+        addProperty(workers);
+        addProperty(complex);
+        addProperty(stats_enabled);
+        addProperty(stats_log_interval);
+        addProperty(stats);
+        addProperty(file_path);
+        addProperty(file_format);
+        addProperty(file_loop);
+        addProperty(awg_table);
+        addProperty(awg_file);
+        addProperty(chirp_start);
+        addProperty(chirp_stop);
+        addProperty(chirp_period);
+        addProperty(multitone_frequencies);
+        addProperty(multitone_amplitudes);
+        addProperty(multitone_phases);
+        addProperty(band_limited);
+        addProperty(modulation_message);
+        addProperty(message_frequency);
+        addProperty(modulation_index);
+        addProperty(rolloff);
+        addProperty(add_noise);
+        addProperty(snr);
+        addProperty(channels);
+        addProperty(pipeline_depth);
+        addProperty(xfer_len_autotune);
+        addProperty(latency_budget);
+        addProperty(autotuned_xfer_len);
 
         // Uses/outputs
         this.port_dataFloat_out = new bulkio.OutFloatPort("dataFloat_out");
         this.addPort("dataFloat_out", this.port_dataFloat_out);
         this.port_dataShort_out = new bulkio.OutShortPort("dataShort_out");
         this.addPort("dataShort_out", this.port_dataShort_out);
+        this.port_dataOctet_out = new bulkio.OutOctetPort("dataOctet_out");
+        this.addPort("dataOctet_out", this.port_dataOctet_out);
+        this.port_dataDouble_out = new bulkio.OutDoublePort("dataDouble_out");
+        this.addPort("dataDouble_out", this.port_dataDouble_out);
     }
 
     public void start() throws CF.ResourcePackage.StartError
@@ -0,0 +1,149 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Packet size tuning for the xfer_len_autotune modes.
+
+The tuner runs the output at a series of power of two packet sizes and
+times a few packets at each: the time from the end of one packet's throttle
+wait to the start of the next, which covers generating, converting and
+pushing it.  From those costs it picks
+
+ - latency     the largest size whose packets are produced within the
+               latency budget, counting the time the packet spans
+               (xfer_len/sample_rate) as well as the time to produce it.
+               Tuning starts from the largest size that spans no more
+               than the budget and works down, stopping at the first that
+               fits, so no packet spans more than the budget.
+ - throughput  the smallest size within TOLERANCE of the best samples per
+               second measured, as larger packets only add burstiness
+
+A straight line fitted through the costs splits them into the fixed per
+packet overhead (CORBA, SRI, the loop itself) and the per sample cost.
+'''
+import time
+import numpy as np
+
+# time.perf_counter is not available before python 3.3
+_clock = getattr(time, "perf_counter", time.time)
+
+MODES = ("off", "latency", "throughput")
+
+class Tuner:
+    MIN_XFER_LEN = 64
+    MAX_XFER_LEN = 2**18
+    # Packets run at each size before timing starts, and packets timed
+    WARMUP = 2
+    PROBE_PACKETS = 8
+    # Sizes within this fraction of the best throughput count as as good
+    TOLERANCE = 0.05
+
+    # @param mode         "latency" or "throughput"
+    # @param sample_rate  Sample rate, Hz
+    # @param budget       Latency budget, seconds, for the latency mode
+    # @param max_duration Longest time one packet may span, seconds, or
+    #                     None; bounds the sizes tried when throttling
+    def __init__(self, mode, sample_rate, budget=0.0, max_duration=None, clock=_clock):
+        if mode not in MODES[1:]:
+            raise ValueError("Unknown autotune mode '%s'" % mode)
+        self.mode = mode
+        self.sample_rate = float(sample_rate)
+        self.budget = budget
+        self._clock = clock
+        limit = self.MAX_XFER_LEN
+        if mode == "latency":
+            limit = min(limit, int(budget*self.sample_rate))
+        if max_duration:
+            limit = min(limit, int(max_duration*self.sample_rate))
+        self.candidates = [self.MIN_XFER_LEN]
+        while self.candidates[-1]*2 <= limit:
+            self.candidates.append(self.candidates[-1]*2)
+        # The sizes in the order they are tried
+        self._order = self.candidates
+        if mode == "latency":
+            self._order = self.candidates[::-1]
+        # Median seconds per packet at each size tried
+        self.costs = {}
+        self.xfer_len = self._order[0]
+        self.done = False
+        self._times = []
+        self._mark = None
+
+    # Start timing a packet: called once the previous one has gone out
+    def resume(self):
+        if not self.done:
+            self._mark = self._clock()
+
+    # Finish timing a packet, before any throttle wait.  Packets of another
+    # size (from before a change took effect, or the short last packet of
+    # a file) are not counted.  Once enough packets of the current size
+    # have been timed, xfer_len moves on to the next size, or to the chosen
+    # one and done is set.  The latency mode is done at the first size
+    # that fits the budget, the largest that does.
+    # @param samples Samples in the packet
+    def measure(self, samples):
+        mark, self._mark = self._mark, None
+        if self.done or mark is None or samples != self.xfer_len:
+            return
+        self._times.append(self._clock() - mark)
+        if len(self._times) < self.WARMUP + self.PROBE_PACKETS:
+            return
+        self.costs[self.xfer_len] = float(np.median(self._times[self.WARMUP:]))
+        self._times = []
+        index = self._order.index(self.xfer_len) + 1
+        fits = self.mode == "latency" and self.latency(self.xfer_len) <= self.budget
+        if index < len(self._order) and not fits:
+            self.xfer_len = self._order[index]
+        else:
+            self.xfer_len = self._choose()
+            self.done = True
+
+    # @return seconds from the first sample of a packet falling due to the
+    #         packet having been pushed, for a size already tried
+    def latency(self, xfer_len):
+        return xfer_len/self.sample_rate + self.costs[xfer_len]
+
+    # @return samples per second at a size already tried
+    def throughput(self, xfer_len):
+        return xfer_len/max(self.costs[xfer_len], 1e-12)
+
+    def _choose(self):
+        sizes = sorted(self.costs)
+        if self.mode == "latency":
+            fits = [n for n in sizes if self.latency(n) <= self.budget]
+            return fits[-1] if fits else sizes[0]
+        best = max(self.throughput(n) for n in sizes)
+        return [n for n in sizes if self.throughput(n) >= (1 - self.TOLERANCE)*best][0]
+
+    # Least squares split of the packet costs, weighted for relative error
+    # so the small sizes, which show the per packet overhead, count
+    # @return (seconds per packet, seconds per sample)
+    def model(self):
+        sizes = sorted(self.costs)
+        if len(sizes) < 2:
+            return (self.costs[sizes[0]] if sizes else 0.0), 0.0
+        costs = np.array([self.costs[n] for n in sizes])
+        per_sample, per_packet = np.polyfit(sizes, costs, 1, w=1/np.maximum(costs, 1e-12))
+        return max(per_packet, 0.0), max(per_sample, 0.0)
+
+    # One line summary of the outcome
+    def summary(self):
+        per_packet, per_sample = self.model()
+        return ("xfer_len autotuned to %d for %s (%.1f us per packet + %.2f ns per sample; "
+                "%.1f Msps, latency %.3g s)" %
+                (self.xfer_len, self.mode, per_packet*1e6, per_sample*1e9,
+                 self.throughput(self.xfer_len)/1e6, self.latency(self.xfer_len)))
@@ -0,0 +1,55 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+A fixed pool of preallocated output buffers handed out round-robin.
+
+A buffer is only written again after every other buffer in the ring has
+been used, so a packet that is still queued downstream is not overwritten
+until the ring has wrapped.
+'''
+import numpy as np
+
+class BufferRing:
+    # Upper bound on the total number of elements held by one ring, so that
+    # large xfer_len values do not pin DEFAULT_QUEUE_SIZE large buffers
+    MAX_ELEMENTS = 2**21
+
+    # @param length Number of elements in each buffer
+    # @param slots  Number of buffers in the ring
+    # @param dtype  numpy type of the buffers
+    def __init__(self, length, slots, dtype):
+        self.length = length
+        self.dtype = np.dtype(dtype)
+        self._buffers = [np.zeros(length, dtype=dtype) for i in range(max(1, slots))]
+        self._next = 0
+
+    # Number of buffers to keep for a given buffer length
+    # @param length     Number of elements in each buffer
+    # @param queue_size Number of packets that may be queued downstream
+    @classmethod
+    def slots(cls, length, queue_size, max_elements=MAX_ELEMENTS):
+        return max(2, min(queue_size, max_elements // max(1, length)))
+
+    def __len__(self):
+        return len(self._buffers)
+
+    # @return the next buffer in the ring
+    def next(self):
+        buf = self._buffers[self._next]
+        self._next = (self._next + 1) % len(self._buffers)
+        return buf
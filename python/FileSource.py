@@ -0,0 +1,167 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Playback of recorded sample files for the file shape.
+
+The file is memory mapped, so only the pages being played are read and a
+file larger than memory streams like any other.  Three layouts are
+understood:
+
+ - raw float32 or int16 samples, native byte order
+ - BLUE (Midas) files, scalar or complex float32/int16 data, either byte
+   order, read from the 512 byte header
+ - SigMF recordings, a .sigmf-data file with its .sigmf-meta sidecar,
+   real or complex f32/i16 data
+
+Float data is handed out as slices of the mapping itself; int16 data is
+converted into the caller's float buffer.
+'''
+import os
+import json
+import struct
+import numpy as np
+
+BLUE_HEADER = 512
+BLUE_TYPES = {"F" : "f4", "I" : "i2"}
+SIGMF_TYPES = {"f32" : "f4", "i16" : "i2"}
+RAW_TYPES = {"float32" : "f4", "int16" : "i2"}
+FORMATS = ("auto",) + tuple(sorted(RAW_TYPES))
+
+class FileSource:
+    # @param path   File to play; for SigMF either the data or the meta file
+    # @param format One of FORMATS.  auto recognizes BLUE and SigMF files and
+    #               treats anything else as raw float32.
+    def __init__(self, path, format="auto"):
+        if format not in FORMATS:
+            raise ValueError("Unknown file format '%s'" % format)
+        self.complex = False
+        self.sample_rate = None
+        data_path, dtype, offset, count = self._layout(path, format)
+        if count <= 0:
+            raise ValueError("No samples in '%s'" % path)
+        if self.complex:
+            count -= count % 2
+        self._data = np.memmap(data_path, dtype=np.dtype(dtype), mode="r", offset=offset, shape=(count,))
+        self.position = 0
+
+    # Number of values in the file (two per complex sample)
+    def __len__(self):
+        return len(self._data)
+
+    # @return a float64 copy of every value in the file
+    def values(self):
+        return np.array(self._data, dtype=np.float64)
+
+    def _layout(self, path, format):
+        if format != "auto":
+            return self._raw(path, RAW_TYPES[format])
+        if path.endswith(".sigmf-meta") or path.endswith(".sigmf-data"):
+            return self._sigmf(path[:-len(".sigmf-data")])
+        with open(path, "rb") as f:
+            header = f.read(BLUE_HEADER)
+        if header[:4] == b"BLUE" and len(header) == BLUE_HEADER:
+            return self._blue(path, header)
+        return self._raw(path, RAW_TYPES["float32"])
+
+    def _raw(self, path, dtype):
+        return path, dtype, 0, os.path.getsize(path)//np.dtype(dtype).itemsize
+
+    def _blue(self, path, header):
+        head = "<" if header[4:8] == b"EEEI" else ">"
+        data = "<" if header[8:12] == b"EEEI" else ">"
+        data_start, data_size = struct.unpack(head + "dd", header[32:48])
+        mode, kind = header[52:54].decode("ascii")
+        if mode not in "SC" or kind not in BLUE_TYPES:
+            raise ValueError("Unsupported BLUE data format '%s%s'" % (mode, kind))
+        xdelta = struct.unpack(head + "d", header[264:272])[0]
+        if xdelta > 0:
+            self.sample_rate = 1.0/xdelta
+        self.complex = (mode == "C")
+        dtype = data + BLUE_TYPES[kind]
+        size = min(int(data_size), os.path.getsize(path) - int(data_start))
+        return path, dtype, int(data_start), size//np.dtype(dtype).itemsize
+
+    def _sigmf(self, base):
+        with open(base + ".sigmf-meta") as f:
+            meta = json.load(f)["global"]
+        datatype = meta["core:datatype"]
+        parts = datatype.split("_")
+        kind = parts[0][1:]
+        if parts[0][:1] not in "rc" or kind not in SIGMF_TYPES:
+            raise ValueError("Unsupported SigMF datatype '%s'" % datatype)
+        self.complex = parts[0].startswith("c")
+        self.sample_rate = meta.get("core:sample_rate")
+        order = ">" if parts[-1] == "be" else "<"
+        return self._raw(base + ".sigmf-data", order + SIGMF_TYPES[kind])
+
+    # Read the next block, wrapping to the start of the file when looping.
+    # A real file read for complex output is promoted to I/Q pairs with a
+    # zero imaginary part.
+    # @param n    Number of samples
+    # @param spa  Values per sample (2 for complex output)
+    # @param fbuf Float buffer of at least n*spa values, used when the data
+    #             cannot be handed out as a slice of the file
+    # @param loop Continue from the start of the file at the end
+    # @return float32 values; fewer than n*spa at the end of the file
+    #         when not looping, None once it has all been played
+    def read(self, n, spa, fbuf, loop):
+        if spa == 1 or self.complex:
+            return self._read(n*spa, fbuf, loop)
+        # The real values are staged in the upper half of fbuf
+        values = self._read(n, fbuf[n:], loop)
+        if values is None:
+            return None
+        out = fbuf[:2*len(values)]
+        out[0::2] = values
+        out[1::2] = 0
+        return out
+
+    # @param size Number of values
+    def _read(self, size, fbuf, loop):
+        data = self._data
+        if loop and self.position >= len(data):
+            self.position = 0
+        end = self.position + size
+        if end <= len(data):
+            block = data[self.position:end]
+            self.position = end % len(data) if loop else end
+            return self._float(block, fbuf)
+        if not loop:
+            if self.position >= len(data):
+                return None
+            block = data[self.position:]
+            self.position = len(data)
+            return self._float(block, fbuf)
+
+        # The block runs past the end of the file (maybe several times over
+        # for a short file), so it is copied together
+        out = fbuf[:size]
+        filled = 0
+        while filled < size:
+            take = min(size - filled, len(data) - self.position)
+            out[filled:filled + take] = data[self.position:self.position + take]
+            filled += take
+            self.position = (self.position + take) % len(data)
+        return out
+
+    def _float(self, block, fbuf):
+        if block.dtype.kind == "f":
+            return block
+        out = fbuf[:len(block)]
+        np.copyto(out, block, casting="unsafe")
+        return out
@@ -0,0 +1,241 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Modulated carriers for the modulation shapes:
+ - am    amplitude modulation, envelope 1 + index*m(t)
+ - fm    frequency modulation, peak deviation index*message_frequency
+ - pm    phase modulation, peak deviation index radians
+ - bpsk  binary phase shift keying
+ - qpsk  Gray coded quadrature phase shift keying
+
+The message m(t) is a tone, or a stream of symbols at message_frequency
+symbols per second taken from the LRS or from white noise.  Symbols are
+shaped with a root raised cosine pulse, evaluated for every output sample
+from the symbols around it, so any symbol rate works with any sample rate.
+The PSK shapes map LRS or noise bits onto their symbols; with a tone
+message they alternate, a 1010... pattern.
+
+A Modulator carries the carrier and message phase, the symbol clock and
+the symbols still under the pulse from one block to the next, so
+successive blocks join up.
+'''
+import math
+import numpy as np
+
+SHAPES = ("am", "fm", "pm", "bpsk", "qpsk")
+MESSAGES = ("tone", "lrs", "noise")
+
+# Pulse shape extent, in symbols either side of its centre, and the number
+# of points tabulated per symbol
+SPAN = 4
+OVERSAMPLE = 64
+
+# Root raised cosine pulse, normalized to unit energy per symbol
+# @param rolloff Excess bandwidth, 0 to 1
+# @return the pulse tabulated at OVERSAMPLE points per symbol over
+#         [-SPAN, SPAN]
+def rootRaisedCosine(rolloff):
+    t = np.arange(-SPAN*OVERSAMPLE, SPAN*OVERSAMPLE + 1)/float(OVERSAMPLE)
+    b = float(rolloff)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pulse = (np.sin(np.pi*t*(1 - b)) + 4*b*t*np.cos(np.pi*t*(1 + b)))/(np.pi*t*(1 - (4*b*t)**2))
+    pulse[t == 0] = 1 - b + 4*b/np.pi
+    if b > 0:
+        # The removable singularities at t = +-1/(4*rolloff)
+        edge = np.abs(np.abs(t) - 1/(4*b)) < 1e-9
+        pulse[edge] = b/math.sqrt(2)*((1 + 2/np.pi)*math.sin(np.pi/(4*b)) + (1 - 2/np.pi)*math.cos(np.pi/(4*b)))
+    pulse /= math.sqrt(np.sum(pulse[::OVERSAMPLE]**2))
+    return pulse
+
+class Modulator:
+    # @param waveform          Waveform providing the NCO, LRS and noise
+    # @param shape             One of SHAPES
+    # @param message           One of MESSAGES
+    # @param amp               Amplitude of the carrier
+    # @param frequency         Carrier frequency, Hz
+    # @param message_frequency Message tone frequency, or symbol rate, Hz
+    # @param index             Modulation index: AM depth, PM deviation in
+    #                          radians, FM deviation per Hz of message_frequency
+    # @param rolloff           Root raised cosine excess bandwidth
+    # @param sample_rate       Sample rate, Hz
+    # @param lrs               LRS seed for an LRS message
+    def __init__(self, waveform, shape, message, amp, frequency, message_frequency, index, rolloff,
+                 sample_rate, lrs=1):
+        if shape not in SHAPES:
+            raise ValueError("Unknown modulation '%s'" % shape)
+        if message not in MESSAGES:
+            raise ValueError("Unknown message '%s'" % message)
+        if not 0 < message_frequency < sample_rate:
+            raise ValueError("message_frequency must be positive and below the sample rate")
+        self._waveform = waveform
+        self.shape = shape
+        self.message = message
+        self.amp = amp
+        self.index = index
+        self.lrs = lrs
+        self._carrier = 0
+        self._carrier_word = waveform.phaseIncrement(frequency, sample_rate)
+        # FM phase deviation, radians
+        self._fm_phase = 0.0
+        self._fm_gain = 2*np.pi*index*message_frequency/sample_rate
+        self._symbolic = shape in ("bpsk", "qpsk") or message != "tone"
+        if self._symbolic:
+            # Symbol clock in 2^-64 symbols, and the symbols from index
+            # _first on that are still needed
+            self._clock = 0
+            self._clock_word = waveform.phaseIncrement(message_frequency, sample_rate)
+            self._first = -SPAN + 1
+            self._symbols = np.zeros(0, dtype=np.complex128 if shape == "qpsk" else np.float64)
+            # Repeat the last point, for positions that round up onto it
+            pulse = rootRaisedCosine(rolloff)
+            self._pulse = np.append(pulse, pulse[-1])
+        else:
+            self._message = 0
+            self._message_word = waveform.phaseIncrement(message_frequency, sample_rate)
+
+    # The state carried from one block to the next; the symbols array is
+    # replaced, never changed in place, so it is not copied
+    _STATE = ("lrs", "_carrier", "_fm_phase", "_clock", "_first", "_symbols", "_message")
+
+    # @return the state after the last block read, for restore()
+    def state(self):
+        return tuple(getattr(self, name, None) for name in self._STATE)
+
+    # Go back to a state from state(), so the blocks after it are read again
+    def restore(self, state):
+        for name, value in zip(self._STATE, state):
+            if value is not None:
+                setattr(self, name, value)
+
+    # Produce the next block
+    # @param n    Number of samples
+    # @param spa  Scalars per atom, 2 for Complex
+    # @param fbuf Optional output array of n*spa elements to write into
+    # @return the new data buffer
+    def read(self, n, spa, fbuf=None):
+        waveform = self._waveform
+        if self._symbolic:
+            baseband = self._shaped(n)
+        else:
+            baseband = np.sin(waveform.TWOPI*waveform.ncoCycles(self._message, self._message_word, n))
+            self._message = waveform.phaseAdvance(self._message, self._message_word, n)
+        carrier = waveform.ncoCycles(self._carrier, self._carrier_word, n)
+        carrier *= waveform.TWOPI
+        self._carrier = waveform.phaseAdvance(self._carrier, self._carrier_word, n)
+
+        if self.shape == "am":
+            baseband *= self.index
+            baseband += 1.0
+        elif self.shape == "pm":
+            carrier += self.index*baseband
+            baseband = None
+        elif self.shape == "fm":
+            # Phase is the running sum of the frequency deviation
+            deviation = np.cumsum(baseband)
+            deviation *= self._fm_gain
+            carrier[1:] += deviation[:-1]
+            carrier += self._fm_phase
+            if n:
+                self._fm_phase = math.fmod(self._fm_phase + deviation[-1], waveform.TWOPI)
+            baseband = None
+
+        if spa == 2:
+            outbuff = waveform._output(fbuf, 2*n)
+            z = np.exp(1j*carrier)
+            if baseband is not None:
+                z *= baseband
+            z *= self.amp
+            outbuff.view(np.complex64)[:] = z
+        else:
+            outbuff = waveform._output(fbuf, n)
+            if self.shape == "qpsk":
+                # The imaginary part of symbol*exp(j*carrier)
+                values = baseband.real*np.sin(carrier)
+                values += baseband.imag*np.cos(carrier)
+            else:
+                values = np.sin(carrier, out=carrier)
+                if baseband is not None:
+                    values *= baseband
+            values *= self.amp
+            outbuff[:] = values
+        return outbuff
+
+    # The pulse shaped symbol stream for the next n samples
+    def _shaped(self, n):
+        # Position of every sample on the symbol clock, relative to the
+        # symbol the block starts in.  The fraction comes from the exact
+        # integer clock, so a block boundary never moves a sample to a
+        # different symbol.
+        start = self._clock >> 64
+        low = self._clock & 0xffffffffffffffff
+        position = self._waveform.ncoCycles(low, self._clock_word, n)
+        whole = np.arange(n, dtype=np.float64)
+        whole *= self._clock_word*2.0**-64
+        whole += low*2.0**-64
+        whole -= position
+        whole = np.rint(whole).astype(np.intp)
+        self._clock += n*self._clock_word
+
+        last = int(whole[-1]) if n else 0
+        self._extend(start + last + SPAN + 1)
+        symbols = self._symbols[start - SPAN + 1 - self._first:]
+        pulse = self._pulse
+        shaped = np.zeros(n, dtype=symbols.dtype)
+        # Each sample sums the 2*SPAN symbols around it, weighted by the
+        # pulse (interpolated from its table) at their distances from it
+        for offset in range(-SPAN + 1, SPAN + 1):
+            u = (SPAN - offset) + position
+            u *= OVERSAMPLE
+            i = u.astype(np.intp)
+            u -= i
+            weight = pulse[i + 1] - pulse[i]
+            weight *= u
+            weight += pulse[i]
+            shaped += symbols[whole + (offset + SPAN - 1)]*weight
+
+        # Drop the symbols that have passed out of the pulse
+        drop = (self._clock >> 64) - SPAN + 1 - self._first
+        if drop > 0:
+            self._symbols = self._symbols[drop:]
+            self._first += drop
+        return shaped
+
+    # Make sure the symbols up to (not including) index end are available
+    def _extend(self, end):
+        have = self._first + len(self._symbols)
+        if end > have:
+            self._symbols = np.concatenate((self._symbols, self._draw(have, end - have)))
+
+    # Draw count new symbols from the message, starting at symbol index start
+    def _draw(self, start, count):
+        waveform = self._waveform
+        size = 2*count if self.shape == "qpsk" else count
+        if self.message == "tone":
+            bits = (np.arange(start, start + count) & 1).repeat(size//count)
+        elif self.message == "lrs":
+            bits, self.lrs = waveform.lrsBits(self.lrs, size)
+        else:
+            noise = waveform.whitenoise(1.0, size).astype(np.float64)
+            if self.shape in ("am", "fm", "pm"):
+                # Gaussian message with a standard deviation of 1/3
+                return noise/(3*waveform.NOISE_SCALE)
+            bits = noise < 0
+        levels = 1.0 - 2.0*bits
+        if self.shape == "qpsk":
+            return (levels[0::2] + 1j*levels[1::2])/math.sqrt(2)
+        return levels
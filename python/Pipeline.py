@@ -0,0 +1,91 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+A generator thread that stays a fixed number of blocks ahead of the output.
+
+The thread calls the producer function over and over and queues what it
+returns, blocking once depth items are waiting.  The output side takes the
+items in order with get(), so while it is stuck in pushPacket the next
+blocks are already being generated.  A None item ends production, as does
+an exception, which is raised again from get() once the items before it
+have been taken.
+'''
+import sys
+import threading
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+class Pipeline:
+    # How often a producer blocked on a full queue checks for stop()
+    POLL = 0.1
+
+    # @param produce Function returning the next item, or None when there
+    #                are no more
+    # @param depth   Number of items queued ahead of the output
+    def __init__(self, produce, depth):
+        self._produce = produce
+        self._queue = queue.Queue(max(1, depth))
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="SigGen pipeline")
+        self._thread.daemon = True
+        self._thread.start()
+
+    # Number of items waiting to be taken
+    def __len__(self):
+        return self._queue.qsize()
+
+    # Take the next item
+    # @param timeout Seconds to wait for one
+    # @return the item, or None if none arrived in time or production has
+    #         ended
+    def get(self, timeout=None):
+        try:
+            item, error = self._queue.get(True, timeout)
+        except queue.Empty:
+            return None
+        if error is not None:
+            raise error
+        return item
+
+    # Stop the thread and discard the items it had queued.  The producer
+    # is not called again once this returns.
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                entry = (self._produce(), None)
+            except Exception:
+                entry = (None, sys.exc_info()[1])
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put(entry, True, self.POLL)
+                    break
+                except queue.Full:
+                    pass
+            if entry[0] is None:
+                return
@@ -22,15 +22,57 @@
 # Source: SigGen.spd.xml
 from ossie.resource import Resource, start_component
 import logging
+import collections
 import math
 from bulkio.bulkioInterfaces import BULKIO, BULKIO__POA 
 import Waveform
+import Wavetable
+import BufferRing
+import Throttle
+import WorkerPool
+import Pipeline
+import Autotune
+import Stats
+import FileSource
+import Modulation
 from omniORB import any
-from array import array
 import numpy as np
 
 from SigGen_base import *
 
+# Properties that make up the configuration snapshot (throttle is also part
+# of it, through prop_update_throttle)
+CONFIG_PROPERTIES = ("stream_id", "chan_rf", "col_rf", "sri_blocking", "xfer_len", "complex",
+                     "sample_rate", "shape", "magnitude", "frequency", "throttle_spin", "workers",
+                     "stats_enabled", "stats_log_interval", "file_loop", "chirp_start", "chirp_stop",
+                     "chirp_period", "multitone_frequencies", "multitone_amplitudes", "multitone_phases",
+                     "band_limited", "modulation_message", "message_frequency", "modulation_index", "rolloff",
+                     "add_noise", "snr", "channels", "pipeline_depth", "xfer_len_autotune",
+                     "latency_budget")
+
+# Immutable snapshot of the configuration that process() works from
+Config = collections.namedtuple("Config", ("version", "stream_id", "chan_rf", "col_rf", "blocking",
+                                           "xfer_len", "spa", "sample_rate", "xdelta", "shape",
+                                           "magnitude", "frequency", "delta_phase", "throttle",
+                                           "throttle_spin", "workers", "stats", "stats_log_interval",
+                                           "file", "file_loop", "awg", "chirp_start", "chirp_stop",
+                                           "chirp_period", "multitone", "band_limited",
+                                           "modulation", "noise", "noise_source", "channels",
+                                           "pipeline_depth", "autotune"))
+
+# Seconds between refreshes of the stats property while running
+STATS_UPDATE = 0.5
+
+# Longest process() waits for the generator thread before returning NOOP
+PIPELINE_WAIT = 0.25
+
+# Octet data as the string of bytes BulkIO sends (ndarray.tobytes() is not
+# available before numpy 1.9)
+def _octets(data):
+    if hasattr(data, "tobytes"):
+        return data.tobytes()
+    return data.tostring()
+
 class SigGen_i(SigGen_base):
     """<DESCRIPTION GOES HERE>"""
     def initialize(self):
@@ -44,38 +86,98 @@ class SigGen_i(SigGen_base):
         """
         SigGen_base.initialize(self)
         self.last_xfer_len = self.xfer_len
+        self.spa = 2 if self.complex else 1
         
-        keywords = []
-        if self.chan_rf != -1:
-            keywords.append(CF.DataType('CHAN_RF', any.to_any(self.chan_rf)))
-        if self.col_rf != -1:
-            keywords.append(CF.DataType('COL_RF', any.to_any(self.col_rf)))
-        if self.sri_blocking == None:
-            self.sri_blocking = False
-        self.sri = BULKIO.StreamSRI(1, 0.0, 0.0, BULKIO.UNITS_TIME, 0, 0.0, 0.0, BULKIO.UNITS_NONE, 0, self.stream_id, self.sri_blocking, keywords)
-        self.sriUpdate = True
-        self.phase = 0
-        self.chirp = 0
+        self.sri = BULKIO.StreamSRI(1, 0.0, 0.0, BULKIO.UNITS_TIME, 0, 0.0, 0.0, BULKIO.UNITS_NONE, 0, self.stream_id, False, [])
+        self.phase = 0 # phase accumulator, 2^64 counts per cycle
+        self.lrs = 1
         self.sample_time_delta = 0.0
         self.delta_phase = 0.0
-        self.delta_phase_offset = 0.0
         self.cached_stream_id=self.stream_id
         self.stream_created=False
         self.next_time = None
+        self._throttle = Throttle.Throttle()
+        self._stats = Stats.Counters()
+        self._stats_due = 0.0
+        self._stats_log_due = 0.0
         
         self._waveform = Waveform.Waveform()
+        self._wavetables = Wavetable.WavetableCache(self._waveform)
+        self._wavetable = None
+        self._wavetable_stale = True
+        self._phase_increment = None
+        self._pool = None
+        self._pending = collections.deque()
+        self._pending_stale = False
+        self._pool_resume = None
+        # Counts the noise restarts, so that a noise state saved before one
+        # is not restored over it
+        self._noise_epoch = 0
+        # Counts the noise restarts asked for through the properties, which
+        # process() carries out when it applies the configuration
+        self._noise_restarts = 0
+        # The generator thread with pipeline_depth set, and the phase and LRS
+        # seed after the last block taken from it
+        self._pipeline = None
+        self._pipeline_ended = False
+        self._pipeline_resume = None
+        # The packet size tuner, what it was tuning for, and the size it has
+        # the configuration use
+        self._tuner = None
+        self._tuner_key = None
+        self._tuned_xfer_len = None
+        self._file = None
+        self._awg = None
+        self._awg_table = None
+        self._multitone = None
+        self._modulator = None
+        # Multi-channel mode: the streams whose SRI has been pushed, and the
+        # phase accumulator and increment of each channel
+        self._channel_streams = set()
+        self._channel_phases = []
+        self._channel_words = []
+        self._channel_deltas = []
+        self._channel_buffer = None
+        self._channel_shorts = None
+        self._channel_octets = None
+        
+        # The property listeners publish an immutable snapshot of the
+        # configuration; process() applies it only when the version changes
+        self._config_lock = threading.Lock()
+        self._config = None
+        self._applied = None
+        self.prop_update_awg(None, None, None)
+        self.prop_update_file(None, None, None)
 
-        # Separate listeners required. Bug fixed in CF 1.10.1
-        self.addPropertyChangeListener("stream_id", self.prop_update_sri)
-        self.addPropertyChangeListener("chan_rf", self.prop_update_sri2)
-        self.addPropertyChangeListener("col_rf", self.prop_update_sri3)
-        self.addPropertyChangeListener("sri_blocking", self.prop_update_sri_blocking)
+        # One listener for several properties needs CF 1.10.1 or later
+        for propid in CONFIG_PROPERTIES:
+            self.addPropertyChangeListener(propid, self.prop_update_config)
+        self.addPropertyChangeListener("noise_generator", self.prop_update_noise)
+        self.addPropertyChangeListener("seed", self.prop_update_noise)
+        self.addPropertyChangeListener("throttle", self.prop_update_throttle)
+        self.addPropertyChangeListener("file_path", self.prop_update_file)
+        self.addPropertyChangeListener("file_format", self.prop_update_file)
+        self.addPropertyChangeListener("awg_table", self.prop_update_awg)
+        self.addPropertyChangeListener("awg_file", self.prop_update_awg)
 
     def start(self):
         if not self._get_started():
             self.next_time = bulkio.timestamp.now()
+            self._throttle.reset(self.next_time)
+            self._stats.reset()
+            self._stats_due = self._stats_log_due = self._stats.now
         SigGen_base.start(self)
 
+    def stop(self):
+        SigGen_base.stop(self)
+        self._stop_pipeline()
+        self._drain_pool()
+        config = self._config
+        if config.stats:
+            self._stats.lap()
+            self._stats.flush(config.xfer_len*(len(config.channels) or 1))
+            self._update_stats(config)
+
     def process(self):
         """
         Basic functionality:
@@ -85,122 +187,876 @@ class SigGen_i(SigGen_base):
             FINISH or stop() is called on the component.  If no work is performed, then return NOOP.
         """
 
-        if self.stream_id == None:
-            self.stream_id = str(uuid.uuid4())
-            self.sri.streamID = self.stream_id
-
-        if self.xfer_len != self.last_xfer_len:
-            self.last_xfer_len = self.xfer_len
-            self.sriUpdate = True
+        # Only touch the SRI and the derived state when the configuration
+        # has changed since the last packet.  The generator thread keeps
+        # running through changes that do not affect the samples.  Applying
+        # a change can start the packet size tuner, which publishes another
+        # snapshot with the first size to try; that one is applied straight
+        # away, so no packet goes out at the untuned size.
+        config = self._config
+        while self._applied is None or config.version != self._applied.version:
+            if self._applied is not None and self._pipeline_key(config) != self._pipeline_key(self._applied):
+                self._stop_pipeline()
+            self._apply_config(config)
+            config = self._config
             
-        self.sample_time_delta = 1.0/self.sample_rate
-        if self.sample_time_delta != self.sri.xdelta:
-            self.sri.xdelta = self.sample_time_delta
-            self.sriUpdate = True
+        # Each stats lap charges the time since the previous one to a stage.
+        # Only one packet in every Stats.INTERVAL is timed, and it counts
+        # for the whole batch; stats is None for the others, which only
+        # count down.
+        stats = None
+        if config.stats:
+            counters = self._stats
+            counters.countdown -= 1
+            if not counters.countdown:
+                stats = counters
+                stats.timed()
             
-        if self.sriUpdate or not self.port_dataFloat_out.sriDict.has_key(self.cached_stream_id) or not self.port_dataShort_out.sriDict.has_key(self.cached_stream_id):
-            self.sriUpdate = False
+        # In multi-channel mode every channel is generated in one pass and
+        # pushed on its own stream
+        if config.channels:
+            return self._process_channels(config, stats)
             
-            # Send EOS if necessary
-            if self.stream_id != self.cached_stream_id and self.stream_created:
-                self.port_dataFloat_out.pushPacket([], self.next_time, True, self.cached_stream_id)
-                self.port_dataShort_out.pushPacket([], self.next_time, True, self.cached_stream_id)
-            self.cached_stream_id = self.stream_id
-        
-            keywords = []
-            if self.chan_rf != -1:
-                keywords.append(CF.DataType('CHAN_RF', any.to_any(self.chan_rf)))
-            if self.col_rf != -1:
-                keywords.append(CF.DataType('COL_RF', any.to_any(self.col_rf)))
-            self.sri.keywords = keywords
-            self.stream_created = True
-            self.port_dataFloat_out.pushSRI(self.sri)
-            self.port_dataShort_out.pushSRI(self.sri)
-            
-        self.delta_phase = self.frequency * self.sample_time_delta
-        self.delta_phase_offset = self.chirp * self.sample_time_delta * self.sample_time_delta
-        if ((self.delta_phase < 0) and (not self.shape == "sine")):
-            self.delta_phase = -self.delta_phase
+        # Only produce and push the formats whose ports are connected
+        active = self._active_ports()
+        float_out, short_out, octet_out, double_out = active
             
-        # Generate the Waveform
-        data = []
-        if self.shape == "sine":
-            data = self._waveform.sincos(self.magnitude, self.phase, self.delta_phase, self.last_xfer_len, 1)
-        elif self.shape == "square":
-            data = self._waveform.square(self.magnitude, self.phase, self.delta_phase, self.last_xfer_len, 1)
-        elif self.shape == "triangle":
-            data = self._waveform.triangle(self.magnitude, self.phase, self.delta_phase, self.last_xfer_len, 1)
-        elif self.shape == "sawtooth":
-            data = self._waveform.sawtooth(self.magnitude, self.phase, self.delta_phase, self.last_xfer_len, 1)
-        elif self.shape == "pulse":
-            data = self._waveform.pulse(self.magnitude, self.phase, self.delta_phase, self.last_xfer_len, 1)
-        elif self.shape == "constant":
-            data = self._waveform.constant(self.magnitude, self.last_xfer_len, 1)
-        elif self.shape == "whitenoise":
-            data = self._waveform.whitenoise(self.magnitude, self.last_xfer_len, 1)
-        elif self.shape == "lrs":
-            data = self._waveform.lrs(self.magnitude, self.last_xfer_len, 1, 1)
+        # Generate the Waveform, or take the next block from the generator
+        # thread.  With only short and octet output wanted, the shapes that
+        # can be made as short directly skip the float block.
+        if config.pipeline_depth > 0:
+            block = self._next_pipelined_block(stats)
+            if block is None:
+                return NOOP
+            data = block[0]
+        elif (short_out or octet_out) and not (float_out or double_out):
+            data = self._next_short_block(config)
         else:
+            data = self._next_block(config)
+        if data is None:
+            # A file played to the end without looping ends the stream
+            if config.shape == "file" and config.file is not None and self.stream_created:
+                self._push_eos(self.cached_stream_id)
+                self.stream_created = False
             return NOOP
-  
-        self.phase += self.delta_phase*self.last_xfer_len # increment phase
-        self.phase -= math.floor(self.phase) # module 1.0
+        if not self.stream_created:
+            self._push_sri(config)
+        if stats:
+            if config.pipeline_depth > 0:
+                stats.pipeline_wait_time += stats.lap()
+            else:
+                stats.generate_time += stats.lap()
+        
+        self._push_blocks(data[np.newaxis], (self.cached_stream_id,), active, stats,
+                          self._short_buffers.next(), self._octet_buffers.next())
+        
+        # Advance time (the last packet of a file may be short)
+        self._finish_packet(config, stats, len(data) // config.spa, 1)
+        return NORMAL
+        
+    # Periodic shapes are served from a cached period when one exists.  The
+    # table is looked up for the phase the stream has reached, so that it
+    # carries on from there.
+    def _refresh_wavetable(self, config):
+        if self._wavetable_stale:
+            self._wavetable_stale = False
+            self._wavetable = self._wavetables.lookup(config.shape, config.magnitude, config.frequency, config.sample_rate,
+                                                      config.spa, config.band_limited,
+                                                      self._waveform.phaseCycles(self.phase))
+            
+    # Generate the next block of the single stream, on the processing thread
+    # or the generator thread
+    # @return the data buffer, or None at the end of a file or for an
+    #         unknown shape
+    def _next_block(self, config):
+        self._refresh_wavetable(config)
+        if config.workers > 1:
+            return self._next_pooled_block(config)
+        self._drain_pool(config.workers)
+        block = self._plan_block(config, self.phase, self.lrs, self._float_buffers.next(), False)
+        if block is None:
+            return None
+        generate, args, self.phase, self.lrs, in_order = block
+        return generate(*args)
+        
+    # Generate the next block as short data, for when only dataShort_out is
+    # connected.  Cached periods are converted to short once and served
+    # from that, and a constant is filled in directly; other blocks are
+    # generated as float, to be converted as usual.
+    # @return the short or float data buffer, or None as for _next_block()
+    def _next_short_block(self, config):
+        self._refresh_wavetable(config)
+        if config.noise or not (self._wavetable or config.shape == "constant"):
+            return self._next_block(config)
+        self._drain_pool(config.workers)
+        waveform = self._waveform
+        n = config.xfer_len
+        if config.shape == "constant":
+            # The phase runs on as it does for the float block
+            word = self._phase_increment
+            if word is None:
+                word = self._phase_increment = waveform.phaseIncrement(abs(config.frequency), config.sample_rate)
+            self.phase = waveform.phaseAdvance(self.phase, word, n)
+            return waveform.constantShort(config.magnitude, n, config.spa, self._short_buffers.next())
+        p = waveform.phaseCycles(self.phase)
+        data = self._wavetable.readShort(p, n, waveform.float2short)
+        self.phase = waveform.phaseCounts(self._wavetable.advance(p, n))
+        return data
+        
+    # Take the next block from the generator thread, starting it if need be.
+    # While the thread runs it owns the generation state (phase, lrs, the
+    # worker pool and the waveform objects); process() only pushes.
+    # @return (data, generation state after the block), or None if none was
+    #         ready within PIPELINE_WAIT or the generator has stopped
+    def _next_pipelined_block(self, stats):
+        if self._pipeline is None:
+            config = self._applied
+            self._pipeline_resume = self._resume_state(config)
+            self._pipeline_ended = False
+            self._pipeline = Pipeline.Pipeline(lambda: self._produce(config), config.pipeline_depth)
+        ready = len(self._pipeline)
+        block = self._pipeline.get(PIPELINE_WAIT)
+        if block is not None:
+            self._pipeline_resume = block[1]
+            if stats:
+                stats.pipeline_packets += 1
+                stats.pipeline_ready += ready
+        return block
         
-        # Push the data
-        self.port_dataFloat_out.pushPacket(data, self.next_time, False, self.cached_stream_id)
+    # Generator thread body: one block, with the generation state after it.
+    # The end of a file is passed on once and ends the thread.
+    def _produce(self, config):
+        if self._pipeline_ended:
+            return None
+        data = self._next_block(config)
+        self._pipeline_ended = data is None
+        return data, self._resume_state(config)
         
-        # Only convert and push short data if the port is connected
-        if self.port_dataShort_out._get_state() == BULKIO.ACTIVE:
-            self.port_dataShort_out.pushPacket(self.convert_float_2_short(data), 
-                                           self.next_time, False, self.cached_stream_id)
+    # The generation state after the last block handed out: with blocks
+    # queued in the worker pool the current state is already past it
+    def _resume_state(self, config):
+        if self._pending:
+            return self._pool_resume
+        return self._generation_state(config, self.phase, self.lrs)
         
-        # Advance time
-        self.next_time.tfsec += self.last_xfer_len * self.sri.xdelta
+    # Stop the generator thread and discard the blocks it had ready, and
+    # the blocks queued in the worker pool.  Generation resumes from the
+    # last block pushed: the phase, LRS seed, file position, modulator and
+    # noise state are all put back to where that block left them.
+    def _stop_pipeline(self):
+        if self._pipeline is None:
+            return
+        self._pipeline.stop()
+        self._pipeline = None
+        self._drain_pool(self._applied.workers)
+        self._restore_generation_state(self._pipeline_resume)
+        
+    # The configuration the generator thread's blocks depend on.  A change
+    # to anything else (the SRI, throttling, stats) leaves it running.
+    def _pipeline_key(self, config):
+        return (self._waveform_key(config), config.xfer_len, config.workers,
+                config.pipeline_depth, config.file_loop, config.noise_source)
+        
+    # Generate one packet for every channel and push each on its stream
+    def _process_channels(self, config, stats):
+        channels = config.channels
+        shapes = [channel[0] for channel in channels]
+        amps = [channel[2] for channel in channels]
+        data = self._waveform.multichannel(shapes, amps, self._channel_phases, self._channel_words,
+                                           self._channel_deltas, config.xfer_len, config.spa, self._channel_buffer)
+        self._channel_buffer = data
+        waveform = self._waveform
+        self._channel_phases = [waveform.phaseAdvance(acc, word, config.xfer_len)
+                                for acc, word in zip(self._channel_phases, self._channel_words)]
+        for channel in channels:
+            if channel[3] not in self._channel_streams:
+                self._push_sri(config, channel[3])
+        if stats:
+            stats.generate_time += stats.lap()
+            
+        if self._channel_shorts is None or len(self._channel_shorts) != data.size:
+            self._channel_shorts = np.empty(data.size, dtype=np.int16)
+            self._channel_octets = np.empty(data.size, dtype=np.uint8)
+        self._push_blocks(data, [channel[3] for channel in channels], self._active_ports(), stats,
+                          self._channel_shorts, self._channel_octets)
+        self._finish_packet(config, stats, config.xfer_len, len(channels))
+        return NORMAL
+        
+    # Which output ports are connected
+    # @return (float, short, octet, double) flags
+    def _active_ports(self):
+        return tuple(port._get_state() == BULKIO.ACTIVE for port in
+                     (self.port_dataFloat_out, self.port_dataShort_out, self.port_dataOctet_out, self.port_dataDouble_out))
+        
+    # Push a block on every connected port.  Each format is made from the one
+    # block only for the ports that want it: the float and double ports share
+    # one list of values (float32 values become python floats, which are
+    # doubles, anyway), and the short and octet data are converted into
+    # reused buffers.
+    # @param data    The block of each stream, as the rows of a 2-D array:
+    #                float, or short when there is no float or double output
+    # @param streams Stream ID of each row
+    # @param active  Port flags from _active_ports()
+    # @param sbuf    Short buffer of data.size elements to convert into
+    # @param obuf    Octet buffer of data.size elements to convert into
+    def _push_blocks(self, data, streams, active, stats, sbuf, obuf):
+        float_out, short_out, octet_out, double_out = active
+        # Making the lists is charged to the first port pushed
+        if float_out or double_out:
+            values = [block.tolist() for block in data]
+        if float_out:
+            for stream_id, block in zip(streams, values):
+                self.port_dataFloat_out.pushPacket(block, self.next_time, False, stream_id)
+            if stats:
+                stats.push_float_time += stats.lap()
+        if double_out:
+            for stream_id, block in zip(streams, values):
+                self.port_dataDouble_out.pushPacket(block, self.next_time, False, stream_id)
+            if stats:
+                stats.push_double_time += stats.lap()
+        if short_out:
+            if data.dtype == np.int16:
+                shortData = data
+            else:
+                shortData = self.convert_float_2_short(data.reshape(-1), sbuf).reshape(data.shape)
+            if stats:
+                stats.convert_time += stats.lap()
+            for stream_id, block in zip(streams, shortData):
+                self.port_dataShort_out.pushPacket(block.tolist(), self.next_time, False, stream_id)
+            if stats:
+                stats.push_short_time += stats.lap()
+        if octet_out:
+            octetData = self._waveform.toOctet(data.reshape(-1), obuf).reshape(data.shape)
+            if stats:
+                stats.convert_time += stats.lap()
+            for stream_id, block in zip(streams, octetData):
+                self.port_dataOctet_out.pushPacket(_octets(block), self.next_time, False, stream_id)
+            if stats:
+                stats.push_octet_time += stats.lap()
+        
+    # End a stream on every output port
+    def _push_eos(self, stream_id):
+        self.port_dataFloat_out.pushPacket([], self.next_time, True, stream_id)
+        self.port_dataShort_out.pushPacket([], self.next_time, True, stream_id)
+        self.port_dataOctet_out.pushPacket(b"", self.next_time, True, stream_id)
+        self.port_dataDouble_out.pushPacket([], self.next_time, True, stream_id)
+        
+    # Advance the time stamp past a packet of the given number of samples,
+    # wait for the next one to fall due when throttling, and count it
+    # @param streams Number of streams the packet went out on; a pass over
+    #                every channel counts as one packet
+    def _finish_packet(self, config, stats, samples, streams):
+        self.next_time.tfsec += samples * config.xdelta
         if self.next_time.tfsec > 1.0:
             self.next_time.tfsec -= 1.0
             self.next_time.twsec += 1.0
         
-        # If we are throttling, wait...otherwise run at full speed
-        if self.throttle:
-            wait_amt = self.last_xfer_len * self.sample_time_delta
-            try:
-                time.sleep(wait_amt)
-            finally:
-                return NORMAL
+        # The tuner times each packet up to here, leaving out the throttle
+        tuner = self._tuner
+        if tuner is not None and not tuner.done:
+            self._autotune(tuner, samples)
+        
+        # If we are throttling, wait until the next packet is due...otherwise
+        # run at full speed
+        if config.throttle:
+            self._throttle.spin = config.throttle_spin
+            resyncs = self._throttle.resyncs
+            late = self._throttle.wait(self.next_time)
+            if self._throttle.resyncs != resyncs:
+                self._log.warn("Output fell more than %g s behind sample_rate; skipping ahead" % self._throttle.max_lag)
+                if config.stats:
+                    self._stats.resyncs += 1
+            if late and config.stats:
+                self._stats.late_packets += 1
+            self.throttle_rate_error = self._throttle.rate_error(self.next_time)
+            if stats:
+                stats.sleep_time += stats.lap()
             
-        return NORMAL
+        # The batch counts every packet as xfer_len samples per stream; the
+        # short last packet of a file makes up the difference
+        if samples != config.xfer_len and config.stats:
+            self._stats.samples += (samples - config.xfer_len)*streams
+        if stats:
+            stats.batch(config.xfer_len*streams)
+            if stats.now >= self._stats_due:
+                self._publish_stats(config)
+        if tuner is not None:
+            tuner.resume()
+        
+    # Time a packet for the tuner, and switch to the next packet size it
+    # wants to try, or the one it settles on
+    def _autotune(self, tuner, samples):
+        previous = tuner.xfer_len
+        tuner.measure(samples)
+        if tuner.done:
+            self._log.info(tuner.summary())
+        if tuner.xfer_len != previous:
+            self._set_tuned_xfer_len(tuner.xfer_len)
+            
+    # Have the configuration use a packet size, through a new snapshot; the
+    # change is applied by _apply_config() like one to xfer_len
+    def _set_tuned_xfer_len(self, xfer_len):
+        self._tuned_xfer_len = xfer_len
+        self.autotuned_xfer_len = xfer_len
+        self.prop_update_config(None, None, None)
     
-    def convert_float_2_short(self, data):
-        shortData = array("h")
-        shortMin = np.iinfo(np.int16).min
-        shortMax = np.iinfo(np.int16).max
-                
-        for i in range(len(data)):
-            shortData.append(np.int16(min(shortMax, max(shortMin, np.float32(data[i])))))
-             
-        return shortData.tolist()
-        
-    def prop_update_sri(self, propid, oldval, newval):
-        self.sri.streamID = self.stream_id
-        self.sriUpdate = True
-
-    def prop_update_sri2(self, propid, oldval, newval):
-        self.sriUpdate = True
-
-    def prop_update_sri3(self, propid, oldval, newval):
-        self.sriUpdate = True
-
-    # Check for changes to the SRI Blocking property
-    def prop_update_sri_blocking(self, propid, oldval, newval):
-        if newval != None:
-            self.sri.blocking = newval
-        elif oldval != None:
-            self.sri.blocking = oldval
+    # Refresh the stats property and, when it is due, log a summary line
+    def _publish_stats(self, config):
+        self._update_stats(config)
+        now = self._stats.now
+        interval = STATS_UPDATE
+        if config.stats_log_interval > 0:
+            if now >= self._stats_log_due:
+                self._stats_log_due = now + config.stats_log_interval
+                self._log.info(self._stats.summary(config.sample_rate))
+            interval = min(interval, config.stats_log_interval)
+        self._stats_due = now + interval
+        
+    def _update_stats(self, config):
+        stats = self._stats
+        self.stats = self.Stats(packets=stats.packets,
+                                samples=stats.samples,
+                                generate_time=stats.scaled(stats.generate_time),
+                                convert_time=stats.scaled(stats.convert_time),
+                                push_float_time=stats.scaled(stats.push_float_time),
+                                push_short_time=stats.scaled(stats.push_short_time),
+                                push_octet_time=stats.scaled(stats.push_octet_time),
+                                push_double_time=stats.scaled(stats.push_double_time),
+                                sleep_time=stats.scaled(stats.sleep_time),
+                                late_packets=stats.late_packets,
+                                resyncs=stats.resyncs,
+                                pipeline_occupancy=stats.occupancy(),
+                                pipeline_wait_time=stats.scaled(stats.pipeline_wait_time),
+                                elapsed_time=stats.elapsed(),
+                                achieved_rate=stats.rate(),
+                                configured_rate=config.sample_rate)
+        
+    # Bring the SRI, buffers and waveform state in line with a new
+    # configuration snapshot
+    def _apply_config(self, config):
+        previous = self._applied
+        self._applied = config
+        buffers = (config.xfer_len, config.spa, config.pipeline_depth, config.workers)
+        if previous is None or buffers != (previous.xfer_len, previous.spa, previous.pipeline_depth, previous.workers):
+            self._drain_pool(config.workers)
+            self.last_xfer_len = config.xfer_len
+            self.spa = config.spa
+            self._allocate_buffers(self._buffers_ahead(config))
+        if previous is None or self._waveform_key(config) != self._waveform_key(previous):
+            self._wavetable_stale = True
+            self._phase_increment = None
+            self._awg_table = None
+            self._multitone = None
+            self._modulator = None
+            self._pending_stale = True
+        if previous is None or config.noise_source != previous.noise_source:
+            self._restart_noise(config)
+        self.sample_time_delta = config.xdelta
+        self.delta_phase = config.delta_phase
+        problem = self._shape_problem(config)
+        if problem:
+            self._log.warn(problem)
+        if config.stats and previous is not None and not previous.stats:
+            self._stats.reset()
+        
+        self._apply_channels(config, previous)
+        self._apply_autotune(config)
+        
+        sri = (config.stream_id, config.chan_rf, config.col_rf, config.blocking, config.xdelta, config.spa)
+        if previous is not None and sri == (previous.stream_id, previous.chan_rf, previous.col_rf, previous.blocking, previous.xdelta, previous.spa):
+            return
+        if config.channels:
+            # The channel streams pick up the new SRI with their next packet
+            self._channel_streams.clear()
+            return
+        
+        # Send EOS if necessary
+        if config.stream_id != self.cached_stream_id and self.stream_created:
+            self._push_eos(self.cached_stream_id)
+        self._push_sri(config)
+        
+    # @return why the configured shape generates nothing, or None when it
+    #         can be generated
+    def _shape_problem(self, config):
+        if config.channels:
+            return None
+        if config.shape == "file" and config.file is None:
+            return "Shape 'file' selected but no file is loaded; nothing is generated until file_path is set"
+        if config.shape == "chirp" and config.chirp_period <= 0:
+            return "Shape 'chirp' needs a chirp_period above 0; nothing is generated"
+        if config.shape == "multitone" and not config.multitone[0]:
+            return "Shape 'multitone' selected but multitone_frequencies is empty; nothing is generated"
+        if config.shape in Modulation.SHAPES:
+            message, message_frequency, index, rolloff = config.modulation
+            if message not in Modulation.MESSAGES:
+                return "Unknown modulation_message '%s'; nothing is generated" % message
+            if not 0 < message_frequency < config.sample_rate:
+                return "Shape '%s' needs a message_frequency above 0 and below the sample rate; nothing is generated" % config.shape
+        return None
+        
+    # Start and end the channel streams for a change to the channels.  A
+    # channel that keeps its stream keeps its phase.
+    def _apply_channels(self, config, previous):
+        waveform = self._waveform
+        self._channel_words = [waveform.phaseIncrement(frequency if shape == "sine" else abs(frequency), config.sample_rate)
+                               for shape, frequency, magnitude, stream_id in config.channels]
+        self._channel_deltas = [abs(frequency)*config.xdelta for shape, frequency, magnitude, stream_id in config.channels]
+        old = previous.channels if previous is not None else ()
+        if config.channels == old:
+            return
+        phases = dict(zip([channel[3] for channel in old], self._channel_phases))
+        self._channel_phases = [phases.get(channel[3], 0) for channel in config.channels]
+        
+        # Send EOS on the streams that are no longer generated
+        streams = set(channel[3] for channel in config.channels)
+        for stream_id in sorted(self._channel_streams - streams):
+            self._push_eos(stream_id)
+        self._channel_streams &= streams
+        if config.channels and self.stream_created:
+            self._push_eos(self.cached_stream_id)
+            self.stream_created = False
+        
+    # Start tuning the packet size over when anything the cost of a packet
+    # depends on has changed (other than the tuned size itself)
+    def _apply_autotune(self, config):
+        mode, budget = config.autotune
+        if mode not in Autotune.MODES[1:]:
+            self._tuner = self._tuner_key = None
+            self.autotuned_xfer_len = 0
+            return
+        key = (self._waveform_key(config), config.throttle, config.workers, config.pipeline_depth, config.autotune)
+        if self._tuner is not None and key == self._tuner_key:
+            return
+        self._tuner_key = key
+        self._tuner = Autotune.Tuner(mode, config.sample_rate, budget,
+                                     max_duration=1.0 if config.throttle else None)
+        if self._tuner.xfer_len != config.xfer_len:
+            self._set_tuned_xfer_len(self._tuner.xfer_len)
         else:
-            self.sri.blocking = False
-            
-        self.sriUpdate = True
+            self.autotuned_xfer_len = config.xfer_len
+        
+    # The configuration a generated block depends on.  The arbitrary table
+    # is compared by identity; each new table is a new array.
+    def _waveform_key(self, config):
+        return (config.shape, config.magnitude, config.frequency, config.sample_rate, config.spa,
+                config.file, id(config.awg), config.chirp_start, config.chirp_stop, config.chirp_period,
+                config.multitone, config.band_limited, config.modulation,
+                config.noise, config.channels)
+        
+    # @param stream_id A channel stream, or None for the single stream
+    def _push_sri(self, config, stream_id=None):
+        keywords = []
+        if config.chan_rf != -1:
+            keywords.append(CF.DataType('CHAN_RF', any.to_any(config.chan_rf)))
+        if config.col_rf != -1:
+            keywords.append(CF.DataType('COL_RF', any.to_any(config.col_rf)))
+        if stream_id is None:
+            self.cached_stream_id = stream_id = config.stream_id
+            self.stream_created = True
+            sri = self.sri
+        else:
+            self._channel_streams.add(stream_id)
+            sri = BULKIO.StreamSRI(1, 0.0, 0.0, BULKIO.UNITS_TIME, 0, 0.0, 0.0, BULKIO.UNITS_NONE, 0, stream_id, False, [])
+        sri.streamID = stream_id
+        sri.xdelta = config.xdelta
+        sri.mode = 1 if config.spa == 2 else 0
+        sri.blocking = config.blocking
+        sri.keywords = keywords
+        self.port_dataFloat_out.pushSRI(sri)
+        self.port_dataShort_out.pushSRI(sri)
+        self.port_dataOctet_out.pushSRI(sri)
+        self.port_dataDouble_out.pushSRI(sri)
+        
+    # Work out how to generate one block of the current waveform
+    # @param config Configuration snapshot
+    # @param phase  Phase accumulator value at the start of the block
+    # @param lrs    LRS seed at the start of the block
+    # @param fbuf   Output buffer for the block
+    # @param pooled True if the block may be generated on a worker thread
+    # @return (function, arguments, phase accumulator after the block, LRS seed after
+    #          the block, in_order), or None for an unknown shape.  in_order
+    #          blocks use state left by the previous block, so they must be
+    #          generated in sequence.
+    def _plan_block(self, config, phase, lrs, fbuf, pooled):
+        block = self._plan_shape(config, phase, lrs, fbuf, pooled)
+        if block is None or config.noise is None:
+            return block
+        # The noise is added to the block as it is generated; like the
+        # whitenoise shape, pooled blocks get their own split of the noise
+        # generator
+        generate, args, next_phase, next_lrs, in_order = block
+        noise = pooled and self._waveform.splitNoise()
+        if not noise:
+            noise = self._waveform
+            in_order = True
+        return self._noisy_block, (noise, config.noise, fbuf, generate, args), next_phase, next_lrs, in_order
+        
+    # @param level (snr, sdev) as in the configuration; a sdev of None
+    #              scales the noise to the power of each block
+    def _noisy_block(self, noise, level, fbuf, generate, args):
+        data = generate(*args)
+        if data is None:
+            return None
+        snr, sdev = level
+        if sdev is None:
+            sdev = noise.noiseForSNR(np.mean(np.square(data, dtype=np.float64)), snr)
+        return noise.addNoise(data, sdev, fbuf)
+        
+    # The block of the shape alone, without any added noise, planned as for
+    # _plan_block()
+    def _plan_shape(self, config, phase, lrs, fbuf, pooled):
+        n = config.xfer_len
+        spa = config.spa
+        waveform = self._waveform
+        if config.shape == "file":
+            if config.file is None:
+                return None
+            return config.file.read, (n, spa, fbuf, config.file_loop), phase, lrs, True
+        if config.shape == "multitone":
+            # Every tone has its own accumulator, derived from the sample
+            # count, which the phase accumulator carries for this shape
+            tones = self._multitone
+            if tones is None:
+                frequencies, amplitudes, phases = config.multitone
+                tones = self._multitone = waveform.multitoneTones(frequencies,
+                    [config.magnitude*a for a in amplitudes], phases, config.sample_rate, spa)
+            if tones is None:
+                return None
+            return waveform.multitone, (tones, phase, n, spa, fbuf), waveform.phaseAdvance(phase, 1, n), lrs, False
+        if config.shape in Modulation.SHAPES:
+            # The modulator carries its own carrier, message and symbol
+            # state from block to block
+            modulator = self._modulator
+            if modulator is None:
+                message, message_frequency, index, rolloff = config.modulation
+                if message not in Modulation.MESSAGES or not 0 < message_frequency < config.sample_rate:
+                    return None
+                modulator = self._modulator = Modulation.Modulator(waveform, config.shape, message, config.magnitude,
+                                                                   config.frequency, message_frequency, index,
+                                                                   rolloff, config.sample_rate, lrs)
+            return modulator.read, (n, spa, fbuf), phase, lrs, True
+        p = waveform.phaseCycles(phase)
+        if self._wavetable:
+            next_phase = self._wavetable.advance(p, n)
+            return self._wavetable.read, (p, n), waveform.phaseCounts(next_phase), lrs, False
+        
+        # The phase is carried in the integer accumulator, so it does not
+        # drift however many blocks are generated
+        word = self._phase_increment
+        if word is None:
+            # Only the sine and arbitrary shapes can run backwards; the chirp
+            # accumulator runs at the sweep rate
+            if config.shape == "chirp":
+                if config.chirp_period <= 0:
+                    return None
+                frequency = 1.0/config.chirp_period
+            elif config.shape in ("sine", "arbitrary"):
+                frequency = config.frequency
+            else:
+                frequency = abs(config.frequency)
+            word = self._phase_increment = waveform.phaseIncrement(frequency, config.sample_rate)
+        next_phase = waveform.phaseAdvance(phase, word, n)
+        if config.shape == "sine":
+            return waveform.ncoSincos, (config.magnitude, phase, word, n, spa, fbuf), next_phase, lrs, False
+        if config.shape == "chirp":
+            return waveform.chirp, (config.magnitude, config.chirp_start, config.chirp_stop, config.chirp_period,
+                                    phase, word, n, spa, fbuf), next_phase, lrs, False
+        if config.shape == "arbitrary":
+            table = self._awg_table
+            if table is None and config.awg is not None:
+                table = self._awg_table = waveform.arbitraryTable(config.awg, config.magnitude, spa)
+            if table is None:
+                return None
+            return waveform.arbitrary, (table, phase, word, n, fbuf), next_phase, lrs, False
+        generators = {
+            "square"   : waveform.square,
+            "triangle" : waveform.triangle,
+            "sawtooth" : waveform.sawtooth,
+            "pulse"    : waveform.pulse,
+        }
+        if config.band_limited:
+            generators.update({
+                "square"   : waveform.squareBL,
+                "triangle" : waveform.triangleBL,
+                "sawtooth" : waveform.sawtoothBL,
+            })
+        if config.shape in generators:
+            p = waveform.blockPhase(config.shape, p, config.delta_phase)
+            return generators[config.shape], (config.magnitude, p, config.delta_phase, n, spa, fbuf), next_phase, lrs, False
+        elif config.shape == "constant":
+            return waveform.constant, (config.magnitude, n, spa, fbuf), next_phase, lrs, False
+        elif config.shape == "whitenoise":
+            # Each pooled block gets its own generator split off the stream
+            split = pooled and waveform.splitNoise()
+            if split:
+                return split.whitenoise, (config.magnitude, n, spa, fbuf), next_phase, lrs, False
+            return waveform.whitenoise, (config.magnitude, n, spa, fbuf), next_phase, lrs, True
+        elif config.shape == "lrs":
+            return self._lrs_block, (config.magnitude, n, spa, lrs, fbuf), next_phase, waveform.lrs_seek(lrs, n), False
+        return None
+        
+    def _lrs_block(self, amp, n, spa, lrs, fbuf):
+        return self._waveform.lrs(amp, n, spa, lrs, fbuf)[0]
+        
+    # Keep the worker pool up to 2*workers blocks ahead of the output and
+    # return the oldest block.  Each block carries the generation state
+    # after it, so the pool can be drained and restarted from the last block
+    # returned at any time.
+    # @return the data buffer, or None for an unknown shape
+    def _next_pooled_block(self, config):
+        if self._pending_stale or (self._pool and len(self._pool) != config.workers):
+            self._drain_pool(config.workers)
+        if self._pool is None:
+            self._pool = WorkerPool.WorkerPool(config.workers)
+        if not self._pending:
+            self._plan_phase = self.phase
+            self._plan_lrs = self.lrs
+            self._pool_resume = self._generation_state(config, self.phase, self.lrs)
+        
+        # Never run further ahead than the output ring, so a buffer is not
+        # reused while its block is still queued (here or in the pipeline)
+        reserved = config.pipeline_depth + 1 if config.pipeline_depth > 0 else 0
+        ahead = min(2*config.workers, len(self._float_buffers) - 1 - reserved)
+        while len(self._pending) < ahead:
+            block = self._plan_block(config, self._plan_phase, self._plan_lrs, self._float_buffers.next(), True)
+            if block is None:
+                break
+            generate, args, self._plan_phase, self._plan_lrs, in_order = block
+            if in_order:
+                job = WorkerPool.Job.completed(generate(*args))
+            else:
+                job = self._pool.submit(generate, *args)
+            self._pending.append((job, self._generation_state(config, self._plan_phase, self._plan_lrs)))
+        
+        if not self._pending:
+            return None
+        job, self._pool_resume = self._pending.popleft()
+        self.phase, self.lrs = self._pool_resume[:2]
+        return job.result()
         
+    # Wait for and discard the blocks generated ahead, after a change that
+    # invalidates them.  The blocks generated in order on this thread (file,
+    # modulation, legacy noise) have already moved their sources on, so the
+    # state after the last block returned is put back and generation
+    # resumes from there.  The pool itself is kept if it still has the
+    # given number of workers.
+    def _drain_pool(self, workers=0):
+        self._pending_stale = False
+        if self._pending:
+            while self._pending:
+                job = self._pending.popleft()[0]
+                try:
+                    job.result()
+                except Exception:
+                    pass
+            self._restore_generation_state(self._pool_resume)
+        if self._pool and len(self._pool) != workers:
+            self._pool.shutdown()
+            self._pool = None
+        
+    # The state generating a block leaves behind: the phase accumulator and
+    # LRS seed, the position in the file, the modulator's carrier, message
+    # and symbols, and the white noise generator
+    # @param phase Phase accumulator after the block
+    # @param lrs   LRS seed after the block
+    # @return a state for _restore_generation_state()
+    def _generation_state(self, config, phase, lrs):
+        file = config.file if config.shape == "file" else None
+        modulator = self._modulator if config.shape in Modulation.SHAPES else None
+        return (phase, lrs, file, file.position if file is not None else None,
+                modulator, modulator.state() if modulator is not None else None,
+                self._noise_epoch, self._waveform.getSeed())
+        
+    # Put the generation state back to one from _generation_state().  The
+    # noise state is left alone if the noise has been restarted since.
+    def _restore_generation_state(self, state):
+        self.phase, self.lrs, file, position, modulator, modulated, epoch, noise = state
+        if file is not None:
+            file.position = position
+        if modulator is not None:
+            modulator.restore(modulated)
+        if epoch == self._noise_epoch:
+            self._waveform.setSeed(noise)
+        
+    # Saturating float to short conversion of a whole block
+    # @param sbuf Short buffer of data.size elements to convert into; by
+    #             default the next buffer of the short ring
+    def convert_float_2_short(self, data, sbuf=None):
+        if sbuf is None:
+            sbuf = self._short_buffers.next()
+        return self._waveform.float2short(data, sbuf)
+        
+    # Number of float buffers that can be in use at once beyond the one being
+    # pushed: the blocks the generator thread has ready or is generating,
+    # and the blocks the worker pool runs ahead
+    def _buffers_ahead(self, config):
+        ahead = 2*config.workers if config.workers > 1 else 0
+        if config.pipeline_depth > 0:
+            ahead += config.pipeline_depth + 1
+        return ahead
+        
+    # (Re)build the output buffer rings for the current xfer_len.  Packets are
+    # generated into these buffers so steady state output allocates no new
+    # sample buffers.
+    # @param ahead Number of buffers that must stay untouched beyond the one
+    #              being pushed
+    def _allocate_buffers(self, ahead=0):
+        length = self.last_xfer_len*self.spa
+        slots = max(BufferRing.BufferRing.slots(length, self.DEFAULT_QUEUE_SIZE), ahead + 1)
+        self._float_buffers = BufferRing.BufferRing(length, slots, np.float32)
+        self._short_buffers = BufferRing.BufferRing(length, slots, np.int16)
+        self._octet_buffers = BufferRing.BufferRing(length, slots, np.uint8)
+        
+    # Publish a new configuration snapshot.  The snapshot is replaced as a
+    # whole, so process() never sees a partly updated configuration.
+    def prop_update_config(self, propid, oldval, newval):
+        with self._config_lock:
+            previous = self._config
+            if self.stream_id == None:
+                self.stream_id = str(uuid.uuid4())
+            blocking = self.sri_blocking
+            if blocking == None:
+                blocking = previous.blocking if previous else False
+            # A file plays at the rate its header records, where it has one
+            sample_rate = self.sample_rate
+            if self.shape == "file" and self._file is not None and self._file.sample_rate:
+                sample_rate = float(self._file.sample_rate)
+            xdelta = 1.0/sample_rate
+            delta_phase = self.frequency * xdelta
+            if ((delta_phase < 0) and (not self.shape == "sine")):
+                delta_phase = -delta_phase
+            multitone = self._multitone_config()
+            spa = 2 if self.complex else 1
+            if self.shape == "file" and self._file is not None and self._file.complex:
+                spa = 2
+            self._config = Config(version=previous.version + 1 if previous else 0,
+                                  stream_id=self.stream_id,
+                                  chan_rf=self.chan_rf,
+                                  col_rf=self.col_rf,
+                                  blocking=blocking,
+                                  xfer_len=self._xfer_len(),
+                                  spa=spa,
+                                  sample_rate=sample_rate,
+                                  xdelta=xdelta,
+                                  shape=self.shape,
+                                  magnitude=self.magnitude,
+                                  frequency=self.frequency,
+                                  delta_phase=delta_phase,
+                                  throttle=self.throttle,
+                                  throttle_spin=self.throttle_spin,
+                                  workers=self.workers,
+                                  stats=self.stats_enabled,
+                                  stats_log_interval=self.stats_log_interval,
+                                  file=self._file,
+                                  file_loop=self.file_loop,
+                                  awg=self._awg,
+                                  chirp_start=self.chirp_start,
+                                  chirp_stop=self.chirp_stop,
+                                  chirp_period=self.chirp_period,
+                                  multitone=multitone,
+                                  band_limited=self.band_limited,
+                                  modulation=(self.modulation_message, self.message_frequency,
+                                              self.modulation_index, self.rolloff),
+                                  noise=self._noise_config(delta_phase, multitone),
+                                  noise_source=(self.noise_generator, self.seed, self._noise_restarts),
+                                  channels=self._channels_config(),
+                                  pipeline_depth=max(0, self.pipeline_depth),
+                                  autotune=(self.xfer_len_autotune, self.latency_budget))
+
+    # The packet size: xfer_len, or the size the tuner has chosen or is
+    # trying
+    def _xfer_len(self):
+        if self.xfer_len_autotune in Autotune.MODES[1:] and self._tuned_xfer_len:
+            return self._tuned_xfer_len
+        return self.xfer_len
+        
+    # The channels property as a tuple of (shape, frequency, magnitude,
+    # stream_id), with the default stream IDs filled in.  Channels of a
+    # shape that cannot be generated per channel are left out.
+    def _channels_config(self):
+        channels = []
+        for index, channel in enumerate(self.channels or ()):
+            if channel.shape not in Waveform.Waveform.CHANNEL_SHAPES:
+                self._log.warn("Channel %d: shape '%s' is not supported in multi-channel mode" % (index, channel.shape))
+                continue
+            stream_id = channel.stream_id or "%s_%d" % (self.stream_id, index)
+            channels.append((channel.shape, channel.frequency, channel.magnitude, stream_id))
+        return tuple(channels)
+        
+    # The multitone properties as (frequencies, amplitudes, phases), with
+    # the missing amplitudes and phases filled in
+    def _multitone_config(self):
+        frequencies = tuple(self.multitone_frequencies or ())
+        count = len(frequencies)
+        amplitudes = tuple(self.multitone_amplitudes or ())[:count]
+        phases = tuple(self.multitone_phases or ())[:count]
+        amplitudes += (1.0,)*(count - len(amplitudes))
+        phases += (0.0,)*(count - len(phases))
+        return frequencies, amplitudes, phases
+        
+    # The added noise as (snr, sdev), or None without add_noise.  The sdev
+    # is None for a shape whose power is measured block by block.
+    def _noise_config(self, delta_phase, multitone):
+        if not self.add_noise:
+            return None
+        waveform = self._waveform
+        power = waveform.shapePower(self.shape, self.magnitude, delta_phase, multitone[1])
+        if power is None:
+            return self.snr, None
+        return self.snr, waveform.noiseForSNR(power, self.snr)
+        
+    # Restart the white noise from the configured seed and generator.  The
+    # generator threads draw on the noise, so the restart is left to
+    # process(), through the configuration.
+    def prop_update_noise(self, propid, oldval, newval):
+        self._noise_restarts += 1
+        self.prop_update_config(propid, oldval, newval)
+        
+    # Restart the white noise for a new configuration.  The generator
+    # thread has been stopped; the blocks the worker pool generated from the
+    # old noise are discarded.
+    def _restart_noise(self, config):
+        self._drain_pool(config.workers)
+        self._noise_epoch += 1
+        generator, seed, restarts = config.noise_source
+        self._waveform.setSeed(seed)
+        try:
+            self._waveform.setGenerator(generator)
+        except ValueError as e:
+            self._log.warn("%s; using the legacy noise generator" % e)
+            self._waveform.setGenerator("legacy")
+
+    # (Re)open file_path for the file shape; playback starts from the
+    # beginning of the file
+    def prop_update_file(self, propid, oldval, newval):
+        self._file = None
+        if self.file_path:
+            try:
+                self._file = FileSource.FileSource(self.file_path, self.file_format)
+            except (IOError, OSError, ValueError, KeyError) as e:
+                self._log.error("Cannot play file '%s': %s" % (self.file_path, e))
+        self.prop_update_config(propid, oldval, newval)
+        
+    # Load the arbitrary shape table from awg_file, or else awg_table
+    def prop_update_awg(self, propid, oldval, newval):
+        values = None
+        if self.awg_file:
+            try:
+                values = FileSource.FileSource(self.awg_file, self.file_format).values()
+            except (IOError, OSError, ValueError, KeyError) as e:
+                self._log.error("Cannot load arbitrary waveform table '%s': %s" % (self.awg_file, e))
+        elif self.awg_table:
+            values = np.array(self.awg_table, dtype=np.float64)
+        self._awg = values
+        if self._config is not None:
+            self.prop_update_config(propid, oldval, newval)
+        
+    # Re-anchor the pacing schedule when throttling is switched on
+    def prop_update_throttle(self, propid, oldval, newval):
+        self.prop_update_config(propid, oldval, newval)
+        if newval and self.next_time is not None:
+            self._throttle.reset(self.next_time)
+
 if __name__ == '__main__':
     logging.getLogger().setLevel(logging.WARN)
     logging.debug("Starting Component")
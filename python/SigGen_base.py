@@ -27,6 +27,9 @@ from ossie.utils import uuid
 from ossie.resource import Resource
 from ossie.threadedcomponent import *
 from ossie.properties import simple_property
+from ossie.properties import simpleseq_property
+from ossie.properties import struct_property
+from ossie.properties import structseq_property
 
 import Queue, copy, time, threading
 from ossie.resource import usesport, providesport
@@ -51,6 +54,8 @@ class SigGen_base(CF__POA.Resource, Resource, ThreadedComponent):
             # Instantiate the default implementations for all ports on this component
             self.port_dataFloat_out = bulkio.OutFloatPort("dataFloat_out")
             self.port_dataShort_out = bulkio.OutShortPort("dataShort_out")
+            self.port_dataOctet_out = bulkio.OutOctetPort("dataOctet_out")
+            self.port_dataDouble_out = bulkio.OutDoublePort("dataDouble_out")
 
         def start(self):
             Resource.start(self)
@@ -82,6 +87,14 @@ class SigGen_base(CF__POA.Resource, Resource, ThreadedComponent):
                                       repid="IDL:BULKIO/dataShort:1.0",
                                       type_="data")
 
+        port_dataOctet_out = usesport(name="dataOctet_out",
+                                      repid="IDL:BULKIO/dataOctet:1.0",
+                                      type_="data")
+
+        port_dataDouble_out = usesport(name="dataDouble_out",
+                                       repid="IDL:BULKIO/dataDouble:1.0",
+                                       type_="data")
+
         ######################################################################
         # PROPERTIES
         # 
@@ -166,4 +179,475 @@ class SigGen_base(CF__POA.Resource, Resource, ThreadedComponent):
                                        action="external",
                                        kinds=("configure",))
         
+        noise_generator = simple_property(id_="noise_generator",
+                                          type_="string",
+                                          defvalue="legacy",
+                                          mode="readwrite",
+                                          action="external",
+                                          kinds=("configure",),
+                                          description="""Random number generator used by the whitenoise shape. legacy is the original LCG and polar method; pcg64 and philox use numpy.random.Generator, which needs numpy 1.17 or later; with an older numpy they are not available and legacy is used instead, with a warning.""")
+        
+        seed = simple_property(id_="seed",
+                               type_="long",
+                               defvalue=123456789,
+                               mode="readwrite",
+                               action="external",
+                               kinds=("configure",),
+                               description="""Seed for the whitenoise generator. Changing this property or noise_generator restarts the noise from this seed. Values less than 1 are ignored.""")
+        
+        throttle_spin = simple_property(id_="throttle_spin",
+                                        type_="boolean",
+                                        defvalue=False,
+                                        mode="readwrite",
+                                        action="external",
+                                        kinds=("configure",),
+                                        description="""When throttling, busy wait for the last few milliseconds before each packet is due instead of sleeping. Improves pacing of short packets at the cost of CPU.""")
+        
+        throttle_rate_error = simple_property(id_="throttle_rate_error",
+                                              type_="double",
+                                              defvalue=0.0,
+                                              mode="readonly",
+                                              action="external",
+                                              kinds=("configure",),
+                                              description="""Difference between the achieved output rate and sample_rate while throttling, in parts per million of sample_rate, measured since throttling last started. Negative when the output is slower than sample_rate.""")
+        
+        workers = simple_property(id_="workers",
+                                  type_="long",
+                                  defvalue=1,
+                                  mode="readwrite",
+                                  action="external",
+                                  kinds=("configure",),
+                                  description="""Number of worker threads generating packets ahead of the output. With more than one worker, up to twice this many packets are generated ahead and pushed in order; whitenoise blocks then come from independent jumped-ahead generator streams (except for the legacy generator, which stays sequential).""")
+        
+        complex = simple_property(id_="complex",
+                                  type_="boolean",
+                                  defvalue=False,
+                                  mode="readwrite",
+                                  action="external",
+                                  kinds=("configure",),
+                                  description="""Output complex data: each of the xfer_len samples in a packet is an interleaved I/Q pair and the SRI mode is set to 1. The sine shape is a complex exponential, so a negative frequency is a negative frequency tone.""")
+        
+        stats_enabled = simple_property(id_="stats_enabled",
+                                        type_="boolean",
+                                        defvalue=False,
+                                        mode="readwrite",
+                                        action="external",
+                                        kinds=("configure",),
+                                        description="""Keep the timing and packet counters reported by the stats property. Counting costs about 0.2 us per packet: around 1.5% of the output loop at an xfer_len of 100, under 1% from 1000 samples up.""")
+        
+        stats_log_interval = simple_property(id_="stats_log_interval",
+                                             type_="double",
+                                             defvalue=0.0,
+                                             mode="readwrite",
+                                             action="external",
+                                             kinds=("configure",),
+                                             description="""Interval between log lines summarizing the stats counters, in seconds. 0 disables the log.""")
+        
+        class Stats(object):
+            packets = simple_property(
+                                      id_="stats::packets",
+                                      name="packets",
+                                      type_="ulonglong",
+                                      defvalue=0
+                                      )
+        
+            samples = simple_property(
+                                      id_="stats::samples",
+                                      name="samples",
+                                      type_="ulonglong",
+                                      defvalue=0
+                                      )
+        
+            generate_time = simple_property(
+                                            id_="stats::generate_time",
+                                            name="generate_time",
+                                            type_="double",
+                                            defvalue=0.0
+                                            )
+        
+            convert_time = simple_property(
+                                           id_="stats::convert_time",
+                                           name="convert_time",
+                                           type_="double",
+                                           defvalue=0.0
+                                           )
+        
+            push_float_time = simple_property(
+                                              id_="stats::push_float_time",
+                                              name="push_float_time",
+                                              type_="double",
+                                              defvalue=0.0
+                                              )
+        
+            push_short_time = simple_property(
+                                              id_="stats::push_short_time",
+                                              name="push_short_time",
+                                              type_="double",
+                                              defvalue=0.0
+                                              )
+        
+            push_octet_time = simple_property(
+                                              id_="stats::push_octet_time",
+                                              name="push_octet_time",
+                                              type_="double",
+                                              defvalue=0.0
+                                              )
+        
+            push_double_time = simple_property(
+                                              id_="stats::push_double_time",
+                                              name="push_double_time",
+                                              type_="double",
+                                              defvalue=0.0
+                                              )
+        
+            sleep_time = simple_property(
+                                         id_="stats::sleep_time",
+                                         name="sleep_time",
+                                         type_="double",
+                                         defvalue=0.0
+                                         )
+        
+            late_packets = simple_property(
+                                           id_="stats::late_packets",
+                                           name="late_packets",
+                                           type_="ulong",
+                                           defvalue=0
+                                           )
+        
+            resyncs = simple_property(
+                                      id_="stats::resyncs",
+                                      name="resyncs",
+                                      type_="ulong",
+                                      defvalue=0
+                                      )
+        
+            pipeline_occupancy = simple_property(
+                                                 id_="stats::pipeline_occupancy",
+                                                 name="pipeline_occupancy",
+                                                 type_="double",
+                                                 defvalue=0.0
+                                                 )
+        
+            pipeline_wait_time = simple_property(
+                                                 id_="stats::pipeline_wait_time",
+                                                 name="pipeline_wait_time",
+                                                 type_="double",
+                                                 defvalue=0.0
+                                                 )
+        
+            elapsed_time = simple_property(
+                                           id_="stats::elapsed_time",
+                                           name="elapsed_time",
+                                           type_="double",
+                                           defvalue=0.0
+                                           )
+        
+            achieved_rate = simple_property(
+                                            id_="stats::achieved_rate",
+                                            name="achieved_rate",
+                                            type_="double",
+                                            defvalue=0.0
+                                            )
+        
+            configured_rate = simple_property(
+                                              id_="stats::configured_rate",
+                                              name="configured_rate",
+                                              type_="double",
+                                              defvalue=0.0
+                                              )
+        
+            def __init__(self, packets=0, samples=0, generate_time=0.0, convert_time=0.0, push_float_time=0.0, push_short_time=0.0, push_octet_time=0.0, push_double_time=0.0, sleep_time=0.0, late_packets=0, resyncs=0, pipeline_occupancy=0.0, pipeline_wait_time=0.0, elapsed_time=0.0, achieved_rate=0.0, configured_rate=0.0):
+                self.packets = packets
+                self.samples = samples
+                self.generate_time = generate_time
+                self.convert_time = convert_time
+                self.push_float_time = push_float_time
+                self.push_short_time = push_short_time
+                self.push_octet_time = push_octet_time
+                self.push_double_time = push_double_time
+                self.sleep_time = sleep_time
+                self.late_packets = late_packets
+                self.resyncs = resyncs
+                self.pipeline_occupancy = pipeline_occupancy
+                self.pipeline_wait_time = pipeline_wait_time
+                self.elapsed_time = elapsed_time
+                self.achieved_rate = achieved_rate
+                self.configured_rate = configured_rate
+        
+            def __str__(self):
+                """Return a string representation of this structure"""
+                d = {}
+                d["packets"] = self.packets
+                d["samples"] = self.samples
+                d["generate_time"] = self.generate_time
+                d["convert_time"] = self.convert_time
+                d["push_float_time"] = self.push_float_time
+                d["push_short_time"] = self.push_short_time
+                d["push_octet_time"] = self.push_octet_time
+                d["push_double_time"] = self.push_double_time
+                d["sleep_time"] = self.sleep_time
+                d["late_packets"] = self.late_packets
+                d["resyncs"] = self.resyncs
+                d["pipeline_occupancy"] = self.pipeline_occupancy
+                d["pipeline_wait_time"] = self.pipeline_wait_time
+                d["elapsed_time"] = self.elapsed_time
+                d["achieved_rate"] = self.achieved_rate
+                d["configured_rate"] = self.configured_rate
+                return str(d)
+        
+            @classmethod
+            def getId(cls):
+                return "stats"
+        
+            @classmethod
+            def isStruct(cls):
+                return True
+        
+            def getMembers(self):
+                return [("packets",self.packets),("samples",self.samples),("generate_time",self.generate_time),("convert_time",self.convert_time),("push_float_time",self.push_float_time),("push_short_time",self.push_short_time),("push_octet_time",self.push_octet_time),("push_double_time",self.push_double_time),("sleep_time",self.sleep_time),("late_packets",self.late_packets),("resyncs",self.resyncs),("pipeline_occupancy",self.pipeline_occupancy),("pipeline_wait_time",self.pipeline_wait_time),("elapsed_time",self.elapsed_time),("achieved_rate",self.achieved_rate),("configured_rate",self.configured_rate)]
+        
+        stats = struct_property(id_="stats",
+                                structdef=Stats,
+                                configurationkind=("configure",),
+                                mode="readonly",
+                                description="""Counters for the output loop since the component was last started, refreshed about twice a second while running and on stop. Stage times are totals in seconds, measured on one packet in eight and scaled to all packets.""")
+        
+        file_path = simple_property(id_="file_path",
+                                    type_="string",
+                                    defvalue="",
+                                    mode="readwrite",
+                                    action="external",
+                                    kinds=("configure",),
+                                    description="""File played by the file shape: raw samples, a BLUE file or a SigMF recording (the .sigmf-data or .sigmf-meta file). The file is memory mapped, so it may be larger than memory. Complex BLUE and SigMF data is output as complex; real data is output as complex, with a zero imaginary part, when complex is set. A BLUE or SigMF file that records its sample rate is played at that rate in place of sample_rate, for the SRI xdelta, the timestamps and throttling.""")
+        
+        file_format = simple_property(id_="file_format",
+                                      type_="string",
+                                      defvalue="auto",
+                                      mode="readwrite",
+                                      action="external",
+                                      kinds=("configure",),
+                                      description="""Sample format of file_path. auto recognizes BLUE and SigMF files by their headers and reads anything else as raw float32; float32 and int16 read the whole file as raw native byte order samples.""")
+        
+        file_loop = simple_property(id_="file_loop",
+                                    type_="boolean",
+                                    defvalue=True,
+                                    mode="readwrite",
+                                    action="external",
+                                    kinds=("configure",),
+                                    description="""Restart the file shape from the beginning of the file when it reaches the end. Otherwise the last packet is short and is followed by an end of stream.""")
+        
+        awg_table = simpleseq_property(id_="awg_table",
+                                       type_="double",
+                                       defvalue=[],
+                                       mode="readwrite",
+                                       action="external",
+                                       kinds=("configure",),
+                                       description="""One period of the waveform played by the arbitrary shape, repeated frequency times a second and scaled by magnitude. Samples between table entries are interpolated linearly, so any repetition rate works. For complex output the table is interleaved I/Q pairs.""")
+        
+        awg_file = simple_property(id_="awg_file",
+                                   type_="string",
+                                   defvalue="",
+                                   mode="readwrite",
+                                   action="external",
+                                   kinds=("configure",),
+                                   description="""File holding the arbitrary shape table, in any layout the file shape reads (see file_format). Used instead of awg_table when set. The whole file is loaded.""")
+        
+        chirp_start = simple_property(id_="chirp_start",
+                                      type_="double",
+                                      defvalue=0.0,
+                                      mode="readwrite",
+                                      action="external",
+                                      kinds=("configure",),
+                                      description="""Frequency at the start of each sweep of the chirp shape.""")
+        
+        chirp_stop = simple_property(id_="chirp_stop",
+                                     type_="double",
+                                     defvalue=1000.0,
+                                     mode="readwrite",
+                                     action="external",
+                                     kinds=("configure",),
+                                     description="""Frequency at the end of each sweep of the chirp shape.""")
+        
+        chirp_period = simple_property(id_="chirp_period",
+                                       type_="double",
+                                       defvalue=1.0,
+                                       mode="readwrite",
+                                       action="external",
+                                       kinds=("configure",),
+                                       description="""Duration of one sweep of the chirp shape. The frequency rises (or falls) linearly from chirp_start to chirp_stop over the period and the sweep repeats; every sweep starts at phase 0.""")
+        
+        multitone_frequencies = simpleseq_property(id_="multitone_frequencies",
+                                                   type_="double",
+                                                   defvalue=[],
+                                                   mode="readwrite",
+                                                   action="external",
+                                                   kinds=("configure",),
+                                                   description="""Tone frequencies of the multitone shape.""")
+        
+        multitone_amplitudes = simpleseq_property(id_="multitone_amplitudes",
+                                                  type_="double",
+                                                  defvalue=[],
+                                                  mode="readwrite",
+                                                  action="external",
+                                                  kinds=("configure",),
+                                                  description="""Amplitude of each multitone tone, relative to magnitude. Tones without an entry have amplitude 1.""")
+        
+        multitone_phases = simpleseq_property(id_="multitone_phases",
+                                              type_="double",
+                                              defvalue=[],
+                                              mode="readwrite",
+                                              action="external",
+                                              kinds=("configure",),
+                                              description="""Starting phase of each multitone tone. Tones without an entry start at phase 0.""")
+        
+        band_limited = simple_property(id_="band_limited",
+                                       type_="boolean",
+                                       defvalue=False,
+                                       mode="readwrite",
+                                       action="external",
+                                       kinds=("configure",),
+                                       description="""Generate the square, triangle and sawtooth shapes band-limited (PolyBLEP), which greatly reduces aliasing at high frequencies.""")
+        
+        modulation_message = simple_property(id_="modulation_message",
+                                             type_="string",
+                                             defvalue="tone",
+                                             mode="readwrite",
+                                             action="external",
+                                             kinds=("configure",),
+                                             description="""Message carried by the am, fm, pm, bpsk and qpsk shapes: a tone at message_frequency, or symbols at message_frequency symbols per second from the LRS or from white noise. The PSK shapes alternate their symbols for a tone message.""")
+        
+        message_frequency = simple_property(id_="message_frequency",
+                                            type_="double",
+                                            defvalue=100.0,
+                                            mode="readwrite",
+                                            action="external",
+                                            kinds=("configure",),
+                                            description="""Frequency of the message tone, or the symbol rate, of the modulation shapes. Must be below sample_rate. The carrier is at frequency.""")
+        
+        modulation_index = simple_property(id_="modulation_index",
+                                           type_="double",
+                                           defvalue=0.5,
+                                           mode="readwrite",
+                                           action="external",
+                                           kinds=("configure",),
+                                           description="""Modulation depth of the am shape, peak phase deviation in radians of the pm shape, and peak frequency deviation of the fm shape as a multiple of message_frequency.""")
+        
+        rolloff = simple_property(id_="rolloff",
+                                  type_="double",
+                                  defvalue=0.35,
+                                  mode="readwrite",
+                                  action="external",
+                                  kinds=("configure",),
+                                  description="""Excess bandwidth of the root raised cosine pulse that shapes the symbols of the modulation shapes, from 0 to 1.""")
+        
+        add_noise = simple_property(id_="add_noise",
+                                    type_="boolean",
+                                    defvalue=False,
+                                    mode="readwrite",
+                                    action="external",
+                                    kinds=("configure",),
+                                    description="""Add white noise to the output of any shape, at the SNR given by snr. The noise comes from the noise_generator and seed used by the whitenoise shape.""")
+        
+        snr = simple_property(id_="snr",
+                              type_="double",
+                              defvalue=20.0,
+                              mode="readwrite",
+                              action="external",
+                              kinds=("configure",),
+                              description="""Signal to noise ratio of the noise added by add_noise, relative to the mean power of the shape. The power is worked out from magnitude for the periodic, noise and multitone shapes and measured block by block for file, arbitrary, am, bpsk and qpsk.""")
+        
+        class Channel(object):
+            shape = simple_property(
+                                    id_="channels::shape",
+                                    name="shape",
+                                    type_="string",
+                                    defvalue="sine"
+                                    )
+        
+            frequency = simple_property(
+                                        id_="channels::frequency",
+                                        name="frequency",
+                                        type_="double",
+                                        defvalue=1000.0
+                                        )
+        
+            magnitude = simple_property(
+                                        id_="channels::magnitude",
+                                        name="magnitude",
+                                        type_="double",
+                                        defvalue=100.0
+                                        )
+        
+            stream_id = simple_property(
+                                        id_="channels::stream_id",
+                                        name="stream_id",
+                                        type_="string",
+                                        defvalue=""
+                                        )
+        
+            def __init__(self, shape="sine", frequency=1000.0, magnitude=100.0, stream_id=""):
+                self.shape = shape
+                self.frequency = frequency
+                self.magnitude = magnitude
+                self.stream_id = stream_id
+        
+            def __str__(self):
+                """Return a string representation of this structure"""
+                d = {}
+                d["shape"] = self.shape
+                d["frequency"] = self.frequency
+                d["magnitude"] = self.magnitude
+                d["stream_id"] = self.stream_id
+                return str(d)
+        
+            @classmethod
+            def getId(cls):
+                return "channels::channel"
+        
+            @classmethod
+            def isStruct(cls):
+                return True
+        
+            def getMembers(self):
+                return [("shape",self.shape),("frequency",self.frequency),("magnitude",self.magnitude),("stream_id",self.stream_id)]
+        
+        channels = structseq_property(id_="channels",
+                                      structdef=Channel,
+                                      defvalue=[],
+                                      configurationkind=("configure",),
+                                      mode="readwrite",
+                                      description="""Channels generated together in multi-channel mode. When the sequence is not empty, each channel is generated at sample_rate with xfer_len samples per packet and pushed on its own stream, in place of the single shape.""")
+        
+        pipeline_depth = simple_property(id_="pipeline_depth",
+                                         type_="long",
+                                         defvalue=0,
+                                         mode="readwrite",
+                                         action="external",
+                                         kinds=("configure",),
+                                         description="""Number of packets a dedicated generator thread keeps ready ahead of the output. While pushPacket is blocked on a slow consumer, the next packets are being generated. 0 generates each packet on the processing thread just before it is pushed. Not used in multi-channel mode.""")
+        
+        xfer_len_autotune = simple_property(id_="xfer_len_autotune",
+                                            type_="string",
+                                            defvalue="off",
+                                            mode="readwrite",
+                                            action="external",
+                                            kinds=("configure",),
+                                            description="""Choose the packet size at run time instead of using xfer_len. The output runs briefly at a series of power of two packet sizes and times each. latency picks the largest size whose packets span and are produced within latency_budget, trying sizes from the largest that spans latency_budget down, so the output never runs at a larger size. throughput picks the smallest size within 5% of the best samples per second. Tuning starts over when the shape, rate or output configuration changes.""")
+        
+        latency_budget = simple_property(id_="latency_budget",
+                                         type_="double",
+                                         defvalue=0.01,
+                                         mode="readwrite",
+                                         action="external",
+                                         kinds=("configure",),
+                                         description="""Longest time from the first sample of a packet falling due to the packet being pushed, for the latency autotune mode.""")
+        
+        autotuned_xfer_len = simple_property(id_="autotuned_xfer_len",
+                                             type_="long",
+                                             defvalue=0,
+                                             mode="readonly",
+                                             action="external",
+                                             kinds=("configure",),
+                                             description="""Packet size in use while xfer_len_autotune is on: the size being tried, then the size chosen. 0 when autotuning is off.""")
+        
 
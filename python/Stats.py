@@ -0,0 +1,138 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Counters for the time spent in each stage of the output loop.
+
+The loop takes one clock reading at each stage boundary (lap).  A clock
+reading costs a noticeable fraction of a short packet, so only one packet
+in every interval is timed and the stage times are scaled up from those.
+The other packets only count down to the next timed one: the timed packet
+counts the packets and samples of its whole batch, so the counts stay
+exact without touching the counters on every packet.
+'''
+import time
+
+# time.perf_counter is not available before python 3.3
+_clock = getattr(time, "perf_counter", time.time)
+
+class Counters:
+    # Packets per timed packet
+    INTERVAL = 8
+
+    def __init__(self, clock=_clock, interval=INTERVAL):
+        self._clock = clock
+        self.interval = interval
+        self.reset()
+
+    # Zero every counter and restart the elapsed time
+    def reset(self):
+        self.start = self.now = self._clock()
+        self.packets = 0
+        self.samples = 0
+        self.generate_time = 0.0
+        self.convert_time = 0.0
+        self.push_float_time = 0.0
+        self.push_short_time = 0.0
+        self.push_octet_time = 0.0
+        self.push_double_time = 0.0
+        self.sleep_time = 0.0
+        self.late_packets = 0
+        self.resyncs = 0
+        # Packets taken from the generator thread, the packets it had ready
+        # at those times, and the time spent waiting on it
+        self.pipeline_packets = 0
+        self.pipeline_ready = 0
+        self.pipeline_wait_time = 0.0
+        self.timed_packets = 0
+        # Packets until the next timed one.  The output loop counts it down
+        # itself and calls timed() when it reaches 0.
+        self.countdown = self.interval
+
+    # Start timing the packet that ends a batch of interval packets
+    def timed(self):
+        self.countdown = self.interval
+        self.timed_packets += 1
+        self.lap()
+
+    # Count a batch, once its timed packet has gone out
+    # @param samples Samples in each packet of the batch; a packet of
+    #                another size is made up for by adding the difference
+    #                to samples
+    def batch(self, samples):
+        self.packets += self.interval
+        self.samples += self.interval*samples
+
+    # Count the packets of the batch in progress, when the loop stops
+    # @param samples Samples in each packet, as for batch()
+    def flush(self, samples):
+        count = self.interval - self.countdown
+        self.packets += count
+        self.samples += count*samples
+        self.countdown = self.interval
+
+    # Estimate the total time of a stage over all packets from its time
+    # over the timed ones
+    # @param measured Accumulated stage time of the timed packets
+    def scaled(self, measured):
+        if not self.timed_packets:
+            return 0.0
+        return measured*self.packets/self.timed_packets
+
+    # Read the clock into now
+    # @return seconds since the previous lap (or reset)
+    def lap(self):
+        now = self._clock()
+        elapsed = now - self.now
+        self.now = now
+        return elapsed
+
+    # @return the mean number of packets the generator thread had ready
+    #         when the output took one
+    def occupancy(self):
+        if not self.pipeline_packets:
+            return 0.0
+        return float(self.pipeline_ready)/self.pipeline_packets
+
+    # @return seconds since the last reset, as of the last lap
+    def elapsed(self):
+        return self.now - self.start
+
+    # @return samples per second achieved since the last reset
+    def rate(self):
+        elapsed = self.elapsed()
+        if elapsed <= 0:
+            return 0.0
+        return self.samples/elapsed
+
+    # One line summary: throughput and the share of the elapsed time spent
+    # in each stage
+    # @param sample_rate Configured sample rate
+    def summary(self, sample_rate):
+        elapsed = self.elapsed() or 1.0
+        line = ("%d packets, %d samples, %.1f sps (configured %.1f); generate %.1f%%, convert %.1f%%, "
+                "push float %.1f%%, push short %.1f%%, push octet %.1f%%, push double %.1f%%, sleep %.1f%%; "
+                "%d late, %d resyncs" %
+                (self.packets, self.samples, self.rate(), sample_rate,
+                 100*self.scaled(self.generate_time)/elapsed, 100*self.scaled(self.convert_time)/elapsed,
+                 100*self.scaled(self.push_float_time)/elapsed, 100*self.scaled(self.push_short_time)/elapsed,
+                 100*self.scaled(self.push_octet_time)/elapsed, 100*self.scaled(self.push_double_time)/elapsed,
+                 100*self.scaled(self.sleep_time)/elapsed, self.late_packets, self.resyncs))
+        if self.pipeline_packets:
+            line += ("; pipeline %.1f packets ready, waited %.1f%%" %
+                     (self.occupancy(), 100*self.scaled(self.pipeline_wait_time)/elapsed))
+        return line
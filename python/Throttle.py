@@ -0,0 +1,150 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Deadline based pacing of the output stream.
+
+Each packet is due when the local clock has advanced as far past the
+anchor as the packet timestamp has.  Sleeping to an absolute deadline
+rather than for a fixed interval means the time spent generating and
+pushing is not added to every packet, so the output rate does not drift.
+'''
+import time
+
+CLOCK_MONOTONIC = 1
+
+# time.monotonic is not available before python 3.3.  There, on Linux,
+# clock_gettime(CLOCK_MONOTONIC) is called through ctypes; elsewhere the
+# wall clock is all there is, and wait() guards against it stepping.
+def _monotonic():
+    if hasattr(time, "monotonic"):
+        return time.monotonic
+    try:
+        import ctypes
+        class timespec(ctypes.Structure):
+            _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+        for library in ("librt.so.1", None):
+            try:
+                clock_gettime = ctypes.CDLL(library).clock_gettime
+                break
+            except (OSError, AttributeError):
+                clock_gettime = None
+        if clock_gettime is None:
+            return time.time
+        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+        def monotonic():
+            ts = timespec()
+            if clock_gettime(CLOCK_MONOTONIC, ctypes.byref(ts)):
+                raise OSError("clock_gettime(CLOCK_MONOTONIC) failed")
+            return ts.tv_sec + ts.tv_nsec*1e-9
+        monotonic()
+        return monotonic
+    except (ImportError, OSError):
+        return time.time
+
+_clock = _monotonic()
+
+# Seconds from timestamp a to timestamp b (PrecisionUTCTime-like objects)
+def _elapsed(a, b):
+    return (b.twsec - a.twsec) + (b.tfsec - a.tfsec)
+
+# The anchor keeps its own copy, since the caller advances its timestamp
+# in place
+class _Timestamp:
+    def __init__(self, timestamp):
+        self.twsec = timestamp.twsec
+        self.tfsec = timestamp.tfsec
+
+class Throttle:
+    # Time before a deadline at which spin mode stops sleeping and busy waits
+    SPIN_THRESHOLD = 0.002
+    # How far behind schedule the stream may fall before it is re-anchored
+    # rather than caught up
+    MAX_LAG = 1.0
+
+    def __init__(self, clock=_clock, sleep=time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self.spin = False
+        self.max_lag = self.MAX_LAG
+        self.reset(None)
+
+    # Anchor the schedule: the packet with this timestamp is due now
+    # @param timestamp Timestamp of the next packet (None to wait for one)
+    def reset(self, timestamp):
+        if timestamp is not None:
+            timestamp = _Timestamp(timestamp)
+        self._anchor = timestamp
+        self._anchor_clock = self._clock()
+        self._previous = timestamp
+        self._start = self._anchor
+        self._start_clock = self._anchor_clock
+        self.late = 0
+        self.resyncs = 0
+        self.max_late = 0.0
+
+    # Block until the packet with the given timestamp is due.  A packet that
+    # is already due returns at once, so a stream that fell behind catches
+    # up; one more than max_lag behind is re-anchored instead.  A packet is
+    # never due more than one packet after the previous one was, so a
+    # deadline further off than that means the clock stepped back; the
+    # stream is re-anchored to wait one packet from now.
+    # @param timestamp Timestamp of the next packet
+    # @return how late the packet was, in seconds (0 when on time)
+    def wait(self, timestamp):
+        if self._anchor is None:
+            self.reset(timestamp)
+            return 0.0
+        previous, self._previous = self._previous, _Timestamp(timestamp)
+        deadline = self._anchor_clock + _elapsed(self._anchor, timestamp)
+        now = self._clock()
+        remaining = deadline - now
+        if previous is not None and remaining > _elapsed(previous, timestamp) + self.max_lag:
+            self.resyncs += 1
+            self._anchor = previous
+            self._anchor_clock = now
+            remaining = _elapsed(previous, timestamp)
+            deadline = now + remaining
+        if remaining <= 0:
+            lag = -remaining
+            self.late += 1
+            self.max_late = max(self.max_late, lag)
+            if lag > self.max_lag:
+                self.resyncs += 1
+                self._anchor = _Timestamp(timestamp)
+                self._anchor_clock = now
+            return lag
+        if self.spin:
+            if remaining > self.SPIN_THRESHOLD:
+                self._sleep(remaining - self.SPIN_THRESHOLD)
+            while self._clock() < deadline:
+                pass
+        else:
+            self._sleep(remaining)
+        return 0.0
+
+    # Relative difference between the achieved and the nominal rate since the
+    # last reset, in parts per million.  Negative when the output is slow.
+    # @param timestamp Timestamp of the next packet
+    def rate_error(self, timestamp):
+        if self._start is None:
+            return 0.0
+        real = self._clock() - self._start_clock
+        stream = _elapsed(self._start, timestamp)
+        if real <= 0:
+            return 0.0
+        return (stream/real - 1.0)*1e6
@@ -26,9 +26,23 @@ Waveform class produces the following types of waveforms:
  - constant
  - lrs
  - ramp
+ - arbitrary
+ - chirp
+ - multitone
+
+square, triangle and sawtooth also have band-limited variants (squareBL,
+triangleBL, sawtoothBL) that round off each discontinuity with a PolyBLEP
+(or, for the corners of the triangle, its integral, a PolyBLAMP) residual.
+
+Each generator returns a contiguous numpy float32 array holding the whole
+block, computed with vectorized numpy operations rather than per-sample
+Python loops.
 '''
+import copy
 import math
+from fractions import Fraction
 import numpy as np
+import Wavetable
 
 class Waveform:
     A = 67081293.0
@@ -46,52 +60,279 @@ class Waveform:
     # Value: = 1G = 2^30
     B1G  = 1073741824.
     
+    # Number of LCG states (two per candidate pair) drawn per white noise block
+    NOISE_BLOCK = 8192
+    _noise_multipliers = None
+    _noise_increments = None
+    
+    # Random number generators available to whitenoise().  "legacy" is the
+    # original LCG and polar method; the others are numpy BitGenerators,
+    # which only exist from numpy 1.17 on.
+    NOISE_GENERATORS = {"legacy":None}
+    if hasattr(np.random, "Generator"):
+        NOISE_GENERATORS.update(pcg64="PCG64", philox="Philox")
+    # The legacy polar method uses a log10 based factor, which gives a
+    # standard deviation of sdev/sqrt(ln(10)); the numpy generators are
+    # scaled to match it
+    NOISE_SCALE = 1.0 / math.sqrt(math.log(10.0))
+    _rng = None
+    
+    # Set the seed used in white noise waveform generation
+    # @param value A positive integer seed, or a state returned by getSeed()
     def setSeed(self, value):
-        if value > 0: self.seed = value
+        if isinstance(value, dict):
+            if self._rng is None:
+                raise ValueError("Generator state given, but the legacy noise generator is selected")
+            self._rng.bit_generator.state = value
+            return
+        if value > 0:
+            self.seed = value
+            if self._rng is not None:
+                self._rng = np.random.Generator(type(self._rng.bit_generator)(value))
+    
+    # @return the current white noise state, which can be passed back to
+    #         setSeed() to repeat the noise from this point
+    def getSeed(self):
+        if self._rng is not None:
+            return self._rng.bit_generator.state
+        return self.seed
+    
+    # Select the white noise generator, seeded from the current seed
+    # @param name One of NOISE_GENERATORS
+    def setGenerator(self, name):
+        if name not in self.NOISE_GENERATORS:
+            raise ValueError("Noise generator %s is not available (numpy %s supports %s)" %
+                             (name, np.__version__, ", ".join(sorted(self.NOISE_GENERATORS))))
+        bit_generator = self.NOISE_GENERATORS[name]
+        if bit_generator is None:
+            self._rng = None
+        else:
+            self._rng = np.random.Generator(getattr(np.random, bit_generator)(self.seed))
+    
+    # Split off a white noise generator for one block, so that blocks can be
+    # generated in parallel.  The new Waveform continues from the current
+    # state, and this one jumps ahead to a stream that does not overlap it.
+    # @return the new Waveform, or None for the legacy generator, whose
+    #         blocks can only be generated in order
+    def splitNoise(self):
+        if self._rng is None:
+            return None
+        split = Waveform()
+        split._rng = copy.deepcopy(self._rng)
+        self._rng = np.random.Generator(self._rng.bit_generator.jumped())
+        return split
+    
+    # The legacy LCG is x' = (A*x + B) mod 2^26 on the integer seed.  Its
+    # j-step form x_j = (A^j*x + C_j) mod 2^26 is tabulated for j = 0..NOISE_BLOCK
+    # so a whole block of states can be computed from one state.
+    @classmethod
+    def _noise_tables(cls):
+        if cls._noise_multipliers is None:
+            mask = int(cls.T26) - 1
+            a = int(cls.A)
+            b = int(cls.B)
+            multipliers = np.empty(cls.NOISE_BLOCK+1, dtype=np.uint64)
+            increments = np.empty(cls.NOISE_BLOCK+1, dtype=np.uint64)
+            mj = 1; cj = 0
+            for j in range(cls.NOISE_BLOCK+1):
+                multipliers[j] = mj
+                increments[j] = cj
+                mj = (a*mj) & mask
+                cj = (a*cj + b) & mask
+            cls._noise_multipliers = multipliers
+            cls._noise_increments = increments
+        return cls._noise_multipliers, cls._noise_increments
         
     # Create a white noise array of given magnitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param sdev Standard deviation
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @return the new data buffer
-    def whitenoise(self, sdev, n, spa=1):
-        outbuff = range(n*spa)
-        v1 = 0.0; v2 = 0.0; sum1 = 0.0
+    def whitenoise(self, sdev, n, spa=1, fbuf=None):
+        rng = self._rng
+        if rng is not None:
+            outbuff = rng.standard_normal(n*spa, dtype=np.float32, out=self._output(fbuf, n*spa))
+            outbuff *= np.float32(sdev*self.NOISE_SCALE)
+            return outbuff
+        
         fdev = float(sdev)
         factor = -2.0 / math.log(10.0)
+        maxIndex = n*spa
+        outbuff = self._output(fbuf, maxIndex)
+        multipliers, increments = self._noise_tables()
+        mask = np.uint64(self.T26 - 1)
+        
+        # The first step is taken exactly as the scalar loop did, since the
+        # seed itself may be wider than 26 bits
         sis = float(self.seed)/self.T26
+        sis = sis*self.A + self.BI
+        state = np.uint64(int((sis - float(int(sis)))*self.T26))
         
-        maxIndex = n*spa
-        #Do this is in a while loop instead of a for loop
-        #because we don't know how many times the sum1 is invalid 
-        #we are forced to continue
-        i=0
+        # Draw candidate pairs in bulk, reject them in bulk, and repeat until
+        # enough pairs were accepted
+        i = 0
         while i < maxIndex:
-            sis = sis*self.A + self.BI;
-            sis = sis - float(int(sis))
-            v1 = float(sis)
-            v1 = v1+v1-1
-
-            sis = sis*self.A + self.BI;
-            sis = sis - float(int(sis))
-            v2 = float(sis)
-            v2 = v2+v2-1
-
+            pairs = (maxIndex - i + 1)//2
+            count = min(self.NOISE_BLOCK, 2*(pairs + pairs//3 + 16))
+            states = (multipliers[:count+1]*state + increments[:count+1]) & mask
+            state = states[count]
+            v = states[:count]/self.T26
+            v += v
+            v -= 1
+            v1 = v[0::2]
+            v2 = v[1::2]
             sum1 = v1*v1 + v2*v2
-            if sum1 >= 1.0 or sum1 <1e-20: continue
-            sum1 = fdev * float(math.sqrt(factor*math.log(sum1)/sum1))
-            outbuff[i] = float(np.float32(v1*sum1))
-            if (i+1) < maxIndex:
-                outbuff[i+1] = float(np.float32(v2*sum1))
-            i+=2
+            accepted = np.nonzero((sum1 < 1.0) & (sum1 >= 1e-20))[0]
+            if len(accepted) >= pairs:
+                accepted = accepted[:pairs]
+                # Leave the seed just after the last pair used
+                state = states[2*accepted[-1] + 1]
+            sum1 = sum1[accepted]
+            sum1 = fdev * np.sqrt(factor*np.log(sum1)/sum1)
+            used = min(2*len(accepted), maxIndex - i)
+            outbuff[i:i+used:2] = v1[accepted]*sum1
+            outbuff[i+1:i+used:2] = (v2[accepted]*sum1)[:used//2]
+            i += used
         
-        self.seed = int(sis*self.T26)
+        if maxIndex:
+            self.seed = int(state)
         
         return outbuff
     
+    # Sample indices 0, 1, 2, ... shared by every block no longer than it
+    _index = np.arange(0, dtype=np.float64)
+
+    # Unwrapped phase of every sample in the block: p, p+dp, p+2*dp, ...
+    # Computed directly rather than accumulated, so the block costs the same
+    # no matter where in the stream it starts.
+    def _phases(self, p, dp, n):
+        if len(self._index) < n:
+            self._index = np.arange(n, dtype=np.float64)
+        return p + dp*self._index[:n]
+
+    # Flag the samples on which the scalar generators would have wrapped
+    # their phase accumulator (p >= 1.0).  The first sample only wraps when
+    # the starting phase is already >= 1.0.
+    def _wraps(self, cycles):
+        wrapped = np.empty(len(cycles), dtype=bool)
+        if len(cycles):
+            wrapped[0] = cycles[0] > 0
+            np.not_equal(cycles[1:], cycles[:-1], out=wrapped[1:])
+        return wrapped
+
+    # The caller's output array when it has the right size, else a new one
+    def _output(self, fbuf, size):
+        if fbuf is None or len(fbuf) != size:
+            fbuf = np.empty(size, dtype=np.float32)
+        return fbuf
+
+    # Expand one value per atom into spa scalars per atom
+    def _atoms(self, values, spa, fbuf=None):
+        if spa == 2:
+            outbuff = self._output(fbuf, 2*len(values))
+            outbuff[0::2] = values
+            outbuff[1::2] = values
+        else:
+            outbuff = self._output(fbuf, len(values))
+            outbuff[:] = values
+        return outbuff
+
+    # Phase accumulator for carrying the phase from block to block.  Like a
+    # hardware NCO, one cycle is 2^64 counts, so advancing by any number of
+    # samples is exact integer arithmetic and the phase never drifts.
+    PHASE_ONE = 2**64
+    _index_u64 = np.arange(0, dtype=np.uint64)
+
+    # @param cycles A phase, or a phase increment per sample, in cycles
+    # @return the same in accumulator counts (for an increment, the NCO
+    #         tuning word)
+    def phaseCounts(self, cycles):
+        return int(round(math.fmod(cycles, 1.0)*self.PHASE_ONE)) % self.PHASE_ONE
+
+    # The tuning word for a tone, rounded from the exact ratio rather than
+    # from frequency/sample_rate in floating point
+    # @return the accumulator increment per sample
+    def phaseIncrement(self, frequency, sample_rate):
+        return int(round(Fraction(frequency)*self.PHASE_ONE/Fraction(sample_rate))) % self.PHASE_ONE
+
+    # @return the phase, in cycles in [0, 1), of an accumulator value
+    def phaseCycles(self, acc):
+        return float(acc >> 11)*2.0**-53
+
+    # The square and pulse generators only wrap their first sample when it
+    # starts at a phase of 1.0 or more.  A block of them whose first sample
+    # is the first one past a wrap (p < dp) therefore starts from p + 1.0,
+    # so a pulse or edge on a block boundary is kept, as it is within a
+    # block and in the wavetables.  Other shapes start from p.
+    # @param shape Shape of the block
+    # @param p     Phase of the first sample, in cycles in [0, 1)
+    # @param dp    Phase increment per sample, >= 0
+    # @return the phase to pass to the generator
+    def blockPhase(self, shape, p, dp):
+        if p < dp and shape in ("square", "pulse"):
+            return p + 1.0
+        return p
+
+    # @return the accumulator value n samples after acc
+    def phaseAdvance(self, acc, word, n):
+        return (acc + n*word) % self.PHASE_ONE
+
+    # Phase of every sample in the block from the 64-bit accumulator, in
+    # cycles in [0, 1).  Each phase is exact to the 53 bits of a double, no
+    # matter how long the block is or how far into the stream it starts.
+    def ncoCycles(self, acc, word, n):
+        if len(self._index_u64) < n:
+            self._index_u64 = np.arange(n, dtype=np.uint64)
+        counts = self._index_u64[:n]*np.uint64(word)
+        counts += np.uint64(acc)
+        counts >>= np.uint64(11)
+        phases = counts.astype(np.float64)
+        phases *= 2.0**-53
+        return phases
+
+    # Create a SIN or COSINE array of given magnitude from a phase accumulator
+    # rather than a floating point phase
+    # @param fbuf Optional output array of n*spa elements to write into
+    # @param amp  Amplitude
+    # @param acc  Phase accumulator value of the first sample
+    # @param word Accumulator increment per sample, from phaseCounts()
+    # @param n    Number of elements
+    # @param spa  Scalars per atom, 2 for Complex
+    # @return the new data buffer
+    def ncoSincos(self, amp, acc, word, n, spa, fbuf=None):
+        phases = self.ncoCycles(acc, word, n)
+        phases *= self.TWOPI
+        return self._sincos(amp, phases, n, spa, fbuf)
+
+    # Create a linear frequency sweep (LFM chirp) of given magnitude.  The
+    # phase accumulator holds the position within the sweep, one cycle per
+    # sweep, and the phase of each sample is the quadratic
+    #   period*u*(start + (stop - start)*u/2) cycles
+    # of its position u in [0, 1).  Every sweep starts at phase 0, so
+    # successive sweeps are coherent whatever the period.
+    # @param fbuf   Optional output array of n*spa elements to write into
+    # @param amp    Amplitude
+    # @param start  Frequency at the start of the sweep, Hz
+    # @param stop   Frequency at the end of the sweep, Hz
+    # @param period Sweep duration, seconds
+    # @param acc    Phase accumulator value of the first sample
+    # @param word   Accumulator increment per sample, the phaseIncrement() of
+    #               1/period
+    # @param n      Number of elements
+    # @param spa    Scalars per atom, 2 for Complex
+    # @return the new data buffer
+    def chirp(self, amp, start, stop, period, acc, word, n, spa, fbuf=None):
+        u = self.ncoCycles(acc, word, n)
+        phases = u*(0.5*(stop - start)*period)
+        phases += start*period
+        phases *= u
+        phases -= np.floor(phases)
+        phases *= self.TWOPI
+        return self._sincos(amp, phases, n, spa, fbuf)
+
     # Create a SIN or COSINE array of given magnitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param p    Phase
     # @param dp   Delta Phase
@@ -99,206 +340,641 @@ class Waveform:
     # @param spa  Scalars per atom, 2 for Complex
     # @return the new data buffer
    
-    # fast algorithm based on:  sin(x+dp) = sin(x)*cos(dp) + cos(x)*sin(dp)
-    #                           cos(x+dp) = cos(x)*cos(dp) - sin(x)*sin(dp)
-    def sincos(self, amp, p, dp, n, spa):
-        outbuff = range(n*spa)
-        cxr = amp*math.cos(p*self.TWOPI)
-        cxi = amp*math.sin(p*self.TWOPI)
-        dxr = math.cos(dp*self.TWOPI)
-        dxi = math.sin(dp*self.TWOPI)
-        if spa==2:
-            for i in range(0, n*2, 2):
-                outbuff[i] = float(np.float32(cxr))
-                outbuff[i+1] = float(np.float32(cxi))
-                axr = (cxr*dxr) - (cxi*dxi)
-                axi = (cxr*dxi) + (cxi*dxr)
-                cxr=axr 
-                cxi=axi
-        elif spa==1:
-            for i in range(n):
-                outbuff[i] = float(np.float32(cxi))
-                axr = (cxr*dxr) - (cxi*dxi)
-                axi = (cxr*dxi) + (cxi*dxr)
-                cxr=axr
-                cxi=axi
-        elif spa==-1:
-            for i in range(n):
-                outbuff[i] = float(np.float32(amp*math.sin(p*self.TWOPI)))
-                p += dp
-        elif spa==-2:
-            for i in range(0, n*2, 2):
-                outbuff[i] = float(np.float32(amp*math.cos(p*self.TWOPI)))
-                outbuff[i+1] = float(np.float32(amp*math.sin(p*self.TWOPI)))
-                p += dp
+    # Every sample is evaluated directly from its own phase, so the spa=1/2
+    # modes no longer accumulate the rounding error of the old per-sample
+    # rotation and are identical to the direct spa=-1/-2 modes.
+    def sincos(self, amp, p, dp, n, spa, fbuf=None):
+        phases = self._phases(p, dp, n)
+        phases -= np.floor(phases)
+        phases *= self.TWOPI
+        return self._sincos(amp, phases, n, spa, fbuf)
+
+    def _sincos(self, amp, phases, n, spa, fbuf):
+        if spa == 2 or spa == -2:
+            # Interleaved I/Q is the float32 view of a complex64 array
+            outbuff = self._output(fbuf, n*2)
+            phases = np.exp(1j*phases)
+            phases *= amp
+            outbuff.view(np.complex64)[:] = phases
+        else:
+            outbuff = self._output(fbuf, n)
+            np.sin(phases, out=phases)
+            phases *= amp
+            outbuff[:] = phases
                 
         return outbuff
     
     # Create a SQUARE array of given amplitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param p    Phase
     # @param dp   Delta Phase
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @return the new data buffer
-    def square(self, amp, p, dp, n, spa):
-        outbuff = range(n*spa)
-        value = 0.0
+    def square(self, amp, p, dp, n, spa, fbuf=None):
         famp = float(amp)
-        famp2 = -famp
+        phases = self._phases(p, dp, n)
+        cycles = np.floor(phases)
+        high = (phases - cycles >= 0.5) & ~self._wraps(cycles)
         
-        for i in range(0, n*spa, spa):
-            value = famp2
-            if p >= 1.0:
-                p -= 1.0
-            elif p >= 0.5:
-                value = famp
-            outbuff[i] = float(np.float32(value))
-            if spa == 2:
-                outbuff[i+1] = float(np.float32(value))
-            p += dp
-            
-        return outbuff
+        return self._atoms(np.where(high, famp, -famp), spa, fbuf)
     
     # Create a TRIANGLE array of given amplitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param p    Phase
     # @param dp   Delta Phase
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @return the new data buffer
-    def triangle(self, amp, p, dp, n, spa):
-        outbuff = range(n*spa)
-        value = 0.0
+    def triangle(self, amp, p, dp, n, spa, fbuf=None):
         famp = float(amp)
         famp2 = 4*famp
-        fp = float(p) - 0.5
-        
-        for i in range(0, n*spa, spa):
-            if fp >= 0.5:
-                fp -= 1.0
-            if fp > 0:
-                value = float(famp - fp*famp2)
-            else:
-                value = float(famp + fp*famp2)
-            outbuff[i] = float(np.float32(value))
-            if spa == 2:
-                outbuff[i+1] = float(np.float32(value))
-            fp += dp
+        fp = self._phases(p, dp, n)
+        fp -= np.floor(fp)
+        fp -= 0.5
         
-        return outbuff
+        return self._atoms(famp - np.abs(fp)*famp2, spa, fbuf)
             
     # Create a SAWTOOTH array of given amplitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param p    Phase
     # @param dp   Delta Phase
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @return the new data buffer
-    def sawtooth(self, amp, p, dp, n, spa):
-        outbuff = range(n*spa)
-        value = 0.0
+    def sawtooth(self, amp, p, dp, n, spa, fbuf=None):
         famp = float(amp)
         famp2 = 2*famp
-        fp = float(p) - 0.5
-        
-        for i in range(0, n*spa, spa):
-            if fp >= 0.5:
-                fp -= 1.0
-            value = float(fp*famp2)
-            outbuff[i] = float(np.float32(value))
-            if spa == 2:
-                outbuff[i+1] = float(np.float32(value))
-            fp += dp
+        fp = self._phases(p, dp, n)
+        fp -= np.floor(fp)
+        fp -= 0.5
             
-        return outbuff
+        return self._atoms(fp*famp2, spa, fbuf)
     
+    # Add the PolyBLEP residual of a downward step of 2 (from 1 to -1) at
+    # phase 0 to out.  Only the samples within one sample of a step are
+    # touched.
+    # @param t     Phase of each sample in [0, 1)
+    # @param dt    Phase advance per sample
+    # @param scale Multiplier for the residual
+    def _blep(self, t, dt, out, scale):
+        after = np.flatnonzero(t < dt)
+        x = t[after]/dt
+        out[after] += scale*(1.0 - x)**2
+        before = np.flatnonzero(t > 1.0 - dt)
+        x = (t[before] - 1.0)/dt
+        out[before] -= scale*(1.0 + x)**2
+
+    # Add the PolyBLAMP residual of a unit change in slope per sample at
+    # phase 0 to out (the integral of the PolyBLEP residual)
+    # @param t     Phase of each sample in [0, 1)
+    # @param dt    Phase advance per sample
+    # @param scale Multiplier for the residual
+    def _blamp(self, t, dt, out, scale):
+        near = np.flatnonzero((t < dt) | (t > 1.0 - dt))
+        x = t[near]
+        x = np.minimum(x, 1.0 - x)/dt
+        out[near] += scale*(1.0 - x)**3/6.0
+
+    # Phase of every sample wrapped into [0, 1), and a second copy half a
+    # cycle on
+    def _halves(self, p, dp, n):
+        t = self._phases(p, dp, n)
+        t -= np.floor(t)
+        h = t + 0.5
+        h -= np.floor(h)
+        return t, h
+
+    # Create a band-limited SQUARE array of given amplitude
+    # @param fbuf Optional output array of n*spa elements to write into
+    # @param amp  Amplitude
+    # @param p    Phase
+    # @param dp   Delta Phase
+    # @param n    Number of elements
+    # @param spa  Scalars per atom, 2 for Complex
+    # @return the new data buffer
+    def squareBL(self, amp, p, dp, n, spa, fbuf=None):
+        famp = float(amp)
+        t, h = self._halves(p, dp, n)
+        values = np.where(t >= 0.5, famp, -famp)
+        # Falling edge at phase 0, rising edge at phase 0.5
+        self._blep(t, dp, values, famp)
+        self._blep(h, dp, values, -famp)
+
+        return self._atoms(values, spa, fbuf)
+
+    # Create a band-limited TRIANGLE array of given amplitude
+    # @param fbuf Optional output array of n*spa elements to write into
+    # @param amp  Amplitude
+    # @param p    Phase
+    # @param dp   Delta Phase
+    # @param n    Number of elements
+    # @param spa  Scalars per atom, 2 for Complex
+    # @return the new data buffer
+    def triangleBL(self, amp, p, dp, n, spa, fbuf=None):
+        famp = float(amp)
+        t, h = self._halves(p, dp, n)
+        values = famp - np.abs(t - 0.5)*(4*famp)
+        # The slope turns from -4*amp to 4*amp per cycle at phase 0 and
+        # back at phase 0.5
+        corner = 8*famp*dp
+        self._blamp(t, dp, values, corner)
+        self._blamp(h, dp, values, -corner)
+
+        return self._atoms(values, spa, fbuf)
+
+    # Create a band-limited SAWTOOTH array of given amplitude
+    # @param fbuf Optional output array of n*spa elements to write into
+    # @param amp  Amplitude
+    # @param p    Phase
+    # @param dp   Delta Phase
+    # @param n    Number of elements
+    # @param spa  Scalars per atom, 2 for Complex
+    # @return the new data buffer
+    def sawtoothBL(self, amp, p, dp, n, spa, fbuf=None):
+        famp = float(amp)
+        t = self._phases(p, dp, n)
+        t -= np.floor(t)
+        values = (t - 0.5)*(2*famp)
+        self._blep(t, dp, values, famp)
+
+        return self._atoms(values, spa, fbuf)
+
     # Create a PULSE array of given amplitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param p    Phase
     # @param dp   Delta Phase
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @return the new data buffer
-    def pulse(self, amp, p, dp, n, spa):
-        outbuff = range(n*spa)
-        value = 0.0
+    def pulse(self, amp, p, dp, n, spa, fbuf=None):
         famp = float(amp)
-        
-        for i in range(0, n*spa, spa):
-            if p >= 1.0:
-                value = famp
-                p -= 1.0
-            else:
-                value = 0
-            outbuff[i] = float(np.float32(value))
-            if spa == 2:
-                outbuff[i+1] = float(np.float32(value))
-            p += dp
+        wrapped = self._wraps(np.floor(self._phases(p, dp, n)))
             
-        return outbuff
+        return self._atoms(np.where(wrapped, famp, 0.0), spa, fbuf)
     
+    _noise_buffer = None
+
+    # Add white noise to a block in place: into the block itself when it
+    # is writeable, else into fbuf along with the block.  The noise comes
+    # from the same generator and state as whitenoise().
+    # @param data The block
+    # @param sdev Noise standard deviation, as for whitenoise()
+    # @param fbuf Output array for a read-only block
+    # @return the noisy block
+    def addNoise(self, data, sdev, fbuf=None):
+        n = len(data)
+        if data.flags.writeable:
+            if self._noise_buffer is None or len(self._noise_buffer) != n:
+                self._noise_buffer = np.empty(n, dtype=np.float32)
+            data += self.whitenoise(sdev, n, 1, self._noise_buffer)
+            return data
+        outbuff = self.whitenoise(sdev, n, 1, self._output(fbuf, n))
+        outbuff += data
+        return outbuff
+
+    # Noise sdev for addNoise() that gives an SNR against a signal
+    # @param power Mean power of the signal per real scalar (for a complex
+    #              signal, the power of I or Q)
+    # @param snr   Signal to noise ratio, dB
+    def noiseForSNR(self, power, snr):
+        # addNoise() adds noise to every scalar, and whitenoise() scales by
+        # NOISE_SCALE
+        return math.sqrt(power/10**(snr/10.0))/self.NOISE_SCALE
+
+    # Mean power per real scalar of each shape of amplitude 1, where it
+    # does not depend on the data
+    SHAPE_POWER = {
+        "sine"       : 0.5,
+        "chirp"      : 0.5,
+        "fm"         : 0.5,
+        "pm"         : 0.5,
+        "square"     : 1.0,
+        "constant"   : 1.0,
+        "triangle"   : 1.0/3,
+        "sawtooth"   : 1.0/3,
+        "lrs"        : 1.0/3,
+        "whitenoise" : NOISE_SCALE**2,
+    }
+
+    # Mean power per real scalar of a shape, for noiseForSNR()
+    # @param shape      Shape name
+    # @param amp        Amplitude
+    # @param dp         Phase advance per sample, for the pulse shape
+    # @param amplitudes Relative tone amplitudes, for the multitone shape
+    #                   (the tones are assumed to be at distinct frequencies)
+    # @return the power, or None for a shape whose power depends on the
+    #         data (file, arbitrary, am, bpsk, qpsk), which has to be measured
+    def shapePower(self, shape, amp, dp=0.0, amplitudes=()):
+        if shape == "pulse":
+            # One sample of amp per period
+            return amp*amp*min(abs(dp), 1.0)
+        if shape == "multitone":
+            return amp*amp*sum(a*a for a in amplitudes)/2
+        power = self.SHAPE_POWER.get(shape)
+        if power is None:
+            return None
+        return amp*amp*power
+
     # Create a CONSTANT array of given amplitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @return the new data buffer
-    def constant(self, amp, n, spa):
-        outbuff = range(n*spa)
-        
-        for i in range(n*spa):
-            outbuff[i] = float(np.float32(amp))
+    def constant(self, amp, n, spa, fbuf=None):
+        outbuff = self._output(fbuf, n*spa)
+        outbuff.fill(amp)
         
         return outbuff
+
+    # Create a CONSTANT short array, the same as converting constant() with
+    # float2short() but without the float array
+    # @param sbuf Optional short output array of n*spa elements to write into
+    # @return the new short data buffer
+    def constantShort(self, amp, n, spa, sbuf=None):
+        if sbuf is None or len(sbuf) != n*spa:
+            sbuf = np.empty(n*spa, dtype=np.int16)
+        sbuf.fill(self.float2short(np.array([amp], dtype=np.float32))[0])
+        return sbuf
+
+    # Prepare a sample table for arbitrary(): scale it and precompute the
+    # slope from each entry to the next (the last wraps to the first)
+    # @param values One period of the waveform; for complex output,
+    #               interleaved I/Q pairs (an odd last value is dropped)
+    # @param amp    Amplitude the table values are scaled by
+    # @param spa    Scalars per atom, 2 for Complex
+    # @return (table, slopes), or None for an empty table
+    def arbitraryTable(self, values, amp, spa):
+        table = np.array(values, dtype=np.float64)
+        if spa == 2:
+            table = table[:len(table)//2*2].reshape(-1, 2)
+        if not len(table):
+            return None
+        table *= amp
+        slopes = np.roll(table, -1, axis=0)
+        slopes -= table
+        return table, slopes
+
+    # Play a sample table as one period of a periodic waveform.  The phase
+    # accumulator picks the table position of every sample, and the value is
+    # interpolated linearly between entries, so the table repeats at any
+    # rate, fractional or not.
+    # @param fbuf  Optional output array of n*spa elements to write into
+    # @param table (table, slopes) from arbitraryTable()
+    # @param acc   Phase accumulator value of the first sample
+    # @param word  Accumulator increment per sample, from phaseIncrement() of
+    #              the table repetition rate
+    # @param n     Number of elements (the table sets the scalars per atom)
+    # @return the new data buffer
+    def arbitrary(self, table, acc, word, n, fbuf=None):
+        table, slopes = table
+        positions = self.ncoCycles(acc, word, n)
+        positions *= len(table)
+        index = positions.astype(np.intp)
+        np.minimum(index, len(table) - 1, out=index)
+        positions -= index
+        if table.ndim == 2:
+            positions = positions[:, np.newaxis]
+        values = slopes[index]
+        values *= positions
+        values += table[index]
+        outbuff = self._output(fbuf, values.size)
+        outbuff.reshape(values.shape)[:] = values
+        return outbuff
+
+    # Tone counts above this are tabulated when the sum has a short enough
+    # period; fewer tones are cheaper to evaluate directly
+    MULTITONE_MATRIX_TONES = 16
+    MULTITONE_MAX_PERIOD = 2**20
+    # Elements of the samples x tones phase matrix evaluated at once
+    MULTITONE_CHUNK = 2**18
+
+    # Prepare a sum of tones for multitone()
+    # @param frequencies Tone frequencies, Hz
+    # @param amplitudes  Tone amplitudes
+    # @param phases      Tone phases at sample 0, radians
+    # @param sample_rate Sample rate, Hz
+    # @param spa         Scalars per atom, 2 for Complex
+    # @return (tuning words, phase offsets, amplitudes, Wavetable or None),
+    #         or None when there are no tones
+    def multitoneTones(self, frequencies, amplitudes, phases, sample_rate, spa):
+        if not len(frequencies):
+            return None
+        words = [self.phaseIncrement(f, sample_rate) for f in frequencies]
+        offsets = [self.phaseCounts(p/self.TWOPI) for p in phases]
+        table = None
+        if len(frequencies) > self.MULTITONE_MATRIX_TONES:
+            table = self._multitone_table(frequencies, amplitudes, phases, sample_rate, spa)
+        return (np.array(words, dtype=np.uint64), np.array(offsets, dtype=np.uint64),
+                np.array(amplitudes, dtype=np.float64), table)
+
+    # One period of the sum, built with an inverse FFT over a grid that
+    # holds every tone on a bin
+    # @return a Wavetable, or None if the period is too long
+    def _multitone_table(self, frequencies, amplitudes, phases, sample_rate, spa):
+        ratios = [Fraction(f)/Fraction(sample_rate) for f in frequencies]
+        period = 1
+        for ratio in ratios:
+            # Least common multiple of the denominators
+            period = Fraction(period, ratio.denominator).numerator*ratio.denominator
+            if period > self.MULTITONE_MAX_PERIOD:
+                return None
+        bins = np.array([int(ratio*period) % period for ratio in ratios])
+        spectrum = np.zeros(period, dtype=np.complex128)
+        np.add.at(spectrum, bins, np.asarray(amplitudes)*np.exp(1j*np.asarray(phases))*period)
+        tones = np.fft.ifft(spectrum)
+        if spa == 2:
+            table = tones.astype(np.complex64).view(np.float32)
+        else:
+            table = tones.imag.astype(np.float32)
+        return Wavetable.Wavetable(table, period, 1, spa)
+
+    # Create a sum of tones.  Each tone has its own 64-bit phase accumulator,
+    # offset + sample*word, so every tone stays phase continuous.  Few tones
+    # are evaluated as a samples x tones phase matrix; many tones with a
+    # common period are read from a table of that period.
+    # @param fbuf  Optional output array of n*spa elements to write into
+    # @param tones The tones from multitoneTones()
+    # @param acc   Index of the first sample in the stream (mod 2^64)
+    # @param n     Number of elements
+    # @param spa   Scalars per atom, 2 for Complex
+    # @return the new data buffer
+    def multitone(self, tones, acc, n, spa, fbuf=None):
+        words, offsets, amps, table = tones
+        if table is not None:
+            return table.read(float(acc % table.period)/table.period, n)
+        starts = np.array([(int(o) + acc*int(w)) % self.PHASE_ONE for o, w in zip(offsets, words)], dtype=np.uint64)
+        if len(self._index_u64) < n:
+            self._index_u64 = np.arange(n, dtype=np.uint64)
+        if spa == 2:
+            outbuff = self._output(fbuf, 2*n)
+            out = outbuff.view(np.complex64)
+        else:
+            outbuff = out = self._output(fbuf, n)
+        rows = max(1, self.MULTITONE_CHUNK//len(words))
+        for first in range(0, n, rows):
+            counts = self._index_u64[first:min(n, first + rows), np.newaxis]*words
+            counts += starts
+            counts >>= np.uint64(11)
+            phases = counts.astype(np.float64)
+            phases *= self.TWOPI*2.0**-53
+            if spa == 2:
+                out[first:first + rows] = np.exp(1j*phases).dot(amps)
+            else:
+                np.sin(phases, out=phases)
+                out[first:first + rows] = phases.dot(amps)
+        return outbuff
+
+    # Shapes multichannel() can generate
+    CHANNEL_SHAPES = ("sine", "square", "triangle", "sawtooth", "pulse", "constant", "whitenoise")
+
+    # Generate a block for each of several channels in one pass.  The sine
+    # channels come from one (channels x n) phase accumulator array and
+    # the constant and whitenoise channels are filled in together; the
+    # other shapes are made row by row with the single channel generators,
+    # so a channel matches the single stream of the same shape.
+    # @param fbuf   Optional (channels, n*spa) output array to write into
+    # @param shapes Shape of each channel, from CHANNEL_SHAPES
+    # @param amps   Amplitude of each channel
+    # @param accs   Phase accumulator value of each channel's first sample
+    # @param words  Accumulator increment per sample of each channel
+    # @param deltas Phase advance per sample of each channel, as the single
+    #               channel generators take it (|frequency|/sample_rate)
+    # @param n      Number of elements per channel
+    # @param spa    Scalars per atom, 2 for Complex
+    # @return the new (channels, n*spa) data buffer
+    def multichannel(self, shapes, amps, accs, words, deltas, n, spa, fbuf=None):
+        count = len(shapes)
+        outbuff = fbuf
+        if outbuff is None or outbuff.shape != (count, n*spa):
+            outbuff = np.empty((count, n*spa), dtype=np.float32)
+        generators = {
+            "square"   : self.square,
+            "triangle" : self.triangle,
+            "sawtooth" : self.sawtooth,
+            "pulse"    : self.pulse,
+        }
+        amps = np.asarray(amps, dtype=np.float64)[:, np.newaxis]
+        for shape in set(shapes):
+            rows = [i for i in range(count) if shapes[i] == shape]
+            amp = amps[rows]
+            if shape == "constant":
+                outbuff[rows] = amp
+            elif shape == "whitenoise":
+                noise = self.whitenoise(1.0, len(rows)*n*spa).reshape(len(rows), n*spa)
+                noise *= amp
+                outbuff[rows] = noise
+            elif shape == "sine":
+                if len(self._index_u64) < n:
+                    self._index_u64 = np.arange(n, dtype=np.uint64)
+                counts = self._index_u64[:n]*np.array([words[i] for i in rows], dtype=np.uint64)[:, np.newaxis]
+                counts += np.array([accs[i] for i in rows], dtype=np.uint64)[:, np.newaxis]
+                cycles = (counts >> np.uint64(11)).astype(np.float64)
+                cycles *= 2.0**-53
+                cycles *= self.TWOPI
+                if spa == 2:
+                    values = np.exp(1j*cycles)
+                    values *= amp
+                    outbuff[rows] = values.astype(np.complex64).view(np.float32)
+                else:
+                    values = np.sin(cycles, out=cycles)
+                    values *= amp
+                    outbuff[rows] = values
+            else:
+                generate = generators[shape]
+                for i in rows:
+                    generate(amps[i, 0], self.blockPhase(shape, self.phaseCycles(accs[i]), deltas[i]),
+                             deltas[i], n, spa, outbuff[i])
+        return outbuff
+
+    # Number of LRS states produced per block by lrs()
+    LRS_BLOCK = 1024
+    _lrs_columns = None
+    _lrs_offsets = None
+
+    # Advance an array of unsigned 32-bit LRS states by one step
+    @staticmethod
+    def _lrs_step(states):
+        bit0 = ~(states ^ (states>>1) ^ (states>>5) ^ (states>>25)) & 0x1
+        return (states<<1) | bit0
+
+    # The LRS step is affine over GF(2): step(s) = L(s) ^ 1.  After j steps
+    # the state is therefore L^j(s) ^ step^j(0), and L^j(s) is the XOR of the
+    # columns of L^j selected by the set bits of s.  Tabulate those columns
+    # and offsets once for j = 0..LRS_BLOCK so a whole block of states can be
+    # produced from its first state with array operations.
+    @classmethod
+    def _lrs_tables(cls):
+        if cls._lrs_columns is None:
+            states = np.left_shift(np.uint32(1), np.arange(33, dtype=np.uint32))
+            states[32] = 0
+            table = np.empty((cls.LRS_BLOCK+1, 33), dtype=np.uint32)
+            for j in range(cls.LRS_BLOCK+1):
+                table[j] = states
+                states = cls._lrs_step(states)
+            offsets = table[:,32].copy()
+            table ^= offsets[:,np.newaxis]
+            cls._lrs_offsets = offsets
+            cls._lrs_columns = table[:,:32].copy()
+        return cls._lrs_columns, cls._lrs_offsets
+
+    # Produce n consecutive unsigned 32-bit LRS states starting at lrs
+    def _lrs_states(self, lrs, n):
+        columns, offsets = self._lrs_tables()
+        bits = np.arange(32, dtype=np.uint32)
+        states = np.empty(n, dtype=np.uint32)
+        state = lrs & 0xffffffff
+        for start in range(0, n, self.LRS_BLOCK):
+            count = min(self.LRS_BLOCK, n - start)
+            mask = (np.uint32(state) >> bits) & 1 == 1
+            block = np.bitwise_xor.reduce(columns[:count+1,mask], axis=1)
+            block ^= offsets[:count+1]
+            states[start:start+count] = block[:count]
+            state = int(block[count])
+        return states
+
+    # Convert an unsigned 32-bit LRS state to the signed seed that lrs()
+    # takes and returns.  Same as the original int_32 correction, which
+    # maps 0x7fffffff to -1.
+    @staticmethod
+    def _lrs_signed(state):
+        if state >= 2**31 - 1:
+            state = (state & 0x7fffffff) - 2**31
+        return state
+
+    # Apply an affine GF(2) map, given as its 32 columns and offset, to a state
+    @staticmethod
+    def _lrs_apply(columns, offset, state):
+        for column in columns:
+            if state & 1:
+                offset ^= column
+            state >>= 1
+        return offset
+
+    # Affine maps for 2^k steps of the LRS, built by repeated squaring
+    _lrs_powers = None
+
+    @classmethod
+    def _lrs_power(cls, k):
+        if cls._lrs_powers is None:
+            columns, offsets = cls._lrs_tables()
+            cls._lrs_powers = [([int(c) for c in columns[1]], int(offsets[1]))]
+        while len(cls._lrs_powers) <= k:
+            columns, offset = cls._lrs_powers[-1]
+            # Two applications of s -> M s ^ c are s -> M M s ^ (M c ^ c)
+            squared = [cls._lrs_apply(columns, 0, c) for c in columns]
+            cls._lrs_powers.append((squared, cls._lrs_apply(columns, offset, offset)))
+        return cls._lrs_powers[k]
+
+    # Seek the LRS forward without generating the samples in between
+    # @param lrs LRS seed
+    # @param n   Number of samples to skip
+    # @return the LRS seed n samples after lrs, in O(log n) steps
+    def lrs_seek(self, lrs, n):
+        state = lrs & 0xffffffff
+        k = 0
+        while n:
+            if n & 1:
+                columns, offset = self._lrs_power(k)
+                state = self._lrs_apply(columns, offset, state)
+            n >>= 1
+            k += 1
+        return self._lrs_signed(state)
             
+    # The LRS as a bit stream: the bit shifted in at each step
+    # @param lrs LRS seed from previous call
+    # @param n   Number of bits
+    # @return uint8 array of n bits, and the LRS seed for the next call
+    def lrsBits(self, lrs, n):
+        states = self._lrs_states(lrs, n+1)
+        return (states[1:] & 1).astype(np.uint8), self._lrs_signed(int(states[n]))
+
     # Create an LRS noise array of given magnitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @param lrs  LRS seed from previous call
-    # @return the new data buffer and the LRS at end of array
-    def lrs(self, amp, n, spa, lrs):
-        outbuff = range(n*spa)
+    # @return the new data buffer and the LRS seed for the next call
+    def lrs(self, amp, n, spa, lrs, fbuf=None):
         factor = (amp/2.0/self.B1G)
-        
-        for i in range(0, n*spa, spa):
-            data = (factor * lrs)
-            outbuff[i] = float(np.float32(data))
-            if spa == 2:
-                outbuff[i+1] = float(np.float32(data))
-                
-            bit0 = (~(lrs ^ (lrs>>1) ^  (lrs>>5) ^ (lrs>>25)))&0x1
-            lrs <<= 1
-            lrs |= bit0
-            # Correct for python not overflowing int_32s
-            lrs &= 0xffffffff
-            if lrs >= 2**31 -1:
-                lrs &= 0x7fffffff
-                lrs -= 2**31
+        states = self._lrs_states(lrs, n+1).astype(np.int64)
+        next_lrs = self._lrs_signed(int(states[n])) if n else lrs
+        states = states[:n]
+        states[states >= 2**31] -= 2**32
+        states[states == 2**31 - 1] = -1
+        if n:
+            states[0] = lrs
                 
-        return outbuff
+        return self._atoms(factor*states, spa, fbuf), next_lrs
     
     # Create an RAMP array of given magnitude
-    # @param fbuf The output array
+    # @param fbuf Optional output array of n*spa elements to write into
     # @param amp  Amplitude
     # @param n    Number of elements
     # @param spa  Scalars per atom, 2 for Complex
     # @param data RAMP seed from previous call
     # @return the new data buffer and the RAMP value at end of array
-    def ramp(self, amp, n, spa, data):
-        outbuff = range(n*spa)
-        for i in range(0, n*spa, spa):
-            outbuff[i] = float(np.float32(data))
-            if spa == 2:
-                outbuff[i+1] = float(np.float32(data))
-            data = data + 1
-            if data >= amp:
-                data = int(-amp)
+    def ramp(self, amp, n, spa, data, fbuf=None):
+        restart = int(-amp)
+        # Samples until the first wrap, then the length of every later cycle
+        first = max(1, int(math.ceil(amp - data)))
+        period = max(1, int(math.ceil(amp - restart)))
+        index = np.arange(n, dtype=np.float64)
+        values = np.where(index < first, data + index,
+                          restart + np.mod(index - first, period))
+        if n < first:
+            data = data + n
+        else:
+            data = restart + (n - first) % period
                 
-        return outbuff, data
+        return self._atoms(values, spa, fbuf), data
+
+    # Limits applied when converting float data to short
+    SHORT_MIN = float(np.iinfo(np.int16).min)
+    SHORT_MAX = float(np.iinfo(np.int16).max)
+    _clip_buffer = None
+
+    # Convert a float array to short, saturating at the short limits and
+    # truncating toward zero like a C cast
+    # @param fbuf The float data to convert
+    # @param sbuf Optional short array of the same length to write into
+    # @return the short data buffer (sbuf when it could be reused)
+    def float2short(self, fbuf, sbuf=None):
+        n = len(fbuf)
+        if sbuf is None or len(sbuf) != n:
+            sbuf = np.empty(n, dtype=np.int16)
+        if self._clip_buffer is None or len(self._clip_buffer) != n:
+            self._clip_buffer = np.empty(n, dtype=np.float32)
+        clipped = self._clip_buffer
+        np.maximum(fbuf, self.SHORT_MIN, out=clipped)
+        np.minimum(clipped, self.SHORT_MAX, out=clipped)
+        np.copyto(sbuf, clipped, casting='unsafe')
+        
+        return sbuf
+
+    _octet_clip_buffer = None
+
+    # Convert float or short data to octet: the value float2short() gives,
+    # saturated at the signed 8 bit limits and offset by 128 (offset
+    # binary), so 0 maps to 128 and -128..127 to 0..255
+    # @param data The float or short data to convert
+    # @param obuf Optional uint8 array of the same length to write into
+    # @return the octet data buffer (obuf when it could be reused)
+    def toOctet(self, data, obuf=None):
+        n = len(data)
+        if obuf is None or len(obuf) != n:
+            obuf = np.empty(n, dtype=np.uint8)
+        clipped = self._octet_clip_buffer
+        if clipped is None or len(clipped) != n or clipped.dtype != data.dtype:
+            clipped = self._octet_clip_buffer = np.empty(n, dtype=data.dtype)
+        np.clip(data, -128, 127, out=clipped)
+        # Truncate into the signed view, then flip the sign bit to add 128
+        np.copyto(obuf.view(np.int8), clipped, casting='unsafe')
+        obuf ^= 0x80
+        return obuf
@@ -0,0 +1,201 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Wavetable caching for the periodic waveforms:
+ - sine
+ - square
+ - triangle
+ - sawtooth
+ - pulse
+
+When frequency/sample_rate reduces to a fraction k/N with a small N, the
+output repeats every N samples.  One period is generated once and packets
+are then served as slices of the cached table.  For short output the
+period is converted once too, and short packets are slices of that.
+
+The samples of such a tone all fall on one grid of N phases, offset from
+the multiples of 1/N by whatever fraction of a step the stream had reached
+when the tone started (after a frequency change, say).  The table is built
+on that grid, so switching onto a tabulated frequency keeps the phase.
+'''
+from collections import OrderedDict
+import math
+from fractions import Fraction
+import numpy as np
+
+# Modular inverse of k mod n (k and n coprime)
+def _inverse(k, n):
+    r0, r1 = n, k % n
+    s0, s1 = 0, 1
+    while r1:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q*r1
+        s0, s1 = s1, s0 - q*s1
+    return s0 % n
+
+# Phases within this fraction of a grid step of the grid are on it
+ALIGNMENT = 1e-6
+
+# The offset of a phase from the multiples of 1/period
+# @return the offset in [0, 1/period), 0 for a phase on the multiples
+def gridShift(phase, period):
+    x = phase*period
+    x -= math.floor(x)
+    if x < ALIGNMENT or x > 1.0 - ALIGNMENT:
+        return 0.0
+    return x/period
+
+class Wavetable:
+    # @param table  One period of the waveform starting at phase 0
+    # @param period Number of samples in the period (N)
+    # @param step   Phase advance per sample, in units of 1/N (k)
+    # @param spa    Scalars per atom, 2 for Complex
+    # @param shift  Phase of the first sample of the table, less than 1/N
+    def __init__(self, table, period, step, spa, shift=0.0):
+        self.period = period
+        self.step = step
+        self.spa = spa
+        self.shift = shift
+        self._inverse = _inverse(step, period)
+        self._period = table
+        self._table = table
+        self._table.flags.writeable = False
+        # The period and tiled table converted to short, made on first use
+        self._short_period = None
+        self._short_table = None
+
+    # Index of the phase on the table's grid of N phases
+    def _index(self, phase):
+        return int(round((phase - self.shift)*self.period))
+
+    # @return True if the phase is on the table's grid, so that the table
+    #         can serve a stream that has reached it
+    def aligned(self, phase):
+        x = (phase - self.shift)*self.period
+        return abs(x - round(x)) < ALIGNMENT
+
+    # Sample offset into the period for the given phase
+    def offset(self, phase):
+        index = self._index(phase) % self.period
+        return (index*self._inverse) % self.period
+
+    # Phase after n samples, snapped to the exact grid point so that the
+    # phase does not drift while the table is in use
+    def advance(self, phase, n):
+        index = self._index(phase) + self.step*n
+        return float(index % self.period) / self.period + self.shift
+
+    # Read n atoms starting at the given phase.  The result is a read-only
+    # view into the (tiled) table.
+    # @param phase Phase in [0, 1), on the table's grid
+    # @param n     Number of elements
+    # @return the data buffer
+    def read(self, phase, n):
+        start = self.offset(phase)*self.spa
+        stop = start + n*self.spa
+        self._table = self._tiled(self._period, self._table, stop)
+        return self._table[start:stop]
+
+    # As read(), converted to short
+    # @param convert Float to short conversion, applied once to the period
+    # @return the short data buffer, a read-only view
+    def readShort(self, phase, n, convert):
+        if self._short_period is None:
+            self._short_period = self._short_table = convert(self._period)
+            self._short_period.flags.writeable = False
+        start = self.offset(phase)*self.spa
+        stop = start + n*self.spa
+        self._short_table = self._tiled(self._short_period, self._short_table, stop)
+        return self._short_table[start:stop]
+
+    # Tile the period far enough to cover a read up to stop, if the table
+    # does not already
+    def _tiled(self, period, table, stop):
+        if stop <= len(table):
+            return table
+        table = np.tile(period, -(-stop // len(period)))
+        table.flags.writeable = False
+        return table
+
+class WavetableCache:
+    # Longest period, in samples, that is worth tabulating
+    MAX_PERIOD = 65536
+    # Number of tables kept before the least recently used one is dropped
+    MAX_TABLES = 4
+
+    def __init__(self, waveform, max_tables=MAX_TABLES, max_period=MAX_PERIOD):
+        self._waveform = waveform
+        self._generators = {
+            "sine"     : waveform.sincos,
+            "square"   : waveform.square,
+            "triangle" : waveform.triangle,
+            "sawtooth" : waveform.sawtooth,
+            "pulse"    : waveform.pulse,
+        }
+        self._band_limited = {
+            "square"   : waveform.squareBL,
+            "triangle" : waveform.triangleBL,
+            "sawtooth" : waveform.sawtoothBL,
+        }
+        self.max_tables = max_tables
+        self.max_period = max_period
+        self._tables = OrderedDict()
+
+    def clear(self):
+        self._tables.clear()
+
+    def __len__(self):
+        return len(self._tables)
+
+    # Find (or build) the table for a configuration
+    # @param band_limited Use the band-limited generator, where the shape
+    #                     has one
+    # @param phase        Phase the stream has reached; the table is built
+    #                     on the grid through it
+    # @return the Wavetable, or None if the output is not periodic within
+    #         max_period samples
+    def lookup(self, shape, magnitude, frequency, sample_rate, spa, band_limited=False, phase=0.0):
+        generate = band_limited and self._band_limited.get(shape) or self._generators.get(shape)
+        if generate is None or not sample_rate:
+            return None
+        dp = Fraction(frequency) / Fraction(sample_rate)
+        if shape != "sine":
+            # The other shapes only run forward and assume dp < 1
+            dp = abs(dp)
+            if dp >= 1:
+                return None
+        if dp == 0 or dp.denominator > self.max_period:
+            return None
+        shift = gridShift(phase, dp.denominator)
+        key = (shape, magnitude, frequency, sample_rate, spa, band_limited, shift)
+        try:
+            table = self._tables.pop(key)
+        except KeyError:
+            table = self._build(generate, magnitude, dp, spa, shift)
+        self._tables[key] = table
+        while len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def _build(self, generate, magnitude, dp, spa, shift):
+        period = dp.denominator
+        step = dp.numerator % period
+        # Starting at phase 1.0 puts the generators in the steady state,
+        # where the first sample of each period follows a phase wrap
+        table = generate(magnitude, 1.0 + shift, float(step)/period, period, spa)
+        return Wavetable(table, period, step, spa, shift)
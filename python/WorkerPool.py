@@ -0,0 +1,103 @@
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+A pool of worker threads that generate blocks ahead of the output.
+
+The numpy operations the generators are built from release the GIL on
+large arrays, so blocks submitted to the pool are generated in parallel.
+Each submit() returns a Job; the caller keeps the jobs in submission order
+and collects them with Job.result(), which hands the blocks off in order
+no matter which worker finished first.
+'''
+import sys
+import threading
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+class Job:
+    def __init__(self, func, args):
+        self._func = func
+        self._args = args
+        self._value = None
+        self._error = None
+        self._done = threading.Event()
+
+    # A job whose result is already known
+    @classmethod
+    def completed(cls, value):
+        job = cls(None, ())
+        job._value = value
+        job._done.set()
+        return job
+
+    def run(self):
+        try:
+            self._value = self._func(*self._args)
+        except Exception:
+            self._error = sys.exc_info()[1]
+        self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    # Wait for the job to finish
+    # @return the value returned by the job; an exception raised by the job
+    #         is raised again here
+    def result(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+class WorkerPool:
+    # @param workers Number of worker threads
+    def __init__(self, workers):
+        self._jobs = queue.Queue()
+        self._threads = []
+        for i in range(max(1, workers)):
+            thread = threading.Thread(target=self._run, name="SigGen worker %d" % i)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def __len__(self):
+        return len(self._threads)
+
+    # Queue func(*args) to run on the next free worker
+    # @return the Job
+    def submit(self, func, *args):
+        job = Job(func, args)
+        self._jobs.put(job)
+        return job
+
+    # Stop the workers once the jobs already submitted have run
+    def shutdown(self, timeout=None):
+        for thread in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            job.run()
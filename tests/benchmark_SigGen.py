@@ -0,0 +1,589 @@
+#!/usr/bin/env python
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Timing benchmarks for the SigGen python implementation.  These run
+standalone (no domain or sandbox needed).
+
+There are two kinds.  The focused benchmarks each compare one optimization
+against what it replaced and print a table.  The sweeps time every
+Waveform generator, the float to short conversion and the end-to-end
+SigGen_i.process() loop, with the output ports replaced by local stubs.
+Each sweep covers xfer_len, shape and samples per atom (spa). It reports
+ns/sample, Msamples/s, the bytes allocated while producing one packet and
+the median and 99th percentile per-packet latency, as text, CSV or JSON.
+
+    python benchmark_SigGen.py
+    python benchmark_SigGen.py --suite convert sri-check
+    python benchmark_SigGen.py --suite process --xfer-len 1000 100000 --format json > results.json
+
+The process sweep and the sri-check benchmark need the REDHAWK python
+packages (ossie, bulkio); they are skipped when those cannot be imported.
+
+Allocation figures come from tracemalloc, which only exists on python 3.4
+or later.  The component itself runs on python 2, where there is no
+equivalent per-call measure, so there they are reported as null (and "-"
+in the text table) and a note is printed.
+'''
+import os, sys, time, math, json, platform, argparse
+from fractions import Fraction
+import numpy as np
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+import Waveform
+import Wavetable
+import WorkerPool
+import Stats
+import Modulation
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# time.perf_counter is not available before python 3.3
+_timer = getattr(time, "perf_counter", time.time)
+
+XFER_LENS = [1000, 10000, 100000, 1000000]
+
+def best_time(func, repeat=3):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+# The per-sample conversion SigGen_i.convert_float_2_short used before it
+# was vectorized
+def scalar_float_2_short(data):
+    shortData = array("h")
+    shortMin = np.iinfo(np.int16).min
+    shortMax = np.iinfo(np.int16).max
+
+    for i in range(len(data)):
+        shortData.append(np.int16(min(shortMax, max(shortMin, np.float32(data[i])))))
+
+    return shortData.tolist()
+
+def benchmark_convert(xfer_lens=XFER_LENS):
+    waveform = Waveform.Waveform()
+    print("float -> short conversion")
+    print("%10s %14s %14s %10s" % ("xfer_len", "scalar (s)", "vector (s)", "speedup"))
+    for xfer_len in xfer_lens:
+        data = waveform.sincos(40000., 0., 0.01, xfer_len, 1)
+        scalar = best_time(lambda: scalar_float_2_short(data), repeat=1)
+        sbuf = waveform.float2short(data)
+        vector = best_time(lambda: waveform.float2short(data, sbuf).tolist())
+        print("%10d %14.6f %14.6f %9.1fx" % (xfer_len, scalar, vector, scalar/vector))
+
+# Generate blocks through a WorkerPool the way SigGen_i does with the workers
+# property set, keeping 2*workers blocks in flight and collecting them in order.
+# block(i) returns the function and arguments of block i.
+def pooled_blocks(block, workers, blocks):
+    pool = WorkerPool.WorkerPool(workers)
+    pending = []
+    try:
+        for i in range(blocks):
+            generate, args = block(i)
+            pending.append(pool.submit(generate, *args))
+            if len(pending) >= 2*workers:
+                pending.pop(0).result()
+        for job in pending:
+            job.result()
+    finally:
+        pool.shutdown()
+
+# White noise needs a numpy Generator (numpy 1.17 or later) to be split
+# into blocks; the legacy generator only runs in order, so without one a
+# multitone, which is computed from the sample count, stands in for it
+def benchmark_workers(worker_counts=(1, 2, 4, 8), blocks=64, xfer_len=262144):
+    waveform = Waveform.Waveform()
+    if hasattr(np.random, "Generator"):
+        waveform.setGenerator("pcg64")
+        name = "whitenoise (pcg64)"
+        block = lambda i: (waveform.splitNoise().whitenoise, (1.0, xfer_len, 1))
+    else:
+        tones = waveform.multitoneTones([1000.*(k+1) for k in range(8)], [0.1]*8, [0.]*8, 1e6, 1)
+        name = "multitone (8 tones, noise cannot be pooled before numpy 1.17)"
+        block = lambda i: (waveform.multitone, (tones, i*xfer_len, xfer_len, 1))
+    print("pooled %s, %d blocks of %d samples" % (name, blocks, xfer_len))
+    print("%10s %14s %14s" % ("workers", "Msamples/s", "scaling"))
+    base = None
+    for workers in worker_counts:
+        elapsed = best_time(lambda: pooled_blocks(block, workers, blocks))
+        rate = blocks*xfer_len/elapsed
+        base = base or rate
+        print("%10d %14.1f %13.2fx" % (workers, rate/1e6, rate/base))
+
+# Per-sample rotator recurrence that the sincos generator was originally
+# built on, kept here as the accuracy baseline
+def rotator_sine(amp, dp, n):
+    outbuff = np.empty(n, dtype=np.float32)
+    dxr = math.cos(dp*2*math.pi)
+    dxi = math.sin(dp*2*math.pi)
+    cxr = amp; cxi = 0.0
+    for i in range(n):
+        outbuff[i] = cxi
+        tmp = cxr*dxr - cxi*dxi
+        cxi = cxr*dxi + cxi*dxr
+        cxr = tmp
+    return outbuff
+
+# Spurious free dynamic range of a real tone, in dBc: the carrier against
+# the largest other component.  The tone must fall exactly on an FFT bin.
+def sfdr(data):
+    spectrum = np.abs(np.fft.rfft(data.astype(np.float64)))
+    peak = np.argmax(spectrum)
+    carrier = spectrum[peak]
+    spectrum[peak] = 0
+    return 20*np.log10(carrier/np.max(spectrum))
+
+# Largest deviation from the exact tone, in dB relative to the amplitude
+def max_error(data, exact):
+    return 20*np.log10(np.max(np.abs(data - exact)))
+
+def benchmark_sfdr(n=2**20, bin=104729):
+    waveform = Waveform.Waveform()
+    dp = float(bin)/n
+    exact = np.sin(2*np.pi*((np.arange(n, dtype=np.int64)*bin) % n)/n)
+    print("sine accuracy, one packet of %d samples, dp=%d/%d" % (n, bin, n))
+    print("%18s %12s %12s %14s" % ("generator", "SFDR (dBc)", "error (dB)", "ns/sample"))
+    start = time.time()
+    data = rotator_sine(1.0, dp, n)
+    elapsed = time.time() - start
+    print("%18s %12.1f %12.1f %14.1f" % ("rotator", sfdr(data), max_error(data, exact), elapsed/n*1e9))
+    data = waveform.sincos(1.0, 0.0, dp, n, 1)
+    elapsed = best_time(lambda: waveform.sincos(1.0, 0.0, dp, n, 1))
+    print("%18s %12.1f %12.1f %14.1f" % ("sincos", sfdr(data), max_error(data, exact), elapsed/n*1e9))
+    word = waveform.phaseIncrement(bin, n)
+    data = waveform.ncoSincos(1.0, 0, word, n, 1)
+    elapsed = best_time(lambda: waveform.ncoSincos(1.0, 0, word, n, 1))
+    print("%18s %12.1f %12.1f %14.1f" % ("ncoSincos", sfdr(data), max_error(data, exact), elapsed/n*1e9))
+
+# Phase error after many packets: the floating point phase update SigGen_i
+# used before against the 64-bit accumulator, both against the exact phase
+def benchmark_phase_drift(packets=10**6, xfer_len=1000, sample_rate=48000.,
+                          frequencies=(1234.567, 1000./3, 9999.9)):
+    waveform = Waveform.Waveform()
+    print("phase error after %d packets of %d samples at %g sps" % (packets, xfer_len, sample_rate))
+    print("%12s %16s %16s" % ("frequency", "float (rad)", "accumulator (rad)"))
+    for frequency in frequencies:
+        dp = frequency * (1.0/sample_rate)
+        word = waveform.phaseIncrement(frequency, sample_rate)
+        phase = 0.0
+        acc = 0
+        for i in range(packets):
+            phase += dp*xfer_len
+            phase -= math.floor(phase)
+            acc = waveform.phaseAdvance(acc, word, xfer_len)
+        exact = Fraction(frequency)/Fraction(sample_rate)*packets*xfer_len
+        exact -= math.floor(exact)
+        errors = []
+        for value in (Fraction(phase), Fraction(acc, waveform.PHASE_ONE)):
+            error = abs(value - exact)
+            errors.append(2*math.pi*float(min(error, 1 - error)))
+        print("%12g %16.3e %16.3e" % (frequency, errors[0], errors[1]))
+
+# Per packet overhead of SigGen_i.process() itself: one-sample constant
+# packets through the stubbed component (see make_component), so that the
+# configuration and SRI checks, the port state checks and the timestamping
+# dominate over generating and pushing.  The SRI is pushed once per stream,
+# so the SRI count should stay at one per connected port.
+def benchmark_sri_check(calls=10**4):
+    try:
+        component = make_component()
+    except ImportError as e:
+        print("skipping sri-check: %s" % e)
+        return
+    component.shape = "constant"
+    component.xfer_len = 1
+    component.prop_update_config(None, None, None)
+    component.process()
+
+    def process():
+        for i in range(calls):
+            component.process()
+
+    print("per packet process() overhead")
+    for stats_enabled in (False, True):
+        component.stats_enabled = stats_enabled
+        component.prop_update_config(None, None, None)
+        name = "stats on" if stats_enabled else "stats off"
+        print("%20s %10.1f ns/call" % (name, best_time(process)/calls*1e9))
+    print("%20s %10d" % ("SRI pushes", component.port_dataFloat_out.sris))
+
+# Cost of the stats counters: the generate/convert/marshal steps of one
+# SigGen_i.process() packet, with and without the counting process() does
+# when stats_enabled is set
+def stats_loop(waveform, counters, packets, xfer_len):
+    word = waveform.phaseIncrement(1000., 48000.)
+    fbuf = np.empty(xfer_len, dtype=np.float32)
+    sbuf = np.empty(xfer_len, dtype=np.int16)
+    acc = 0
+    for i in range(packets):
+        stats = None
+        if counters is not None:
+            counters.countdown -= 1
+            if not counters.countdown:
+                stats = counters
+                stats.timed()
+        data = waveform.ncoSincos(100., acc, word, xfer_len, 1, fbuf)
+        acc = waveform.phaseAdvance(acc, word, xfer_len)
+        if stats:
+            stats.generate_time += stats.lap()
+        data.tolist()
+        if stats:
+            stats.push_float_time += stats.lap()
+        shortData = waveform.float2short(data, sbuf)
+        if stats:
+            stats.convert_time += stats.lap()
+        shortData.tolist()
+        if stats:
+            stats.push_short_time += stats.lap()
+            stats.batch(xfer_len)
+
+# The on/off difference is small enough to drown in timing noise, so the
+# overhead is also estimated from the counting cost of the same loop with
+# no work in it
+def benchmark_stats_overhead(xfer_lens=(100, 1000, 10000), samples=10**7):
+    waveform = Waveform.Waveform()
+    calls = 10**5
+    def empty(counters):
+        for i in range(calls):
+            stats = None
+            if counters is not None:
+                counters.countdown -= 1
+                if not counters.countdown:
+                    stats = counters
+                    stats.timed()
+            if stats:
+                stats.generate_time += stats.lap()
+                stats.push_float_time += stats.lap()
+                stats.convert_time += stats.lap()
+                stats.push_short_time += stats.lap()
+                stats.batch(1)
+    cost = (best_time(lambda: empty(Stats.Counters())) - best_time(lambda: empty(None)))/calls
+    print("stats counter overhead (%.0f ns per packet)" % (cost*1e9))
+    print("%10s %14s %14s %10s %10s" % ("xfer_len", "off (s)", "on (s)", "measured", "estimated"))
+    for xfer_len in xfer_lens:
+        packets = samples//xfer_len
+        off = best_time(lambda: stats_loop(waveform, None, packets, xfer_len), repeat=5)
+        on = best_time(lambda: stats_loop(waveform, Stats.Counters(), packets, xfer_len), repeat=5)
+        print("%10d %14.6f %14.6f %9.2f%% %9.2f%%" % (xfer_len, off, on, 100*(on/off - 1), 100*cost*packets/off))
+
+# Share of the power outside the harmonics of dp (aliases and spurs), in dB
+def alias_level(data, dp):
+    n = len(data)
+    power = np.abs(np.fft.rfft(data.astype(np.float64)*np.blackman(n)))**2
+    frequencies = np.fft.rfftfreq(n)
+    harmonic = np.zeros(len(frequencies), dtype=bool)
+    for k in range(1, int(0.5/dp) + 1):
+        harmonic |= np.abs(frequencies - k*dp) < 8./n
+    return 10*np.log10(power[~harmonic].sum()/power[harmonic].sum())
+
+# Cost and alias suppression of the band-limited square, triangle and
+# sawtooth against the naive generators, at a low and a high frequency
+def benchmark_band_limited(n=2**18, dps=(0.0037, 0.0371, 0.1371)):
+    waveform = Waveform.Waveform()
+    print("band-limited generators, one packet of %d samples" % n)
+    print("%10s %8s %12s %12s %12s %12s" % ("shape", "dp", "naive (ns)", "BL (ns)", "naive (dB)", "BL (dB)"))
+    for shape in ("square", "triangle", "sawtooth"):
+        naive = getattr(waveform, shape)
+        limited = getattr(waveform, shape + "BL")
+        fbuf = np.empty(n, dtype=np.float32)
+        for dp in dps:
+            naive_time = best_time(lambda: naive(1.0, 0.0, dp, n, 1, fbuf))
+            naive_alias = alias_level(naive(1.0, 0.0, dp, n, 1), dp)
+            limited_time = best_time(lambda: limited(1.0, 0.0, dp, n, 1, fbuf))
+            limited_alias = alias_level(limited(1.0, 0.0, dp, n, 1), dp)
+            print("%10s %8g %12.1f %12.1f %12.1f %12.1f" % (shape, dp, naive_time/n*1e9, limited_time/n*1e9,
+                                                            naive_alias, limited_alias))
+
+# Sweeps over xfer_len, shape and spa, with results written as text, CSV or JSON
+
+SWEEPS = ("waveform", "convert", "process")
+SHAPES = ("sine", "square", "triangle", "sawtooth", "pulse", "constant", "whitenoise", "lrs", "arbitrary", "chirp", "multitone",
+          "am", "fm", "pm", "bpsk", "qpsk")
+SWEEP_XFER_LENS = (100, 1000, 10000, 100000)
+SPAS = (1, 2)
+FIELDS = ("suite", "case", "shape", "xfer_len", "spa", "packets", "ns_per_sample",
+          "msamples_per_sec", "alloc_bytes", "p50_us", "p99_us")
+
+FREQUENCY = 1000.
+SAMPLE_RATE = 48000.
+# Table for the arbitrary shape: a Hann windowed tone burst
+AWG_TABLE = (np.hanning(1024)*np.sin(2*np.pi*16*np.arange(1024)/1024.)).tolist()
+# Tones for the multitone shape
+MULTITONE_FREQUENCIES = (np.arange(64)*300. + 150.).tolist()
+
+# Bytes allocated at the peak of one call, above what was allocated before it
+def allocated(func):
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction*len(ordered)))]
+
+# Time func once per packet and summarize
+# @param samples Samples produced by one call
+def measure(func, samples, packets, warmup=3):
+    for i in range(warmup):
+        func()
+    latencies = []
+    for i in range(packets):
+        start = _timer()
+        func()
+        latencies.append(_timer() - start)
+    total = sum(latencies)
+    return {
+        "packets"          : packets,
+        "ns_per_sample"    : total/(packets*samples)*1e9,
+        "msamples_per_sec" : packets*samples/total/1e6,
+        "alloc_bytes"      : allocated(func),
+        "p50_us"           : percentile(latencies, 0.5)*1e6,
+        "p99_us"           : percentile(latencies, 0.99)*1e6,
+    }
+
+# Generator calls as SigGen_i makes them, writing into a reused buffer
+# @return list of (case, shape, function)
+def waveform_cases(waveform, n, spa):
+    fbuf = np.empty(n*abs(spa), dtype=np.float32)
+    dp = FREQUENCY/SAMPLE_RATE
+    word = waveform.phaseIncrement(FREQUENCY, SAMPLE_RATE)
+    awg = waveform.arbitraryTable(AWG_TABLE, 100., spa)
+    sweep = waveform.phaseIncrement(100., SAMPLE_RATE)
+    # A few tones, evaluated directly, and many, read from a table
+    few = waveform.multitoneTones(MULTITONE_FREQUENCIES[:4], [100.]*4, [0.]*4, SAMPLE_RATE, spa)
+    many = waveform.multitoneTones(MULTITONE_FREQUENCIES, [100.]*64, [0.]*64, SAMPLE_RATE, spa)
+    cases = [
+        ("ncoSincos", "sine", lambda: waveform.ncoSincos(100., 0, word, n, spa, fbuf)),
+        ("sincos", "sine", lambda: waveform.sincos(100., 0., dp, n, spa, fbuf)),
+        ("square", "square", lambda: waveform.square(100., 0., dp, n, spa, fbuf)),
+        ("triangle", "triangle", lambda: waveform.triangle(100., 0., dp, n, spa, fbuf)),
+        ("sawtooth", "sawtooth", lambda: waveform.sawtooth(100., 0., dp, n, spa, fbuf)),
+        ("pulse", "pulse", lambda: waveform.pulse(100., 0., dp, n, spa, fbuf)),
+        ("constant", "constant", lambda: waveform.constant(100., n, spa, fbuf)),
+        ("whitenoise", "whitenoise", lambda: waveform.whitenoise(100., n, spa, fbuf)),
+        ("lrs", "lrs", lambda: waveform.lrs(100., n, spa, 1, fbuf)),
+        ("ramp", "ramp", lambda: waveform.ramp(100., n, spa, 0., fbuf)),
+        ("arbitrary", "arbitrary", lambda: waveform.arbitrary(awg, 0, word, n, fbuf)),
+        ("chirp", "chirp", lambda: waveform.chirp(100., 0., SAMPLE_RATE/4, 0.01, 0, sweep, n, spa, fbuf)),
+        ("multitone (4)", "multitone", lambda: waveform.multitone(few, 0, n, spa, fbuf)),
+        ("multitone (64)", "multitone", lambda: waveform.multitone(many, 0, n, spa, fbuf)),
+    ]
+    for shape in Modulation.SHAPES:
+        modulator = Modulation.Modulator(waveform, shape, "lrs", 100., FREQUENCY, 1200., 0.5, 0.35, SAMPLE_RATE)
+        cases.append(("modulator", shape, lambda modulator=modulator: modulator.read(n, spa, fbuf)))
+    cache = Wavetable.WavetableCache(waveform)
+    for shape in ("sine", "square", "triangle", "sawtooth", "pulse"):
+        table = cache.lookup(shape, 100., FREQUENCY, SAMPLE_RATE, spa)
+        if table:
+            cases.append(("wavetable", shape, lambda table=table: table.read(0., n)))
+    return cases
+
+def run_waveform(xfer_len, spa, shapes, packets):
+    waveform = Waveform.Waveform()
+    results = []
+    for case, shape, func in waveform_cases(waveform, xfer_len, spa):
+        if shape in shapes or shape == "ramp":
+            result = measure(func, xfer_len, packets)
+            result.update(case=case, shape=shape)
+            results.append(result)
+    return results
+
+def run_convert(xfer_len, spa, shapes, packets):
+    waveform = Waveform.Waveform()
+    data = waveform.sincos(40000., 0., 0.01, xfer_len, spa)
+    sbuf = waveform.float2short(data)
+    results = []
+    for case, func in (("float2short", lambda: waveform.float2short(data, sbuf)),
+                       ("float2short+tolist", lambda: waveform.float2short(data, sbuf).tolist())):
+        result = measure(func, xfer_len, packets)
+        result.update(case=case, shape=None)
+        results.append(result)
+    return results
+
+# Stand-in for a BulkIO output port: accepts everything, marshals nothing
+class StubPort(object):
+    def __init__(self, state):
+        self._state = state
+        self.packets = 0
+        self.sris = 0
+
+    def pushSRI(self, H):
+        self.sris += 1
+
+    def pushPacket(self, data, T, EOS, streamID):
+        self.packets += 1
+
+    def _get_state(self):
+        return self._state
+
+# An unthrottled SigGen_i with its output ports stubbed: the float and
+# short ports connected, the octet and double ports not
+def make_component():
+    import bulkio
+    from bulkio.bulkioInterfaces import BULKIO
+    import SigGen
+    component = SigGen.SigGen_i("SigGen_perf", {"NAME_BINDING": "SigGen_perf_1"})
+    component.initialize()
+    component.port_dataFloat_out = StubPort(BULKIO.ACTIVE)
+    component.port_dataShort_out = StubPort(BULKIO.ACTIVE)
+    component.port_dataOctet_out = StubPort(BULKIO.IDLE)
+    component.port_dataDouble_out = StubPort(BULKIO.IDLE)
+    component.throttle = False
+    component.awg_table = AWG_TABLE
+    component.prop_update_awg(None, None, None)
+    component.multitone_frequencies = MULTITONE_FREQUENCIES[:4]
+    component.modulation_message = "lrs"
+    component.message_frequency = 1200.
+    component.next_time = bulkio.timestamp.now()
+    return component
+
+def run_process(component, xfer_len, spa, shapes, packets):
+    results = []
+    for shape in shapes:
+        component.shape = shape
+        component.xfer_len = xfer_len
+        component.complex = (spa == 2)
+        component.prop_update_config(None, None, None)
+        result = measure(component.process, xfer_len, packets)
+        result.update(case="process", shape=shape)
+        results.append(result)
+    return results
+
+RUNNERS = {"waveform" : run_waveform, "convert" : run_convert}
+
+def run(suites, xfer_lens, shapes, spas, samples):
+    results = []
+    for suite in suites:
+        runner = RUNNERS.get(suite)
+        if suite == "process":
+            try:
+                component = make_component()
+            except ImportError as e:
+                sys.stderr.write("skipping process suite: %s\n" % e)
+                continue
+            runner = lambda *args: run_process(component, *args)
+        for xfer_len in xfer_lens:
+            # Roughly the same number of samples for every xfer_len, but
+            # always enough packets for a meaningful 99th percentile
+            packets = max(100, samples//xfer_len)
+            for spa in spas:
+                for result in runner(xfer_len, spa, shapes, packets):
+                    result.update(suite=suite, xfer_len=xfer_len, spa=spa)
+                    results.append(result)
+    return results
+
+def environment():
+    return {
+        "python"   : platform.python_version(),
+        "numpy"    : np.__version__,
+        "platform" : platform.platform(),
+        "machine"  : platform.machine(),
+        "time"     : time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+def write_text(results, out):
+    out.write("%-8s %-18s %-10s %8s %3s %10s %10s %12s %10s %10s\n" %
+              ("suite", "case", "shape", "xfer_len", "spa", "ns/sample", "Msps", "alloc (B)", "p50 (us)", "p99 (us)"))
+    for r in results:
+        alloc = "-" if r["alloc_bytes"] is None else str(r["alloc_bytes"])
+        out.write("%-8s %-18s %-10s %8d %3d %10.2f %10.2f %12s %10.1f %10.1f\n" %
+                  (r["suite"], r["case"], r["shape"] or "-", r["xfer_len"], r["spa"], r["ns_per_sample"],
+                   r["msamples_per_sec"], alloc, r["p50_us"], r["p99_us"]))
+
+def write_csv(results, out):
+    out.write(",".join(FIELDS) + "\n")
+    for r in results:
+        out.write(",".join("" if r[f] is None else str(r[f]) for f in FIELDS) + "\n")
+
+def write_json(results, out):
+    json.dump({"environment" : environment(), "results" : results}, out, indent=1, sort_keys=True)
+    out.write("\n")
+
+WRITERS = {"text" : write_text, "csv" : write_csv, "json" : write_json}
+
+# The focused benchmarks, by suite name
+BENCHMARKS = (
+    ("scalar-convert", benchmark_convert),
+    ("workers", benchmark_workers),
+    ("sfdr", benchmark_sfdr),
+    ("phase-drift", benchmark_phase_drift),
+    ("sri-check", benchmark_sri_check),
+    ("stats-overhead", benchmark_stats_overhead),
+    ("band-limited", benchmark_band_limited),
+)
+
+def main(argv=None):
+    names = [name for name, func in BENCHMARKS] + list(SWEEPS)
+    parser = argparse.ArgumentParser(description="SigGen benchmarks")
+    parser.add_argument("--suite", nargs="+", choices=names, default=names)
+    parser.add_argument("--xfer-len", nargs="+", type=int, default=list(SWEEP_XFER_LENS),
+                        help="xfer_len values swept")
+    parser.add_argument("--shape", nargs="+", choices=SHAPES, default=list(SHAPES),
+                        help="shapes swept")
+    parser.add_argument("--spa", nargs="+", type=int, choices=SPAS, default=list(SPAS),
+                        help="samples per atom swept")
+    parser.add_argument("--samples", type=int, default=10**6,
+                        help="approximate number of samples timed per sweep case")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="text",
+                        help="format of the sweep results")
+    parser.add_argument("--output", help="write the sweep results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Keep stdout machine readable when it carries CSV or JSON
+    report = sys.stdout
+    if args.format != "text" and not args.output:
+        report = sys.stderr
+    stdout = sys.stdout
+    sys.stdout = report
+    try:
+        for name, func in BENCHMARKS:
+            if name in args.suite:
+                func()
+                print("")
+        sweeps = [suite for suite in SWEEPS if suite in args.suite]
+        if sweeps and tracemalloc is None:
+            sys.stderr.write("note: allocation figures need tracemalloc (python 3.4 or later); reported as null\n")
+        results = run(sweeps, args.xfer_len, args.shape, args.spa, args.samples)
+    finally:
+        sys.stdout = stdout
+    if not results:
+        return
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        WRITERS[args.format](results, out)
+    finally:
+        if args.output:
+            out.close()
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,8 @@ import os
 from omniORB import any
 import helper_utils as test_utils
 from ossie.properties import props_from_dict
-import time, math
+from ossie.cf import CF
+import time, math, tempfile, json, shutil
 import waveforms
 import numpy as np
 from array import array
@@ -184,6 +185,33 @@ class ComponentTests(ossie.utils.testing.ScaComponentTestCase):
     def test_constant_short(self):
         print "\n... Starting Test Constant with dataShort_out"
         self._test_constant(self.shortSink, np.int16)
+        
+    def test_constant_short_only(self):
+        print "\n... Starting Test Constant with only dataShort_out connected"
+        self.comp.getPort('dataFloat_out').disconnectPort("floatConnectionID")
+        self._test_constant(self.shortSink, np.int16)
+
+    def test_constant_double(self):
+        print "\n... Starting Test Constant with dataDouble_out"
+        sink = self._connect_sink('dataDouble_out', bulkio.InDoublePort("dataDouble_in"))
+        self._test_constant(sink, np.float64)
+
+    def test_constant_octet_only(self):
+        print "\n... Starting Test Constant with only dataOctet_out connected"
+        self.comp.getPort('dataFloat_out').disconnectPort("floatConnectionID")
+        self.comp.getPort('dataShort_out').disconnectPort("shortConnectionID")
+        sink = self._connect_sink('dataOctet_out', bulkio.InOctetPort("dataOctet_in"))
+        self._generate_config()
+        self.config_params["shape"] = "constant"
+        for magnitude, expected in ((100., 228), (-50.5, 78), (1000., 255)):
+            self.config_params["magnitude"] = magnitude
+            self.comp_obj.configure(props_from_dict(self.config_params))
+            time.sleep(1.) # Ensure SigGen is sending out the desired signal before continuing
+            rx_data = self._get_received_data(time.time(), 1., sink)
+            # Offset binary: the short value clipped to 8 bits, plus 128
+            octets = np.array(bytearray("".join(rx_data)))
+            self.assertTrue(len(octets) > 0)
+            self.assertTrue((octets == expected).all())
 
     def test_throttle_float(self):
         print "\n... Starting Throttle Test for dataFloat_out"
@@ -216,7 +244,23 @@ class ComponentTests(ossie.utils.testing.ScaComponentTestCase):
     def test_stream_id_eos_short(self):
         print "\n... Starting Test Stream ID EOS for dataShort_out"
         self._test_stream_id_eos(self.shortSink)
-    
+
+    def test_sri_late_connection(self):
+        print "\n... Starting Test SRI for a sink connected mid-stream"
+        self._generate_config()
+        self.config_params["shape"] = "constant"
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.) # Ensure SigGen is sending out the desired signal before continuing
+
+        # SigGen pushes the SRI once per stream rather than checking the
+        # port on every packet; the port passes it on to a new connection
+        sink = self._connect_sink('dataFloat_out', bulkio.InFloatPort("lateFloat_in"))
+        received_packets = self._get_received_packets(time.time(), 1., sink)
+        self.assertTrue(len(received_packets)>0, "No packets received.")
+        for data, T, EOS, sri in received_packets:
+            self.assertEqual(sri.streamID, self.config_params["stream_id"])
+            self.assertAlmostEqual(sri.xdelta, 1.0/self.config_params["sample_rate"])
+
     def test_double_start_float(self):
         print "\n... Starting Test Double Start for dataFloat_out"
         self._test_double_start(self.floatSink)
@@ -240,6 +284,11 @@ class ComponentTests(ossie.utils.testing.ScaComponentTestCase):
     def test_sine_short(self):
         print "\n... Starting Test sine with dataShort_out"
         self._test_signal_with_phase("sine", self.shortSink, self.waveforms.generate_sine, self._convert_float_2_short)
+        
+    def test_sine_short_only(self):
+        print "\n... Starting Test sine with only dataShort_out connected"
+        self.comp.getPort('dataFloat_out').disconnectPort("floatConnectionID")
+        self._test_signal_with_phase("sine", self.shortSink, self.waveforms.generate_sine, self._convert_float_2_short)
     
     def test_sawtooth_float(self):
         print "\n... Starting Test sawtooth with dataFloat_out"
@@ -289,6 +338,86 @@ class ComponentTests(ossie.utils.testing.ScaComponentTestCase):
         print "\n...Starting Test frequency for dataShort_out"
         self._test_frequency(self.shortSink)
         
+    def test_complex_float(self):
+        print "\n...Starting Test complex for dataFloat_out"
+        self._test_complex(self.floatSink)
+        
+    def test_file_float(self):
+        print "\n...Starting Test file with dataFloat_out"
+        self._test_file(self.floatSink)
+        
+    def test_file_short(self):
+        print "\n...Starting Test file with dataShort_out"
+        self._test_file(self.shortSink)
+        
+    def test_file_eos(self):
+        print "\n...Starting Test file EOS"
+        self._test_file_eos(self.floatSink)
+        
+    def test_file_sample_rate(self):
+        print "\n...Starting Test file sample rate"
+        self._test_file_sample_rate(self.floatSink)
+        
+    def test_file_missing(self):
+        print "\n...Starting Test file shape without a file"
+        self._test_file_missing(self.floatSink)
+        
+    def test_arbitrary_float(self):
+        print "\n...Starting Test arbitrary with dataFloat_out"
+        self._test_arbitrary(self.floatSink)
+        
+    def test_chirp_float(self):
+        print "\n...Starting Test chirp with dataFloat_out"
+        self._test_chirp(self.floatSink)
+        
+    def test_multitone_float(self):
+        print "\n...Starting Test multitone with dataFloat_out"
+        self._test_multitone(self.floatSink)
+        
+    def test_modulation_float(self):
+        print "\n...Starting Test modulation with dataFloat_out"
+        self._test_modulation(self.floatSink)
+        
+    def test_chirp_no_period(self):
+        print "\n...Starting Test chirp shape without a period"
+        self._test_chirp_no_period(self.floatSink)
+        
+    def test_multitone_no_tones(self):
+        print "\n...Starting Test multitone shape without tones"
+        self._test_multitone_no_tones(self.floatSink)
+        
+    def test_modulation_bad_message_frequency(self):
+        print "\n...Starting Test modulation shape with a message_frequency out of range"
+        self._test_modulation_bad_message_frequency(self.floatSink)
+        
+    def test_add_noise_float(self):
+        print "\n...Starting Test add_noise with dataFloat_out"
+        self._test_add_noise(self.floatSink)
+
+    def test_add_noise_square(self):
+        print "\n...Starting Test add_noise with a square wave"
+        self._test_add_noise_power(self.floatSink, "square", (1000., -1000.))
+        
+    def test_add_noise_file(self):
+        print "\n...Starting Test add_noise with a file"
+        self._test_add_noise_power(self.floatSink, "file", (1000.,))
+        
+    def test_channels_float(self):
+        print "\n...Starting Test channels with dataFloat_out"
+        self._test_channels(self.floatSink)
+        
+    def test_stats(self):
+        print "\n...Starting Test stats"
+        self._test_stats()
+        
+    def test_pipeline_float(self):
+        print "\n...Starting Test pipeline with dataFloat_out"
+        self._test_pipeline(self.floatSink)
+        
+    def test_autotune_float(self):
+        print "\n...Starting Test xfer_len autotune with dataFloat_out"
+        self._test_autotune(self.floatSink)
+        
     ####################
     # HELPER FUNCTIONS #
     ####################
@@ -538,7 +667,15 @@ class ComponentTests(ossie.utils.testing.ScaComponentTestCase):
         rx_data = self._get_received_data(start_time, rx_len_sec, sink)
 
         
-        expected_values = convert_function(self.waveforms.generate_lrs(self.config_params["magnitude"], self.config_params["xfer_len"]))
+        # The LRS runs on across packets, so the received data starts at some
+        # packet boundary of the sequence
+        xfer_len = self.config_params["xfer_len"]
+        sequence = convert_function(self.waveforms.generate_lrs(self.config_params["magnitude"], 60*xfer_len))
+        offsets = [i for i in xrange(0, len(sequence), xfer_len)
+                   if all(isclose(exp_val, rx_val, 10**(-1*PRECISION), 10**(-1*NUM_PLACES))
+                          for exp_val, rx_val in zip(sequence[i:i+8], rx_data[:8]))]
+        self.assertTrue(offsets, "received data is not part of the LRS sequence")
+        expected_values = sequence[offsets[0]:offsets[0]+xfer_len]
         n_expected = len(expected_values)
         minlength = min([len(rx_data),len(expected_values)])
         rx_data = rx_data[:minlength]
@@ -598,6 +735,449 @@ class ComponentTests(ossie.utils.testing.ScaComponentTestCase):
             #self.assertAlmostEqual(rx_val, exp_val, 5)
             self.assert_isclose(rx_val, exp_val, PRECISION, NUM_PLACES)
                 
+    def _test_complex(self, sink):
+        if self.impl != "python":
+            self.skipTest("complex output is only supported by the python implementation")
+        self._generate_config()
+        self.config_params["complex"] = True
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_packets = self._get_received_packets(start_time, 1., sink)
+        self.assertTrue(rx_packets)
+        
+        delta_phase = self.config_params["frequency"] / self.config_params["sample_rate"]
+        for data, T, EOS, sri in rx_packets:
+            self.assertEqual(sri.mode, 1)
+            self.assertEqual(len(data), 2*self.config_params["xfer_len"])
+            # Interleaved I/Q of a complex exponential: constant magnitude and
+            # a phase that advances by delta_phase each sample
+            for i in xrange(0, 20, 2):
+                self.assert_isclose(math.hypot(data[i], data[i+1]), self.config_params["magnitude"], PRECISION, NUM_PLACES)
+                expected = complex(data[i], data[i+1])*complex(math.cos(2*math.pi*delta_phase), math.sin(2*math.pi*delta_phase))
+                self.assert_isclose(data[i+2], expected.real, 4, 2)
+                self.assert_isclose(data[i+3], expected.imag, 4, 2)
+
+    def _write_ramp_file(self, length):
+        f = tempfile.NamedTemporaryFile(suffix=".raw")
+        np.arange(length, dtype=np.float32).tofile(f)
+        f.flush()
+        return f
+    
+    def _test_file(self, sink):
+        if self.impl != "python":
+            self.skipTest("the file shape is only supported by the python implementation")
+        ramp = self._write_ramp_file(2500)
+        self._generate_config()
+        self.config_params["shape"] = "file"
+        self.config_params["file_path"] = ramp.name
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        self.assertTrue(len(rx_data) > 2500)
+        
+        # The file plays back in order, wrapping at its end
+        for i in xrange(len(rx_data)-1):
+            self.assertEqual(rx_data[i+1], (rx_data[i] + 1) % 2500)
+        
+    def _test_file_eos(self, sink):
+        if self.impl != "python":
+            self.skipTest("the file shape is only supported by the python implementation")
+        ramp = self._write_ramp_file(2500)
+        self._generate_config()
+        self.config_params["shape"] = "file"
+        self.config_params["file_path"] = ramp.name
+        self.config_params["file_loop"] = False
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        
+        received_packets = self._get_until_eos(10, sink)
+        self.assertTrue(received_packets[-1][2], "No EOS before timeout.")
+        # The whole file, then the stream ends (earlier packets are the
+        # sine the component started with)
+        rx_data = []
+        for data, T, EOS, sri in received_packets:
+            rx_data += data
+        self.assertEqual(rx_data[-2500:], range(2500))
+        
+    def _test_file_sample_rate(self, sink):
+        if self.impl != "python":
+            self.skipTest("the file shape is only supported by the python implementation")
+        # A SigMF recording at half the configured sample_rate
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        np.arange(2500, dtype="<f4").tofile(os.path.join(directory, "ramp.sigmf-data"))
+        with open(os.path.join(directory, "ramp.sigmf-meta"), "w") as f:
+            json.dump({"global":{"core:datatype":"rf32_le", "core:sample_rate":2500.}, "captures":[], "annotations":[]}, f)
+        self._generate_config()
+        self.config_params["shape"] = "file"
+        self.config_params["file_path"] = os.path.join(directory, "ramp.sigmf-meta")
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        received_packets = self._get_received_packets(time.time(), 1., sink)
+        self.assertTrue(received_packets)
+        
+        # The file's rate replaces sample_rate in the SRI and the timestamps
+        for data, T, EOS, sri in received_packets:
+            self.assertAlmostEqual(sri.xdelta, 1/2500.)
+        for (data, T, EOS, sri), (next_data, next_T, next_EOS, next_sri) in zip(received_packets, received_packets[1:]):
+            self.assertAlmostEqual((next_T.twsec - T.twsec) + (next_T.tfsec - T.tfsec), len(data)/2500.)
+        
+    def _test_file_missing(self, sink):
+        if self.impl != "python":
+            self.skipTest("the file shape is only supported by the python implementation")
+        self._generate_config()
+        self.config_params["shape"] = "file"
+        self.config_params["file_path"] = ""
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        
+        # Without a file nothing is generated, but the stream is not ended
+        received_packets = self._get_until_eos(2, sink)
+        self.assertFalse([packet for packet in received_packets if packet[2]], "Unexpected EOS.")
+        
+    def _test_arbitrary(self, sink):
+        if self.impl != "python":
+            self.skipTest("the arbitrary shape is only supported by the python implementation")
+        self._generate_config()
+        table = [0., 0.25, 1., -0.5]
+        self.config_params["shape"] = "arbitrary"
+        self.config_params["awg_table"] = table
+        # One table entry per sample
+        self.config_params["frequency"] = self.config_params["sample_rate"]/len(table)
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        self.assertTrue(rx_data)
+        
+        magnitude = self.config_params["magnitude"]
+        offset = [value*magnitude for value in table].index(rx_data[0])
+        for i, value in enumerate(rx_data):
+            self.assertEqual(value, table[(i + offset) % len(table)]*magnitude)
+        
+    def _test_chirp(self, sink):
+        if self.impl != "python":
+            self.skipTest("the chirp shape is only supported by the python implementation")
+        self._generate_config()
+        self.config_params["shape"] = "chirp"
+        self.config_params["complex"] = True
+        self.config_params["chirp_start"] = 100.
+        self.config_params["chirp_stop"] = 2000.
+        self.config_params["chirp_period"] = 0.5
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        self.assertTrue(len(rx_data) > 4)
+        
+        # The frequency sweeps from chirp_start to chirp_stop and starts over
+        sample_rate = self.config_params["sample_rate"]
+        iq = np.array(rx_data[:len(rx_data)//2*2], dtype=np.float64).view(np.complex128)
+        frequency = np.angle(iq[1:]*np.conj(iq[:-1]))*sample_rate/(2*np.pi)
+        self.assertTrue(np.all(frequency > 99.) and np.all(frequency < 2001.))
+        steps = np.diff(frequency)
+        sweep_rate = (2000. - 100.)/0.5/sample_rate
+        sweeps = len(iq)/(0.5*sample_rate)
+        self.assertTrue(np.sum(np.abs(steps - sweep_rate) > 1e-3) <= sweeps + 1)
+        
+    def _test_multitone(self, sink):
+        if self.impl != "python":
+            self.skipTest("the multitone shape is only supported by the python implementation")
+        self._generate_config()
+        self.config_params["shape"] = "multitone"
+        self.config_params["multitone_frequencies"] = [500., 1250.]
+        self.config_params["multitone_amplitudes"] = [1., 0.5]
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        sample_rate = int(self.config_params["sample_rate"])
+        self.assertTrue(len(rx_data) >= sample_rate)
+        
+        # Both tones land on a bin of a one second FFT; the tones are phase
+        # continuous across packets, so nothing leaks into the other bins
+        spectrum = np.abs(np.fft.rfft(rx_data[:sample_rate]))*2/sample_rate
+        magnitude = self.config_params["magnitude"]
+        self.assertAlmostEqual(spectrum[500], magnitude, delta=magnitude*1e-3)
+        self.assertAlmostEqual(spectrum[1250], magnitude/2, delta=magnitude*1e-3)
+        spectrum[[500, 1250]] = 0
+        self.assertTrue(spectrum.max() < magnitude*1e-3)
+        
+    def _test_modulation(self, sink):
+        if self.impl != "python":
+            self.skipTest("the modulation shapes are only supported by the python implementation")
+        self._generate_config()
+        self.config_params["shape"] = "am"
+        self.config_params["complex"] = True
+        self.config_params["modulation_message"] = "tone"
+        self.config_params["message_frequency"] = 50.
+        self.config_params["modulation_index"] = 0.5
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        self.assertTrue(len(rx_data) > 200)
+        
+        # The envelope follows the message between (1 -+ index)*magnitude
+        magnitude = self.config_params["magnitude"]
+        envelope = np.abs(np.array(rx_data[:len(rx_data)//2*2], dtype=np.float64).view(np.complex128))
+        self.assertAlmostEqual(envelope.max(), 1.5*magnitude, delta=magnitude*1e-3)
+        self.assertAlmostEqual(envelope.min(), 0.5*magnitude, delta=magnitude*1e-3)
+        
+        # BPSK at baseband stays on the real axis
+        self.config_params["shape"] = "bpsk"
+        self.config_params["frequency"] = 0.
+        self.config_params["modulation_message"] = "lrs"
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        iq = np.array(rx_data[:len(rx_data)//2*2], dtype=np.float64).view(np.complex128)
+        self.assertTrue(np.abs(iq.real).max() > magnitude/2)
+        self.assertTrue(np.abs(iq.imag).max() < magnitude*1e-3)
+        
+    # A setting that leaves the shape nothing to generate stops the output,
+    # with a warning, but does not end the stream; fixing the setting
+    # resumes it
+    def _test_nothing_generated(self, sink, settings, fix):
+        self._generate_config()
+        self.config_params.update(settings)
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        # Drop what was generated before the change
+        while sink.getPacket()[0] is not None:
+            pass
+        received_packets = self._get_until_eos(1, sink)
+        self.assertFalse([packet for packet in received_packets if packet[0] or packet[2]], "Unexpected output.")
+        self.comp_obj.configure(props_from_dict(fix))
+        time.sleep(1.)
+        self.assertTrue(self._get_received_data(time.time(), 0.5, sink))
+        
+    def _test_chirp_no_period(self, sink):
+        if self.impl != "python":
+            self.skipTest("the chirp shape is only supported by the python implementation")
+        self._test_nothing_generated(sink, {"shape":"chirp", "chirp_period":0.}, {"chirp_period":0.5})
+        
+    def _test_multitone_no_tones(self, sink):
+        if self.impl != "python":
+            self.skipTest("the multitone shape is only supported by the python implementation")
+        self._test_nothing_generated(sink, {"shape":"multitone", "multitone_frequencies":[]},
+                                     {"multitone_frequencies":[500.]})
+        
+    def _test_modulation_bad_message_frequency(self, sink):
+        if self.impl != "python":
+            self.skipTest("the modulation shapes are only supported by the python implementation")
+        self._generate_config()
+        self._test_nothing_generated(sink, {"shape":"fm", "message_frequency":self.config_params["sample_rate"]},
+                                     {"message_frequency":50.})
+        
+    def _test_add_noise(self, sink):
+        if self.impl != "python":
+            self.skipTest("add_noise is only supported by the python implementation")
+        self._generate_config()
+        self.config_params["shape"] = "sine"
+        self.config_params["add_noise"] = True
+        self.config_params["snr"] = 10.
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        sample_rate = int(self.config_params["sample_rate"])
+        self.assertTrue(len(rx_data) >= sample_rate)
+        
+        # The tone falls on one bin of a one second FFT; everything else is noise
+        data = np.array(rx_data[:sample_rate], dtype=np.float64)
+        tone = 2*np.abs(np.fft.rfft(data)[2000])**2/sample_rate**2
+        noise = np.mean(data**2) - tone
+        self.assertAlmostEqual(10*np.log10(tone/noise), 10., delta=0.5)
+        
+    # The noise is scaled to the power of the shape: known for a square
+    # wave, measured from the data for a file (here a constant)
+    # @param levels The values the clean signal takes, all of one power
+    def _test_add_noise_power(self, sink, shape, levels):
+        if self.impl != "python":
+            self.skipTest("add_noise is only supported by the python implementation")
+        constant = tempfile.NamedTemporaryFile(suffix=".raw")
+        (np.ones(2500, dtype=np.float32)*1000.).tofile(constant)
+        constant.flush()
+        self._generate_config()
+        self.config_params["shape"] = shape
+        self.config_params["file_path"] = constant.name
+        self.config_params["add_noise"] = True
+        self.config_params["snr"] = 10.
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        rx_data = self._get_received_data(time.time(), 1., sink)
+        self.assertTrue(len(rx_data) > 0)
+        
+        # The noise is well below the gaps between the levels, so each
+        # sample belongs to the nearest one
+        data = np.array(rx_data, dtype=np.float64)
+        noise = np.min([np.abs(data - level) for level in levels], axis=0)
+        self.assertAlmostEqual(10*np.log10(levels[0]**2/np.mean(noise**2)), 10., delta=0.5)
+        
+    # Connect a sink to one of the component's output ports
+    def _connect_sink(self, port_name, sink):
+        self.comp.getPort(port_name).connectPort(sink._this(), port_name + "ConnectionID")
+        return sink
+        
+    def _channels_property(self, channels):
+        structs = []
+        for channel in channels:
+            fields = [CF.DataType(id="channels::%s" % name, value=any.to_any(value)) for name, value in channel.items()]
+            structs.append(any.to_any(fields))
+        return CF.DataType(id="channels", value=any.to_any(structs))
+    
+    # Packets received on each stream for a while, and the streams that ended
+    def _get_streams(self, sink, time_len):
+        streams = {}
+        ended = set()
+        stop_time = time.time() + time_len
+        while time.time() < stop_time:
+            data, T, EOS, streamID, sri, sriChanged, inputQueueFlushed = sink.getPacket()
+            if streamID is None:
+                time.sleep(.01)
+                continue
+            streams.setdefault(streamID, []).extend(data)
+            if EOS:
+                ended.add(streamID)
+        return streams, ended
+    
+    def _test_channels(self, sink):
+        if self.impl != "python":
+            self.skipTest("multi-channel mode is only supported by the python implementation")
+        self._generate_config()
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        channels = [{"shape" : "sine", "frequency" : 500., "magnitude" : 10., "stream_id" : "chan_a"},
+                    {"shape" : "constant", "frequency" : 0., "magnitude" : 20., "stream_id" : "chan_b"}]
+        self.comp_obj.configure([self._channels_property(channels)])
+        time.sleep(.5)
+        streams, ended = self._get_streams(sink, 1.)
+        
+        # The single stream ends and each channel gets its own
+        self.assertTrue("unit_test_stream" in ended)
+        self.assertTrue(len(streams["chan_a"]) > 0)
+        self.assertTrue(len(streams["chan_b"]) > 0)
+        self.assertTrue(max(streams["chan_a"]) <= 10. and min(streams["chan_a"]) >= -10.)
+        self.assertEqual(set(streams["chan_b"]), set([20.]))
+        
+        # Without channels the channel streams end
+        self.comp_obj.configure([self._channels_property([])])
+        streams, ended = self._get_streams(sink, 1.)
+        self.assertEqual(ended & set(["chan_a", "chan_b"]), set(["chan_a", "chan_b"]))
+        
+    def _query_stats(self):
+        props = self.comp_obj.query([CF.DataType(id="stats", value=any.to_any(None))])
+        return dict((field["id"], field["value"]) for field in any.from_any(props[0].value))
+    
+    def _test_stats(self):
+        if self.impl != "python":
+            self.skipTest("stats are only supported by the python implementation")
+        self._generate_config()
+        self.config_params["throttle"] = True
+        self.config_params["stats_enabled"] = True
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(2.)
+        stats = self._query_stats()
+        self.assertTrue(stats["stats::packets"] > 0)
+        self.assertEqual(stats["stats::samples"], stats["stats::packets"]*self.config_params["xfer_len"])
+        self.assertEqual(stats["stats::configured_rate"], self.config_params["sample_rate"])
+        self.assertTrue(abs(stats["stats::achieved_rate"] - self.config_params["sample_rate"]) < 0.2*self.config_params["sample_rate"])
+        self.assertTrue(stats["stats::generate_time"] > 0)
+        self.assertTrue(stats["stats::sleep_time"] > 0)
+        # Each port's push is counted on its own; only float and short are
+        # connected
+        self.assertTrue(stats["stats::push_float_time"] > 0)
+        self.assertTrue(stats["stats::push_short_time"] > 0)
+        self.assertEqual(stats["stats::push_octet_time"], 0)
+        self.assertEqual(stats["stats::push_double_time"], 0)
+        
+        # Switched off, the counters stop
+        self.comp_obj.configure(props_from_dict({"stats_enabled":False}))
+        time.sleep(1.)
+        packets = self._query_stats()["stats::packets"]
+        time.sleep(1.)
+        self.assertEqual(self._query_stats()["stats::packets"], packets)
+        
+    def _test_pipeline(self, sink):
+        if self.impl != "python":
+            self.skipTest("pipeline_depth is only supported by the python implementation")
+        self._generate_config()
+        self.config_params["pipeline_depth"] = 4
+        self.config_params["frequency"] = 500.
+        self.config_params["stats_enabled"] = True
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(1.)
+        
+        # The generator thread runs on through a reconfiguration of the SRI,
+        # so the tone stays phase continuous across it
+        self.comp_obj.configure(props_from_dict({"chan_rf" : 100e6}))
+        start_time = time.time()
+        rx_data = self._get_received_data(start_time, 1., sink)
+        sample_rate = int(self.config_params["sample_rate"])
+        self.assertTrue(len(rx_data) >= sample_rate)
+        spectrum = np.abs(np.fft.rfft(rx_data[:sample_rate]))*2/sample_rate
+        magnitude = self.config_params["magnitude"]
+        self.assertAlmostEqual(spectrum[500], magnitude, delta=magnitude*1e-3)
+        spectrum[500] = 0
+        self.assertTrue(spectrum.max() < magnitude*1e-3)
+        
+        stats = self._query_stats()
+        self.assertTrue(stats["stats::pipeline_occupancy"] > 0)
+        
+        # A reconfiguration that restarts the generator thread resumes from
+        # the last packet pushed: a file carries on from there, without
+        # skipping the blocks the thread had ready
+        ramp = self._write_ramp_file(2500)
+        self.comp_obj.configure(props_from_dict({"shape" : "file", "file_path" : ramp.name}))
+        time.sleep(1.)
+        start_time = time.time()
+        time.sleep(.5)
+        self.comp_obj.configure(props_from_dict({"frequency" : 700.}))
+        time.sleep(.5)
+        self.comp_obj.configure(props_from_dict({"chan_rf" : 200e6}))
+        rx_data = self._get_received_data(start_time, 1.5, sink)
+        self.assertTrue(len(rx_data) > 2500)
+        for i in xrange(len(rx_data)-1):
+            self.assertEqual(rx_data[i+1], (rx_data[i] + 1) % 2500)
+        
+    def _query_autotuned_xfer_len(self):
+        props = self.comp_obj.query([CF.DataType(id="autotuned_xfer_len", value=any.to_any(None))])
+        return any.from_any(props[0].value)
+        
+    # Length of the next packet the sink receives
+    def _next_packet_len(self, sink):
+        while True:
+            data, T, EOS, streamID, sri, sriChanged, inputQueueFlushed = sink.getPacket()
+            if data:
+                return len(data)
+            time.sleep(.01)
+            
+    def _test_autotune(self, sink):
+        if self.impl != "python":
+            self.skipTest("xfer_len_autotune is only supported by the python implementation")
+        self._generate_config()
+        # Packets spanning up to 0.1 s: tuning starts at 256 samples and
+        # works down to 128 and 64 while a size does not fit, which takes
+        # at most about a second at 5000 sps
+        self.config_params["xfer_len_autotune"] = "latency"
+        self.config_params["latency_budget"] = 0.1
+        self.comp_obj.configure(props_from_dict(self.config_params))
+        time.sleep(3.)
+        tuned = self._query_autotuned_xfer_len()
+        self.assertTrue(tuned in (64, 128, 256))
+        while sink.getPacket()[0] is not None:
+            pass
+        self.assertEqual(self._next_packet_len(sink), tuned)
+        
+        # Switched off, xfer_len is used again
+        self.comp_obj.configure(props_from_dict({"xfer_len_autotune" : "off"}))
+        time.sleep(.5)
+        self.assertEqual(self._query_autotuned_xfer_len(), 0)
+        while sink.getPacket()[0] is not None:
+            pass
+        self.assertEqual(self._next_packet_len(sink), self.config_params["xfer_len"])
+        
     def _test_frequency(self, sink):
         self._generate_config()
         self.comp_obj.configure(props_from_dict(self.config_params))
@@ -0,0 +1,1169 @@
+#!/usr/bin/env python
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file distributed with this
+# source distribution.
+#
+# This file is part of REDHAWK Basic Components SigGen.
+#
+# REDHAWK Basic Components SigGen is free software: you can redistribute it and/or modify it under the terms of
+# the GNU Lesser General Public License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# REDHAWK Basic Components SigGen is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this
+# program.  If not, see http://www.gnu.org/licenses/.
+#
+'''
+Compares the vectorized generators in python/Waveform.py against the scalar
+per-sample reference implementations in waveforms.py, and covers the other
+pure python helpers of the python implementation.  These tests do not need
+a running REDHAWK domain.
+'''
+import unittest
+import os, sys
+import numpy as np
+import waveforms
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+import Waveform
+import Wavetable
+import BufferRing
+import Throttle
+import WorkerPool
+import Pipeline
+import Autotune
+import Stats
+import FileSource
+import Modulation
+import time, tempfile, shutil, struct, json
+
+N = 5000
+AMP = 1000.
+
+# Phase increments that are exact binary fractions accumulate without
+# rounding in the scalar reference, so the vectorized output must match it
+# bit for bit.
+EXACT_DELTAS = [0.125, 0.03125, 0.375]
+# Other increments are compared with a tolerance
+INEXACT_DELTAS = [0.4, 0.0123, 0.3183]
+PHASES = [0., 0.25, 0.6]
+
+class WaveformTests(unittest.TestCase):
+    def setUp(self):
+        self.waveform = Waveform.Waveform()
+        self.reference = waveforms.Waveforms()
+
+    def assertFloat32Equal(self, actual, expected):
+        np.testing.assert_array_equal(actual, np.array(expected, dtype=np.float32))
+
+    def assertBlock(self, data, length):
+        self.assertTrue(isinstance(data, np.ndarray))
+        self.assertEqual(data.dtype, np.float32)
+        self.assertTrue(data.flags['C_CONTIGUOUS'])
+        self.assertEqual(len(data), length)
+
+    def assertMostlyEqual(self, actual, expected, max_mismatch=0.001):
+        # Samples that land on a transition can flip when the phase is not
+        # exactly representable; only allow a handful of those.
+        expected = np.array(expected, dtype=np.float32)
+        mismatched = np.count_nonzero(actual != expected)
+        self.assertTrue(mismatched <= max_mismatch*len(expected),
+                        "%d of %d samples differ" % (mismatched, len(expected)))
+
+    def test_sincos(self):
+        for spa in (1, 2, -1, -2):
+            for p in PHASES:
+                for dp in EXACT_DELTAS + INEXACT_DELTAS + [-0.1]:
+                    data = self.waveform.sincos(AMP, p, dp, N, spa)
+                    self.assertBlock(data, N*abs(spa))
+                    expected = self.reference.generate_sincos(AMP, N, p, dp, spa)
+                    np.testing.assert_allclose(data, expected, rtol=0, atol=AMP*1e-6)
+
+    def test_periodic_exact(self):
+        shapes = [(self.waveform.square, self.reference.generate_square),
+                  (self.waveform.triangle, self.reference.generate_triangle),
+                  (self.waveform.sawtooth, self.reference.generate_sawtooth),
+                  (self.waveform.pulse, self.reference.generate_pulse)]
+        for generate, reference in shapes:
+            for spa in (1, 2):
+                for p in PHASES:
+                    for dp in EXACT_DELTAS:
+                        data = generate(AMP, p, dp, N, spa)
+                        self.assertBlock(data, N*spa)
+                        self.assertFloat32Equal(data, reference(AMP, N, p, dp, spa))
+
+    def test_periodic_tolerance(self):
+        for p in PHASES:
+            for dp in INEXACT_DELTAS:
+                self.assertMostlyEqual(self.waveform.square(AMP, p, dp, N, 1),
+                                       self.reference.generate_square(AMP, N, p, dp))
+                self.assertMostlyEqual(self.waveform.pulse(AMP, p, dp, N, 1),
+                                       self.reference.generate_pulse(AMP, N, p, dp))
+                np.testing.assert_allclose(self.waveform.triangle(AMP, p, dp, N, 1),
+                                           self.reference.generate_triangle(AMP, N, p, dp),
+                                           rtol=0, atol=AMP*1e-6)
+                # The sawtooth jumps by 2*AMP at each wrap
+                self.assertMostlyEqual(self.waveform.sawtooth(AMP, p, dp, N, 1).round(2),
+                                       np.round(self.reference.generate_sawtooth(AMP, N, p, dp), 2))
+
+    def test_constant(self):
+        for spa in (1, 2):
+            data = self.waveform.constant(AMP/3., N, spa)
+            self.assertBlock(data, N*spa)
+            self.assertFloat32Equal(data, self.reference.generate_constant(AMP/3., N, spa))
+
+    def test_lrs(self):
+        for spa in (1, 2):
+            for seed in (1, 12345, -7, 2**30):
+                data, last = self.waveform.lrs(AMP, N, spa, seed)
+                self.assertBlock(data, N*spa)
+                self.assertFloat32Equal(data, self.reference.generate_lrs(AMP, N, spa, seed))
+
+    def test_lrs_multiple_blocks(self):
+        n = 3*self.waveform.LRS_BLOCK + 17
+        self.assertFloat32Equal(self.waveform.lrs(AMP, n, 1, 1)[0],
+                                self.reference.generate_lrs(AMP, n, 1, 1))
+
+    def test_lrs_continuity(self):
+        expected = self.reference.generate_lrs(AMP, 3*N + 5, 1, 1)
+        lrs = 1
+        data = []
+        for n in (N, 5, 2*N, 0):
+            block, lrs = self.waveform.lrs(AMP, n, 1, lrs)
+            data.extend(block)
+        self.assertFloat32Equal(data, expected)
+
+    def test_lrs_seek(self):
+        expected = self.reference.generate_lrs(AMP, 5000, 1, 12345)
+        for n in (0, 1, 31, 1024, 4321):
+            lrs = self.waveform.lrs_seek(12345, n)
+            self.assertFloat32Equal(self.waveform.lrs(AMP, 100, 1, lrs)[0], expected[n:n+100])
+        # Seeking agrees with generating the samples in between
+        n = 10**6 + 3
+        self.assertEqual(self.waveform.lrs_seek(1, n), self.waveform.lrs(AMP, n, 1, 1)[1])
+        self.assertEqual(self.waveform.lrs_seek(self.waveform.lrs_seek(1, 2**40), 2**40),
+                         self.waveform.lrs_seek(1, 2**41))
+
+    def test_ramp(self):
+        for spa in (1, 2):
+            for amp in (10., 7.5, 100.):
+                for start in (0, 3, -4):
+                    data, last = self.waveform.ramp(amp, N, spa, start)
+                    self.assertBlock(data, N*spa)
+                    expected, expected_last = self.reference.generate_ramp(amp, N, spa, start)
+                    self.assertFloat32Equal(data, expected)
+                    self.assertEqual(last, expected_last)
+
+    def test_phase_continuity(self):
+        # SigGen_i.process advances the phase by dp*xfer_len and wraps it
+        # to [0, 1) between packets; the packets must join seamlessly.
+        dp = 0.4
+        xfer_len = 1000
+        whole = self.waveform.sincos(AMP, 0., dp, 4*xfer_len, 1)
+        phase = 0.
+        for packet in range(4):
+            data = self.waveform.sincos(AMP, phase, dp, xfer_len, 1)
+            np.testing.assert_allclose(data, whole[packet*xfer_len:(packet+1)*xfer_len],
+                                       rtol=0, atol=AMP*1e-6)
+            phase += dp*xfer_len
+            phase -= np.floor(phase)
+
+    def test_float2short(self):
+        data = self.waveform.sincos(40000., 0.1, 0.0123, N, 1)
+        data[:4] = [1e9, -1e9, 2.7, -2.7]
+        expected = [min(32767, max(-32768, int(x))) for x in data]
+
+        sbuf = self.waveform.float2short(data)
+        self.assertEqual(sbuf.dtype, np.int16)
+        np.testing.assert_array_equal(sbuf, expected)
+        self.assertEqual(list(sbuf[:4]), [32767, -32768, 2, -2])
+
+        # A buffer of the right length is reused, and the input is untouched
+        original = data.copy()
+        self.assertTrue(self.waveform.float2short(data, sbuf) is sbuf)
+        np.testing.assert_array_equal(data, original)
+        self.assertFalse(self.waveform.float2short(data[:10], sbuf) is sbuf)
+
+    def test_constant_short(self):
+        for amp in (AMP, -2.7, 1e6):
+            expected = self.waveform.float2short(self.waveform.constant(amp, N, 2))
+            sbuf = np.empty(2*N, dtype=np.int16)
+            data = self.waveform.constantShort(amp, N, 2, sbuf)
+            self.assertTrue(data is sbuf)
+            np.testing.assert_array_equal(data, expected)
+
+    def test_to_octet(self):
+        data = np.array([0, 1.5, -1.5, 127, 128, -128, -129, 1e6, -1e6], dtype=np.float32)
+        expected = np.array([128, 129, 127, 255, 255, 0, 0, 255, 0], dtype=np.uint8)
+        obuf = np.empty(len(data), dtype=np.uint8)
+        octets = self.waveform.toOctet(data, obuf)
+        self.assertTrue(octets is obuf)
+        np.testing.assert_array_equal(octets, expected)
+        # Short data gives the same octets as the float it came from
+        np.testing.assert_array_equal(self.waveform.toOctet(self.waveform.float2short(data)), expected)
+        
+    def test_whitenoise(self):
+        seed = self.waveform.seed
+        for n, spa in ((N, 1), (N, 2), (1, 1), (777, 1), (3*self.waveform.NOISE_BLOCK, 1)):
+            data = self.waveform.whitenoise(AMP, n, spa)
+            self.assertBlock(data, n*spa)
+            expected, seed = self.reference.generate_whitenoise(AMP, n, spa, seed)
+            np.testing.assert_allclose(data, expected, rtol=1e-6, atol=1e-6)
+            # The seed carries over to the next block exactly
+            self.assertEqual(self.waveform.seed, seed)
+
+    def test_whitenoise_set_seed(self):
+        for seed in (1, 2**26 + 5, 2**31 - 1):
+            self.waveform.setSeed(seed)
+            expected, last = self.reference.generate_whitenoise(AMP, 1000, 1, seed)
+            np.testing.assert_allclose(self.waveform.whitenoise(AMP, 1000), expected, rtol=1e-6, atol=1e-6)
+            self.assertEqual(self.waveform.getSeed(), last)
+        # Non-positive seeds are ignored
+        self.waveform.setSeed(0)
+        self.assertEqual(self.waveform.getSeed(), last)
+
+    def test_whitenoise_generators(self):
+        self.assertRaises(ValueError, self.waveform.setGenerator, "mt19937")
+        if not hasattr(np.random, "Generator"):
+            # Before numpy 1.17 only the legacy generator is offered
+            self.assertEqual(list(Waveform.Waveform.NOISE_GENERATORS), ["legacy"])
+            self.assertRaises(ValueError, self.waveform.setGenerator, "pcg64")
+            return
+        self.assertEqual(sorted(Waveform.Waveform.NOISE_GENERATORS), ["legacy", "pcg64", "philox"])
+        legacy = self.waveform.whitenoise(AMP, 100000)
+        for name in ("pcg64", "philox"):
+            self.waveform.setGenerator(name)
+            self.waveform.setSeed(42)
+            state = self.waveform.getSeed()
+            first = self.waveform.whitenoise(AMP, N)
+            self.assertBlock(first, N)
+            self.assertFalse(np.array_equal(first, self.waveform.whitenoise(AMP, N)))
+            # Restoring the saved state repeats the noise
+            self.waveform.setSeed(state)
+            np.testing.assert_array_equal(self.waveform.whitenoise(AMP, N), first)
+            # Same output power as the legacy generator
+            self.assertAlmostEqual(np.std(self.waveform.whitenoise(AMP, 100000))/np.std(legacy), 1., 1)
+        self.waveform.setGenerator("legacy")
+        self.assertRaises(ValueError, self.waveform.setSeed, state)
+
+    def test_nco_sincos(self):
+        for spa in (1, 2):
+            for p, dp in ((0., 0.01), (0.6, 0.3183), (0.25, -0.0123)):
+                acc = self.waveform.phaseCounts(p)
+                word = self.waveform.phaseCounts(dp)
+                data = self.waveform.ncoSincos(AMP, acc, word, N, spa)
+                self.assertBlock(data, N*spa)
+                np.testing.assert_allclose(data, self.waveform.sincos(AMP, p, dp, N, spa), rtol=0, atol=AMP*1e-6)
+
+    def test_nco_continuity(self):
+        word = self.waveform.phaseCounts(0.0123)
+        acc = self.waveform.phaseCounts(0.6)
+        whole = self.waveform.ncoSincos(AMP, acc, word, 3*N, 1)
+        blocks = []
+        for i in range(3):
+            blocks.append(self.waveform.ncoSincos(AMP, acc, word, N, 1))
+            acc = self.waveform.phaseAdvance(acc, word, N)
+        np.testing.assert_array_equal(np.concatenate(blocks), whole)
+        # Advancing in blocks is exact
+        acc = 12345
+        for i in range(1000):
+            acc = self.waveform.phaseAdvance(acc, word, 777)
+        self.assertEqual(acc, self.waveform.phaseAdvance(12345, word, 777000))
+        self.assertTrue(self.waveform.phaseCycles(self.waveform.PHASE_ONE - 1) < 1.)
+
+    def test_arbitrary_table_rate(self):
+        # One table entry per sample plays the table back unchanged
+        values = [0., 1., 3., -2., 5., 0.5, -1., 2.]
+        table = self.waveform.arbitraryTable(values, AMP, 1)
+        word = self.waveform.phaseIncrement(1000., 8000.)
+        data = self.waveform.arbitrary(table, 0, word, 20, None)
+        self.assertBlock(data, 20)
+        np.testing.assert_array_equal(data, np.resize(values, 20)*np.float32(AMP))
+        # Backwards at a negative frequency
+        word = self.waveform.phaseIncrement(-1000., 8000.)
+        data = self.waveform.arbitrary(table, 0, word, 4, None)
+        np.testing.assert_array_equal(data, np.array([0., 2., -1., 0.5])*AMP)
+
+    def test_arbitrary_resampling(self):
+        # A sine period played at a rate unrelated to the table length is a
+        # sine, to within the linear interpolation error
+        period = 256
+        values = np.sin(2*np.pi*np.arange(period)/period)
+        table = self.waveform.arbitraryTable(values, AMP, 1)
+        word = self.waveform.phaseIncrement(1234.5, 48000.)
+        acc = self.waveform.phaseCounts(0.3)
+        data = self.waveform.arbitrary(table, acc, word, N, None)
+        expected = self.waveform.ncoSincos(AMP, acc, word, N, 1)
+        np.testing.assert_allclose(data, expected, rtol=0, atol=AMP*(2*np.pi/period)**2/8 + 1e-3)
+        # Complex tables interpolate I and Q together
+        iq = np.empty(2*period)
+        iq[0::2] = np.cos(2*np.pi*np.arange(period)/period)
+        iq[1::2] = values
+        table = self.waveform.arbitraryTable(iq, AMP, 2)
+        data = self.waveform.arbitrary(table, acc, word, N, None)
+        self.assertBlock(data, 2*N)
+        expected = self.waveform.ncoSincos(AMP, acc, word, N, 2)
+        np.testing.assert_allclose(data, expected, rtol=0, atol=AMP*(2*np.pi/period)**2/8 + 1e-3)
+
+    def test_arbitrary_continuity(self):
+        table = self.waveform.arbitraryTable(np.arange(10.), 1., 1)
+        word = self.waveform.phaseIncrement(777., 5000.)
+        acc = 0
+        whole = self.waveform.arbitrary(table, acc, word, 3*N, None)
+        blocks = []
+        fbuf = np.empty(N, dtype=np.float32)
+        for i in range(3):
+            blocks.append(self.waveform.arbitrary(table, acc, word, N, fbuf).copy())
+            acc = self.waveform.phaseAdvance(acc, word, N)
+        np.testing.assert_array_equal(np.concatenate(blocks), whole)
+        self.assertEqual(self.waveform.arbitraryTable([], 1., 1), None)
+        self.assertEqual(self.waveform.arbitraryTable([1.], 1., 2), None)
+
+    def test_chirp(self):
+        sample_rate = 48000.
+        start, stop, period = 1000., 9000., 0.05
+        word = self.waveform.phaseIncrement(1./period, sample_rate)
+        sweep = int(period*sample_rate)
+        data = self.waveform.chirp(AMP, start, stop, period, 0, word, 2*sweep, 2)
+        self.assertBlock(data, 4*sweep)
+        iq = data.astype(np.float64).view(np.complex128)
+        np.testing.assert_allclose(np.abs(iq), AMP, rtol=1e-6)
+        # The instantaneous frequency rises linearly over each sweep
+        frequency = np.angle(iq[1:]*np.conj(iq[:-1]))*sample_rate/(2*np.pi)
+        t = (np.arange(sweep - 1) + 0.5)/sample_rate
+        np.testing.assert_allclose(frequency[:sweep - 1], start + (stop - start)*t/period, atol=0.05)
+        # and every sweep starts over at phase 0
+        np.testing.assert_allclose(iq[sweep:], iq[:sweep], atol=AMP*1e-5)
+
+    def test_chirp_continuity(self):
+        period = 0.0123
+        word = self.waveform.phaseIncrement(1./period, 10000.)
+        acc = self.waveform.phaseCounts(0.7)
+        whole = self.waveform.chirp(AMP, -500., 2500., period, acc, word, 3*N, 1)
+        blocks = []
+        for i in range(3):
+            blocks.append(self.waveform.chirp(AMP, -500., 2500., period, acc, word, N, 1))
+            acc = self.waveform.phaseAdvance(acc, word, N)
+        np.testing.assert_array_equal(np.concatenate(blocks), whole)
+        # With no sweep it is a tone
+        word = self.waveform.phaseIncrement(1./period, 5000.)
+        np.testing.assert_allclose(self.waveform.chirp(AMP, 1000., 1000., period, 0, word, 61, 1),
+                                   self.waveform.sincos(AMP, 0., 0.2, 61, 1), rtol=0, atol=AMP*1e-5)
+
+    def test_multitone(self):
+        sample_rate = 48000.
+        frequencies, amplitudes, phases = [1000., -2500., 7000.], [AMP, AMP/2, AMP/4], [0., 1., 2.]
+        for spa in (1, 2):
+            tones = self.waveform.multitoneTones(frequencies, amplitudes, phases, sample_rate, spa)
+            data = self.waveform.multitone(tones, 0, N, spa)
+            self.assertBlock(data, N*spa)
+            expected = np.zeros(N*spa)
+            for f, a, p in zip(frequencies, amplitudes, phases):
+                word = self.waveform.phaseIncrement(f, sample_rate)
+                expected += self.waveform.ncoSincos(a, self.waveform.phaseCounts(p/(2*np.pi)), word, N, spa)
+            np.testing.assert_allclose(data, expected, rtol=0, atol=AMP*1e-5)
+        self.assertTrue(self.waveform.multitoneTones([], [], [], sample_rate, 1) is None)
+
+    def test_multitone_table(self):
+        # Enough tones on a common grid to be tabulated, which must match
+        # the sum evaluated tone by tone
+        frequencies = np.arange(40)*300. + 100.
+        amplitudes = np.linspace(AMP, AMP/10, 40)
+        phases = np.arange(40)*0.3
+        for spa in (1, 2):
+            tones = self.waveform.multitoneTones(frequencies, amplitudes, phases, 48000., spa)
+            self.assertTrue(tones[3] is not None)
+            direct = tones[:3] + (None,)
+            np.testing.assert_allclose(self.waveform.multitone(tones, 12345, N, spa),
+                                       self.waveform.multitone(direct, 12345, N, spa), rtol=0, atol=AMP*1e-4)
+        # Without a short common period the tones are evaluated directly
+        tones = self.waveform.multitoneTones(frequencies + np.pi, amplitudes, phases, 48000., 1)
+        self.assertTrue(tones[3] is None)
+
+    def test_multitone_continuity(self):
+        tones = self.waveform.multitoneTones([123.4, 5678.9], [AMP, AMP], [0.5, 0.], 10000., 2)
+        acc = 2**64 - N
+        whole = self.waveform.multitone(tones, acc, 3*N, 2)
+        blocks = []
+        for i in range(3):
+            blocks.append(self.waveform.multitone(tones, acc, N, 2))
+            acc = self.waveform.phaseAdvance(acc, 1, N)
+        np.testing.assert_array_equal(np.concatenate(blocks), whole)
+
+    # Share of the power outside the harmonics of dp, in dB
+    def _alias_db(self, data, dp):
+        n = len(data)
+        power = np.abs(np.fft.rfft(data*np.blackman(n)))**2
+        frequencies = np.fft.rfftfreq(n)
+        harmonic = np.zeros(len(frequencies), dtype=bool)
+        for k in range(1, int(0.5/dp) + 1):
+            harmonic |= np.abs(frequencies - k*dp) < 8./n
+        return 10*np.log10(power[~harmonic].sum()/power[harmonic].sum())
+
+    def test_band_limited(self):
+        dp = 0.0371
+        for shape, gain in (("square", 10), ("triangle", 10), ("sawtooth", 10)):
+            naive = getattr(self.waveform, shape)(AMP, 0., dp, 4*N, 1)
+            limited = getattr(self.waveform, shape + "BL")(AMP, 0., dp, 4*N, 1)
+            self.assertBlock(limited, 4*N)
+            self.assertTrue(self._alias_db(limited, dp) < self._alias_db(naive, dp) - gain, shape)
+            # Away from the discontinuities the shapes are unchanged
+            np.testing.assert_allclose(np.median(limited - naive), 0., atol=AMP*1e-6)
+            # and blocks join up
+            blocks = [getattr(self.waveform, shape + "BL")(AMP, i*N*dp, dp, N, 2) for i in range(4)]
+            np.testing.assert_allclose(np.concatenate(blocks)[0::2], limited, rtol=0, atol=AMP*1e-4)
+
+    def test_add_noise(self):
+        for spa in (1, 2):
+            for snr in (0., 10., 30.):
+                tone = self.waveform.ncoSincos(AMP, 0, self.waveform.phaseIncrement(0.1, 1.), 20*N, spa)
+                clean = tone.copy()
+                sdev = self.waveform.noiseForSNR(self.waveform.shapePower("sine", AMP), snr)
+                noisy = self.waveform.addNoise(tone, sdev)
+                # Added in place
+                self.assertTrue(noisy is tone)
+                noise = noisy.astype(np.float64) - clean
+                measured = 10*np.log10(np.mean(clean.astype(np.float64)**2)/np.mean(noise**2))
+                self.assertAlmostEqual(measured, snr, delta=0.2)
+
+    def test_shape_power(self):
+        # The power noiseForSNR() is given matches the generated shapes
+        dp = 0.01
+        for spa in (1, 2):
+            blocks = {
+                "sine"       : self.waveform.ncoSincos(AMP, 0, self.waveform.phaseIncrement(dp, 1.), 100*N, spa),
+                "constant"   : self.waveform.constant(AMP, 100*N, spa),
+                "whitenoise" : self.waveform.whitenoise(AMP, 100*N, spa),
+                "lrs"        : self.waveform.lrs(AMP, 100*N, spa, 1)[0],
+            }
+            for shape in ("square", "triangle", "sawtooth", "pulse"):
+                blocks[shape] = getattr(self.waveform, shape)(AMP, 0., dp, 100*N, spa)
+            for shape, data in blocks.items():
+                measured = np.mean(data.astype(np.float64)**2)
+                self.assertAlmostEqual(measured/self.waveform.shapePower(shape, AMP, dp), 1., delta=0.05, msg=shape)
+        self.assertEqual(self.waveform.shapePower("multitone", 2., amplitudes=(1., 0.5)), 2.5)
+        for shape in ("file", "arbitrary", "am", "bpsk", "qpsk"):
+            self.assertEqual(self.waveform.shapePower(shape, AMP), None)
+
+    def test_add_noise_read_only(self):
+        # A read-only block (a wavetable view) is left alone and the sum
+        # written to fbuf, with the same noise as the whitenoise shape
+        table = Wavetable.WavetableCache(self.waveform).lookup("sine", AMP, 1000., 8000., 1)
+        data = table.read(0., N)
+        fbuf = np.empty(N, dtype=np.float32)
+        reference = Waveform.Waveform()
+        expected = data + reference.whitenoise(10., N)
+        noisy = self.waveform.addNoise(data, 10., fbuf)
+        self.assertTrue(noisy is fbuf)
+        np.testing.assert_allclose(noisy, expected, rtol=0, atol=AMP*1e-6)
+        # and the noise state carries on from block to block
+        np.testing.assert_array_equal(self.waveform.whitenoise(10., N), reference.whitenoise(10., N))
+
+    def test_multichannel(self):
+        # Each row matches the single channel generator for its shape.
+        # Binary fraction phases and steps keep the float phase of the
+        # single channel shapes exact.
+        shapes = ("sine", "square", "triangle", "sawtooth", "pulse", "constant", "sine")
+        amps = (AMP, 2., 3., 4., 5., 6., 7.)
+        phases = (0.25, 0.5, 0.125, 0.75, 0.5, 0.0, 0.375)
+        steps = (1/64., 1/32., 1/128., 1/16., 1/8., 0.0, -1/256.)
+        accs = [int(p*2**64) % 2**64 for p in phases]
+        words = [int(dp*2**64) % 2**64 for dp in steps]
+        for spa in (1, 2):
+            data = self.waveform.multichannel(shapes, amps, accs, words, steps, N, spa)
+            self.assertEqual(data.shape, (len(shapes), N*spa))
+            for i, shape in enumerate(shapes):
+                if shape == "sine":
+                    expected = self.waveform.ncoSincos(amps[i], accs[i], words[i], N, spa)
+                elif shape == "constant":
+                    expected = self.waveform.constant(amps[i], N, spa)
+                else:
+                    expected = getattr(self.waveform, shape)(amps[i], phases[i], steps[i], N, spa)
+                np.testing.assert_allclose(data[i], expected, rtol=0, atol=amps[i]*1e-5)
+        # and the output buffer is reused
+        fbuf = np.empty((len(shapes), N), dtype=np.float32)
+        self.assertTrue(self.waveform.multichannel(shapes, amps, accs, words, steps, N, 1, fbuf) is fbuf)
+
+    def test_multichannel_single_stream(self):
+        # A channel is the single stream of its shape, block after block,
+        # including on a phase wrap at the first sample and at steps that
+        # are not binary fractions
+        sample_rate = 5000.
+        for shape in ("square", "triangle", "sawtooth", "pulse"):
+            for frequency in (500., 1234.567):
+                word = self.waveform.phaseIncrement(frequency, sample_rate)
+                dp = frequency*(1.0/sample_rate)
+                acc = 0
+                for block in range(4):
+                    data = self.waveform.multichannel((shape, "sine"), (AMP, AMP), (acc, acc), (word, word),
+                                                      (dp, dp), N, 1)
+                    p = self.waveform.blockPhase(shape, self.waveform.phaseCycles(acc), dp)
+                    expected = getattr(self.waveform, shape)(AMP, p, dp, N, 1)
+                    np.testing.assert_array_equal(data[0], expected, shape)
+                    acc = self.waveform.phaseAdvance(acc, word, N)
+
+    def test_split_noise(self):
+        self.assertTrue(self.waveform.splitNoise() is None)
+        if not hasattr(np.random, "Generator"):
+            self.skipTest("numpy.random.Generator is not available")
+        self.waveform.setGenerator("pcg64")
+        serial = Waveform.Waveform()
+        serial.setGenerator("pcg64")
+        first = self.waveform.splitNoise()
+        second = self.waveform.splitNoise()
+        # The first split continues the stream; the next is a different one
+        np.testing.assert_array_equal(first.whitenoise(AMP, N), serial.whitenoise(AMP, N))
+        self.assertFalse(np.array_equal(second.whitenoise(AMP, N), serial.whitenoise(AMP, N)))
+
+    def test_output_buffer(self):
+        generators = [
+            lambda fbuf: self.waveform.sincos(AMP, 0.1, 0.01, N, 1, fbuf),
+            lambda fbuf: self.waveform.square(AMP, 0.1, 0.01, N, 1, fbuf),
+            lambda fbuf: self.waveform.triangle(AMP, 0.1, 0.01, N, 1, fbuf),
+            lambda fbuf: self.waveform.sawtooth(AMP, 0.1, 0.01, N, 1, fbuf),
+            lambda fbuf: self.waveform.pulse(AMP, 0.1, 0.01, N, 1, fbuf),
+            lambda fbuf: self.waveform.constant(AMP, N, 1, fbuf),
+            lambda fbuf: self.waveform.lrs(AMP, N, 1, 1, fbuf)[0],
+            lambda fbuf: self.waveform.ramp(AMP, N, 1, 0, fbuf)[0],
+        ]
+        fbuf = np.empty(N, dtype=np.float32)
+        for generate in generators:
+            data = generate(fbuf)
+            self.assertTrue(data is fbuf)
+            self.assertFloat32Equal(data, generate(None))
+        # The seed carries over, so compare against a fresh generator
+        self.assertTrue(self.waveform.whitenoise(AMP, N, 1, fbuf) is fbuf)
+        self.assertFloat32Equal(fbuf, Waveform.Waveform().whitenoise(AMP, N, 1))
+        # A buffer of the wrong size is not used
+        self.assertFalse(self.waveform.sincos(AMP, 0., 0.01, N, 2, fbuf) is fbuf)
+
+    def test_empty(self):
+        self.assertEqual(len(self.waveform.sincos(AMP, 0., 0.1, 0, 1)), 0)
+        self.assertEqual(len(self.waveform.square(AMP, 0., 0.1, 0, 1)), 0)
+        self.assertEqual(len(self.waveform.lrs(AMP, 0, 1, 1)[0]), 0)
+        self.assertEqual(len(self.waveform.whitenoise(AMP, 0)), 0)
+
+class WavetableTests(unittest.TestCase):
+    def setUp(self):
+        self.waveform = Waveform.Waveform()
+        self.cache = Wavetable.WavetableCache(self.waveform)
+
+    def _packets(self, table, xfer_len, count):
+        # Read consecutive packets the way SigGen_i.process does
+        phase = 0.
+        packets = []
+        for i in range(count):
+            packets.append(table.read(phase, xfer_len))
+            phase = table.advance(phase, xfer_len)
+        return np.concatenate(packets)
+
+    def test_period(self):
+        table = self.cache.lookup("sine", AMP, 2000., 5000., 1)
+        self.assertEqual(table.period, 5)
+        self.assertEqual(table.step, 2)
+        table = self.cache.lookup("square", AMP, -1000., 44100., 1)
+        self.assertEqual(table.period, 441)
+        self.assertEqual(table.step, 10)
+
+    def test_read_short(self):
+        # Short reads are the float reads converted, from any phase and
+        # past the end of the tiled table
+        for shape, spa in (("sine", 2), ("square", 1)):
+            table = self.cache.lookup(shape, 40000., 1000., 44100., spa)
+            phase = 0.
+            for n in (100, 441, 3000):
+                data = table.readShort(phase, n, self.waveform.float2short)
+                self.assertEqual(data.dtype, np.int16)
+                np.testing.assert_array_equal(data, self.waveform.float2short(table.read(phase, n)))
+                self.assertFalse(data.flags.writeable)
+                phase = table.advance(phase, n)
+
+    def test_frequency_change(self):
+        # A tone switched onto a tabulated frequency carries on from the
+        # phase the previous tone reached, which is off the 1/N grid
+        waveform = self.waveform
+        acc = waveform.phaseAdvance(0, waveform.phaseIncrement(1234.567, 5000.), 1000)
+        word = waveform.phaseIncrement(1250., 5000.)
+        end = waveform.phaseCycles(waveform.phaseAdvance(acc, word, 1000))
+        for shape in ("sine", "square"):
+            phase = waveform.phaseCycles(acc)
+            table = self.cache.lookup(shape, AMP, 1250., 5000., 1, phase=phase)
+            self.assertTrue(table.shift > 0)
+            self.assertTrue(table.aligned(phase))
+            self.assertFalse(self.cache.lookup(shape, AMP, 1250., 5000., 1).aligned(phase))
+            packets = []
+            for i in range(4):
+                packets.append(table.read(phase, 250))
+                phase = table.advance(phase, 250)
+            data = np.concatenate(packets)
+            if shape == "sine":
+                np.testing.assert_allclose(data, waveform.ncoSincos(AMP, acc, word, 1000, 1), rtol=0, atol=AMP*1e-5)
+            else:
+                # The table is in the steady state, where the first sample
+                # follows a phase wrap
+                expected = waveform.square(AMP, waveform.phaseCycles(acc), 0.25, 1000, 1)
+                np.testing.assert_array_equal(data[1:], expected[1:])
+            self.assertAlmostEqual(phase, end, places=9)
+
+    def test_not_periodic(self):
+        self.assertEqual(self.cache.lookup("sine", AMP, 1000.123456, 5000., 1), None)
+        self.assertEqual(self.cache.lookup("sine", AMP, 0., 5000., 1), None)
+        self.assertEqual(self.cache.lookup("square", AMP, 6000., 5000., 1), None)
+        self.assertEqual(self.cache.lookup("constant", AMP, 1000., 5000., 1), None)
+
+    def test_matches_generators(self):
+        for frequency, sample_rate in ((2000., 5000.), (1000., 44100.), (-300., 8000.)):
+            dp = frequency/sample_rate
+            table = self.cache.lookup("sine", AMP, frequency, sample_rate, 1)
+            np.testing.assert_allclose(self._packets(table, 333, 6),
+                                       self.waveform.sincos(AMP, 0., dp, 1998, 1),
+                                       rtol=0, atol=AMP*1e-6)
+            dp = abs(dp)
+            for shape in ("square", "triangle", "sawtooth", "pulse"):
+                table = self.cache.lookup(shape, AMP, frequency, sample_rate, 1)
+                # The table is in the steady state, where the first sample
+                # follows a phase wrap
+                p = self.waveform.blockPhase(shape, 0., dp)
+                expected = getattr(self.waveform, shape)(AMP, p, dp, 2000, 1)
+                self.assertMostlyEqual(self._packets(table, 250, 8), expected)
+
+    def test_boundary_pulse(self):
+        # Packets of 12 samples at 8 samples per cycle put every other
+        # wrap on a packet boundary.  The table and the generators, started
+        # each packet the way SigGen_i does, both put a pulse (and a square
+        # edge) there.
+        waveform = self.waveform
+        word = waveform.phaseIncrement(1000., 8000.)
+        dp = 0.125
+        for shape in ("square", "pulse"):
+            table = self.cache.lookup(shape, AMP, 1000., 8000., 1)
+            acc = 0
+            packets = []
+            for i in range(8):
+                p = waveform.blockPhase(shape, waveform.phaseCycles(acc), dp)
+                packets.append(getattr(waveform, shape)(AMP, p, dp, 12, 1))
+                acc = waveform.phaseAdvance(acc, word, 12)
+            data = np.concatenate(packets)
+            np.testing.assert_array_equal(data, self._packets(table, 12, 8), shape)
+            np.testing.assert_array_equal(data, getattr(waveform, shape)(AMP, 1., dp, 96, 1), shape)
+        # One pulse every 8 samples, from the first
+        self.assertEqual(list(np.flatnonzero(data)), list(range(0, 96, 8)))
+
+    def test_band_limited(self):
+        for shape in ("square", "triangle", "sawtooth"):
+            table = self.cache.lookup(shape, AMP, 1000., 44100., 1, band_limited=True)
+            expected = getattr(self.waveform, shape + "BL")(AMP, 0., 1000./44100., 2000, 1)
+            np.testing.assert_allclose(self._packets(table, 250, 8), expected, rtol=0, atol=AMP*1e-4)
+            self.assertFalse(table is self.cache.lookup(shape, AMP, 1000., 44100., 1))
+
+    def assertMostlyEqual(self, actual, expected):
+        mismatched = np.count_nonzero(np.round(actual, 2) != np.round(expected, 2))
+        self.assertTrue(mismatched <= 0.002*len(expected),
+                        "%d of %d samples differ" % (mismatched, len(expected)))
+
+    def test_complex(self):
+        table = self.cache.lookup("sine", AMP, 1000., 8000., 2)
+        data = table.read(0.25, 100)
+        self.assertEqual(len(data), 200)
+        np.testing.assert_allclose(data, self.waveform.sincos(AMP, 0.25, 0.125, 100, 2),
+                                   rtol=0, atol=AMP*1e-6)
+
+    def test_read_only_views(self):
+        table = self.cache.lookup("sawtooth", AMP, 1000., 8000., 1)
+        data = table.read(0., 1000)
+        self.assertEqual(data.dtype, np.float32)
+        self.assertFalse(data.flags.writeable)
+        self.assertTrue(table.read(0.5, 10).base is not None)
+
+    def test_lru(self):
+        for frequency in range(1, self.cache.max_tables+2):
+            self.cache.lookup("sine", AMP, float(frequency), 8000., 1)
+        self.assertEqual(len(self.cache), self.cache.max_tables)
+        first = self.cache.lookup("sine", AMP, 2., 8000., 1)
+        self.assertTrue(self.cache.lookup("sine", AMP, 2., 8000., 1) is first)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+class BufferRingTests(unittest.TestCase):
+    def test_rotation(self):
+        ring = BufferRing.BufferRing(100, 3, np.int16)
+        buffers = [ring.next() for i in range(3)]
+        self.assertEqual(len(set(id(buf) for buf in buffers)), 3)
+        self.assertTrue(ring.next() is buffers[0])
+        self.assertTrue(ring.next() is buffers[1])
+        self.assertEqual(buffers[0].dtype, np.int16)
+        self.assertEqual(len(buffers[0]), 100)
+
+    def test_slots(self):
+        self.assertEqual(BufferRing.BufferRing.slots(1000, 100), 100)
+        self.assertEqual(BufferRing.BufferRing.slots(1000, 100, max_elements=10000), 10)
+        self.assertEqual(BufferRing.BufferRing.slots(10**7, 100), 2)
+
+class WorkerPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool.WorkerPool(3)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_ordered_results(self):
+        def block(index, delay):
+            time.sleep(delay)
+            return index
+        # Later jobs finish first, but results are collected in order
+        jobs = [self.pool.submit(block, i, 0.02*(6 - i)) for i in range(6)]
+        self.assertEqual([job.result() for job in jobs], list(range(6)))
+        self.assertEqual(len(self.pool), 3)
+
+    def test_error(self):
+        job = self.pool.submit(lambda: 1/0)
+        self.assertRaises(ZeroDivisionError, job.result)
+        self.assertEqual(self.pool.submit(lambda x: 2*x, 4).result(), 8)
+
+    def test_completed(self):
+        job = WorkerPool.Job.completed(5)
+        self.assertTrue(job.done())
+        self.assertEqual(job.result(), 5)
+
+class PipelineTests(unittest.TestCase):
+    def counter(self, stop=None):
+        count = [0]
+        def produce():
+            count[0] += 1
+            if count[0] == stop:
+                return None
+            return count[0]
+        return produce, count
+
+    def test_depth(self):
+        produce, count = self.counter()
+        pipeline = Pipeline.Pipeline(produce, 3)
+        try:
+            # The producer fills the queue and one more item waits to go in
+            time.sleep(0.1)
+            self.assertEqual(len(pipeline), 3)
+            self.assertEqual(count[0], 4)
+            self.assertEqual([pipeline.get(1.) for i in range(5)], [1, 2, 3, 4, 5])
+        finally:
+            pipeline.stop()
+        # Nothing is produced after stop()
+        stopped = count[0]
+        time.sleep(0.05)
+        self.assertEqual(count[0], stopped)
+        self.assertEqual(len(pipeline), 0)
+
+    def test_end(self):
+        produce, count = self.counter(stop=3)
+        pipeline = Pipeline.Pipeline(produce, 5)
+        self.assertEqual([pipeline.get(1.) for i in range(3)], [1, 2, None])
+        self.assertEqual(pipeline.get(0.05), None)
+        self.assertEqual(count[0], 3)
+        pipeline.stop()
+
+    def test_error(self):
+        produce, count = self.counter()
+        def failing():
+            if produce() == 2:
+                raise ZeroDivisionError()
+            return count[0]
+        pipeline = Pipeline.Pipeline(failing, 2)
+        self.assertEqual(pipeline.get(1.), 1)
+        self.assertRaises(ZeroDivisionError, pipeline.get, 1.)
+        pipeline.stop()
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.
+        self.tick = 0.
+        self.sleeps = []
+
+    def clock(self):
+        self.now += self.tick
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class Timestamp:
+    def __init__(self, twsec, tfsec):
+        self.twsec = twsec
+        self.tfsec = tfsec
+
+class ThrottleTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.throttle = Throttle.Throttle(self.clock.clock, self.clock.sleep)
+        self.timestamp = Timestamp(1.5e9, 0.25)
+        self.throttle.reset(self.timestamp)
+
+    def advance(self, seconds):
+        self.timestamp = Timestamp(self.timestamp.twsec, self.timestamp.tfsec + seconds)
+
+    def test_processing_time_is_absorbed(self):
+        for i in range(100):
+            # Generating and pushing take 30% of each packet
+            self.clock.now += 0.003
+            self.advance(0.01)
+            self.assertEqual(self.throttle.wait(self.timestamp), 0.)
+        self.assertAlmostEqual(self.clock.now, 1001., 9)
+        self.assertAlmostEqual(self.clock.sleeps[-1], 0.007, 9)
+        self.assertAlmostEqual(self.throttle.rate_error(self.timestamp), 0., 3)
+        self.assertEqual(self.throttle.late, 0)
+
+    def test_catch_up(self):
+        self.clock.now += 0.45
+        self.advance(0.1)
+        self.assertAlmostEqual(self.throttle.wait(self.timestamp), 0.35, 9)
+        self.assertTrue(self.throttle.rate_error(self.timestamp) < 0)
+        # Later packets go out at once until the stream is back on schedule
+        for i in range(3):
+            self.advance(0.1)
+            self.assertTrue(self.throttle.wait(self.timestamp) > 0)
+        self.advance(0.1)
+        self.assertEqual(self.throttle.wait(self.timestamp), 0.)
+        self.assertEqual(self.throttle.late, 4)
+        self.assertEqual(self.throttle.resyncs, 0)
+        self.assertAlmostEqual(self.clock.now, 1000.5, 9)
+
+    def test_resync(self):
+        self.clock.now += 5.
+        self.advance(0.1)
+        self.throttle.wait(self.timestamp)
+        self.assertEqual(self.throttle.resyncs, 1)
+        self.advance(0.1)
+        self.assertEqual(self.throttle.wait(self.timestamp), 0.)
+        self.assertAlmostEqual(self.clock.now, 1005.1, 9)
+
+    def test_clock_steps(self):
+        for i in range(3):
+            self.advance(0.1)
+            self.throttle.wait(self.timestamp)
+        # The clock steps forward by a minute: the stream is re-anchored
+        # rather than bursting to catch up
+        self.clock.now += 60.
+        self.advance(0.1)
+        self.throttle.wait(self.timestamp)
+        self.assertEqual(self.throttle.resyncs, 1)
+        self.advance(0.1)
+        self.assertEqual(self.throttle.wait(self.timestamp), 0.)
+        self.assertAlmostEqual(self.clock.sleeps[-1], 0.1, 9)
+        # and back by an hour: the next packet waits one packet, not an hour
+        self.clock.now -= 3600.
+        self.advance(0.1)
+        self.assertEqual(self.throttle.wait(self.timestamp), 0.)
+        self.assertEqual(self.throttle.resyncs, 2)
+        self.assertAlmostEqual(self.clock.sleeps[-1], 0.1, 9)
+        self.advance(0.1)
+        self.throttle.wait(self.timestamp)
+        self.assertAlmostEqual(self.clock.sleeps[-1], 0.1, 9)
+        self.assertEqual(self.throttle.late, 1)
+
+    def test_monotonic_clock(self):
+        # The default clock is monotonic on python 2 as well
+        clock = Throttle._clock
+        self.assertFalse(clock is time.time)
+        first = clock()
+        self.assertTrue(clock() >= first)
+
+    def test_spin(self):
+        self.throttle.spin = True
+        self.clock.tick = 1e-5
+        self.advance(0.01)
+        self.throttle.wait(self.timestamp)
+        self.assertAlmostEqual(self.clock.sleeps[-1], 0.01 - self.throttle.SPIN_THRESHOLD, 4)
+        self.assertTrue(1000.01 <= self.clock.now < 1000.01 + 2e-5)
+        # Short waits only spin
+        self.advance(0.001)
+        self.throttle.wait(self.timestamp)
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertTrue(1000.011 <= self.clock.now < 1000.011 + 2e-5)
+
+class AutotuneTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    # Run packets through the tuner until it settles, each costing
+    # per_packet + per_sample*xfer_len seconds
+    def tune(self, tuner, per_packet, per_sample):
+        sizes = []
+        while not tuner.done:
+            sizes.append(tuner.xfer_len)
+            tuner.resume()
+            self.clock.now += per_packet + per_sample*tuner.xfer_len
+            tuner.measure(tuner.xfer_len)
+            self.assertTrue(len(sizes) < 1000)
+        return sizes
+
+    def test_throughput(self):
+        tuner = Autotune.Tuner("throughput", 1e6, clock=self.clock.clock)
+        sizes = self.tune(tuner, 100e-6, 10e-9)
+        self.assertEqual(sorted(set(sizes)), tuner.candidates)
+        self.assertEqual(tuner.candidates[-1], Autotune.Tuner.MAX_XFER_LEN)
+        # 100 us of overhead is 7% of a 2^17 sample packet and 4% of a 2^18
+        # sample one: close enough that the smaller one is chosen
+        self.assertEqual(tuner.xfer_len, 2**17)
+        per_packet, per_sample = tuner.model()
+        self.assertAlmostEqual(per_packet, 100e-6, 9)
+        self.assertAlmostEqual(per_sample, 10e-9, 12)
+        # With little overhead a much smaller packet does as well
+        tuner = Autotune.Tuner("throughput", 1e6, clock=self.clock.clock)
+        self.tune(tuner, 1e-6, 10e-9)
+        self.assertEqual(tuner.xfer_len, 2048)
+
+    def test_latency(self):
+        # Packets span 1 us per sample and take 0.1 us per sample to make;
+        # 2^13 samples fit in 10 ms, 2^14 do not
+        tuner = Autotune.Tuner("latency", 1e6, 0.01, clock=self.clock.clock)
+        sizes = self.tune(tuner, 50e-6, 0.1e-6)
+        self.assertEqual(tuner.xfer_len, 2**13)
+        self.assertTrue(tuner.latency(tuner.xfer_len) <= 0.01)
+        # Tuning starts at the largest size that spans no more than the
+        # budget and stops at the first that fits
+        self.assertEqual(set(sizes), set([2**13]))
+        tuner = Autotune.Tuner("latency", 1e6, 0.01, clock=self.clock.clock)
+        sizes = self.tune(tuner, 2e-3, 0.1e-6)
+        self.assertEqual(sizes[0], 2**13)
+        self.assertEqual(tuner.xfer_len, 2**12)
+        self.assertEqual(max(sizes), 2**13)
+        # A budget too small for any size gets the smallest
+        tuner = Autotune.Tuner("latency", 1e6, 1e-5, clock=self.clock.clock)
+        self.tune(tuner, 50e-6, 0.1e-6)
+        self.assertEqual(tuner.xfer_len, Autotune.Tuner.MIN_XFER_LEN)
+
+    def test_measure(self):
+        tuner = Autotune.Tuner("throughput", 1e6, max_duration=0.001, clock=self.clock.clock)
+        self.assertEqual(tuner.candidates, [64, 128, 256, 512])
+        # Packets of another size, or without a start, are not counted
+        tuner.resume()
+        tuner.measure(1000)
+        tuner.measure(64)
+        self.assertEqual(tuner._times, [])
+        self.assertRaises(ValueError, Autotune.Tuner, "off", 1e6)
+
+class StatsTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.stats = Stats.Counters(clock=self.clock.clock)
+
+    def test_laps(self):
+        self.clock.now += 0.25
+        self.assertAlmostEqual(self.stats.lap(), 0.25)
+        self.clock.now += 0.5
+        self.assertAlmostEqual(self.stats.lap(), 0.5)
+        self.assertAlmostEqual(self.stats.elapsed(), 0.75)
+        self.assertEqual(self.stats.now, self.clock.now)
+
+    def test_rate(self):
+        self.assertEqual(self.stats.rate(), 0.0)
+        self.stats.samples = 5000
+        self.clock.now += 2.
+        self.stats.lap()
+        self.assertAlmostEqual(self.stats.rate(), 2500.)
+        self.assertTrue("2500.0 sps (configured 5000.0)" in self.stats.summary(5000.))
+
+    def test_timed(self):
+        # The loop counts down and times the packet that ends each batch,
+        # which counts for the whole batch
+        timed = []
+        for i in range(20):
+            self.stats.countdown -= 1
+            timed.append(not self.stats.countdown)
+            if timed[-1]:
+                self.stats.timed()
+                self.stats.batch(100)
+        self.assertEqual([i for i in range(20) if timed[i]], [7, 15])
+        self.assertEqual(self.stats.timed_packets, 2)
+        self.assertEqual(self.stats.packets, 16)
+        self.assertEqual(self.stats.samples, 1600)
+        # Stage times measured on the timed packets stand for all of them
+        self.assertAlmostEqual(self.stats.scaled(0.3), 2.4)
+        # and stopping counts the batch in progress
+        self.stats.flush(100)
+        self.assertEqual(self.stats.packets, 20)
+        self.assertEqual(self.stats.samples, 2000)
+        self.assertEqual(self.stats.countdown, self.stats.interval)
+
+    def test_occupancy(self):
+        self.assertEqual(self.stats.occupancy(), 0.)
+        self.assertFalse("pipeline" in self.stats.summary(5000.))
+        self.stats.pipeline_packets = 4
+        self.stats.pipeline_ready = 10
+        self.assertAlmostEqual(self.stats.occupancy(), 2.5)
+        self.assertTrue("pipeline 2.5 packets ready" in self.stats.summary(5000.))
+
+    def test_reset(self):
+        self.stats.packets = 3
+        self.stats.generate_time = 1.
+        self.clock.now += 1.
+        self.stats.lap()
+        self.stats.reset()
+        self.assertEqual(self.stats.packets, 0)
+        self.assertEqual(self.stats.generate_time, 0.)
+        self.assertEqual(self.stats.elapsed(), 0.)
+
+class FileSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.fbuf = np.empty(64, dtype=np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self, name, data, header=b""):
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            f.write(header)
+            data.tofile(f)
+        return path
+
+    def test_raw_float_slices(self):
+        data = np.arange(10, dtype=np.float32)
+        source = FileSource.FileSource(self._write("x.raw", data))
+        self.assertEqual(len(source), 10)
+        block = source.read(4, 1, self.fbuf, True)
+        np.testing.assert_array_equal(block, data[:4])
+        # Handed out straight from the mapping, not copied
+        self.assertFalse(np.may_share_memory(block, self.fbuf))
+
+    def test_raw_int16(self):
+        data = np.array([-32768, -1, 0, 1, 32767], dtype=np.int16)
+        source = FileSource.FileSource(self._write("x.i16", data), "int16")
+        block = source.read(5, 1, self.fbuf, True)
+        self.assertEqual(block.dtype, np.float32)
+        np.testing.assert_array_equal(block, data.astype(np.float32))
+
+    def test_loop(self):
+        data = np.arange(5, dtype=np.float32)
+        source = FileSource.FileSource(self._write("x.raw", data))
+        blocks = [source.read(3, 1, self.fbuf, True).copy() for i in range(4)]
+        np.testing.assert_array_equal(np.concatenate(blocks), np.resize(data, 12))
+        # A packet longer than the whole file repeats it
+        np.testing.assert_array_equal(source.read(12, 1, self.fbuf, True), np.resize(np.roll(data, -2), 12))
+
+    def test_end_of_file(self):
+        data = np.arange(5, dtype=np.float32)
+        source = FileSource.FileSource(self._write("x.raw", data))
+        np.testing.assert_array_equal(source.read(3, 1, self.fbuf, False), data[:3])
+        np.testing.assert_array_equal(source.read(3, 1, self.fbuf, False), data[3:])
+        self.assertEqual(source.read(3, 1, self.fbuf, False), None)
+        # Switching looping on starts over
+        np.testing.assert_array_equal(source.read(3, 1, self.fbuf, True), data[:3])
+
+    def test_real_as_complex(self):
+        data = np.arange(5, dtype=np.float32)
+        source = FileSource.FileSource(self._write("x.raw", data))
+        # Each real value becomes one I/Q pair, with a zero imaginary part
+        block = source.read(3, 2, self.fbuf, True)
+        np.testing.assert_array_equal(block, [0, 0, 1, 0, 2, 0])
+        # Across the end of the file, and from int16 data
+        np.testing.assert_array_equal(source.read(4, 2, self.fbuf, True), [3, 0, 4, 0, 0, 0, 1, 0])
+        source = FileSource.FileSource(self._write("x.i16", data.astype(np.int16)), "int16")
+        np.testing.assert_array_equal(source.read(4, 2, self.fbuf, False), [0, 0, 1, 0, 2, 0, 3, 0])
+        np.testing.assert_array_equal(source.read(4, 2, self.fbuf, False), [4, 0])
+        self.assertEqual(source.read(4, 2, self.fbuf, False), None)
+
+    def test_blue(self):
+        data = np.arange(8, dtype=">i2")
+        header = bytearray(FileSource.BLUE_HEADER)
+        header[0:12] = b"BLUEIEEEIEEE"
+        header[32:48] = struct.pack(">dd", FileSource.BLUE_HEADER, data.nbytes)
+        header[48:54] = struct.pack(">i", 1000) + b"CI"
+        header[264:272] = struct.pack(">d", 1e-3)
+        source = FileSource.FileSource(self._write("x.tmp", data, bytes(header)))
+        self.assertTrue(source.complex)
+        self.assertAlmostEqual(source.sample_rate, 1000.)
+        np.testing.assert_array_equal(source.read(4, 2, self.fbuf, True), np.arange(8))
+
+    def test_sigmf(self):
+        data = np.arange(6, dtype="<f4")
+        self._write("x.sigmf-data", data)
+        with open(os.path.join(self.dir, "x.sigmf-meta"), "w") as f:
+            json.dump({"global":{"core:datatype":"cf32_le", "core:sample_rate":48000.}, "captures":[], "annotations":[]}, f)
+        for name in ("x.sigmf-data", "x.sigmf-meta"):
+            source = FileSource.FileSource(os.path.join(self.dir, name))
+            self.assertTrue(source.complex)
+            self.assertEqual(source.sample_rate, 48000.)
+            np.testing.assert_array_equal(source.read(3, 2, self.fbuf, True), data)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, FileSource.FileSource, self._write("empty", np.zeros(0, np.float32)))
+        self.assertRaises(ValueError, FileSource.FileSource, self._write("x.raw", np.zeros(4, np.float32)), "float64")
+        self.assertRaises((IOError, OSError), FileSource.FileSource, os.path.join(self.dir, "missing"))
+
+class ModulationTests(unittest.TestCase):
+    SAMPLE_RATE = 48000.
+
+    def _modulator(self, shape, message, frequency=5000., message_frequency=500., index=0.5):
+        return Modulation.Modulator(Waveform.Waveform(), shape, message, AMP, frequency, message_frequency,
+                                    index, 0.35, self.SAMPLE_RATE)
+
+    def test_continuity(self):
+        for shape in Modulation.SHAPES:
+            for message in ("tone", "lrs"):
+                for spa in (1, 2):
+                    whole = self._modulator(shape, message).read(3000, spa)
+                    modulator = self._modulator(shape, message)
+                    blocks = [modulator.read(n, spa) for n in (1000, 1, 999, 1000)]
+                    np.testing.assert_allclose(np.concatenate(blocks), whole, rtol=0, atol=AMP*1e-6,
+                                               err_msg="%s %s" % (shape, message))
+
+    def test_restore(self):
+        # Blocks read after a saved state are read again after restoring it
+        for shape in Modulation.SHAPES:
+            for message in ("tone", "lrs"):
+                modulator = self._modulator(shape, message)
+                modulator.read(700, 1)
+                state = modulator.state()
+                ahead = [modulator.read(n, 1).copy() for n in (500, 1300)]
+                modulator.restore(state)
+                again = [modulator.read(n, 1) for n in (500, 1300)]
+                np.testing.assert_array_equal(np.concatenate(again), np.concatenate(ahead),
+                                              err_msg="%s %s" % (shape, message))
+
+    def test_am(self):
+        iq = self._modulator("am", "tone").read(N, 2).astype(np.float64).view(np.complex128)
+        t = np.arange(N)/self.SAMPLE_RATE
+        np.testing.assert_allclose(np.abs(iq), AMP*(1 + 0.5*np.sin(2*np.pi*500.*t)), rtol=1e-5)
+
+    def test_fm(self):
+        iq = self._modulator("fm", "tone", index=2.).read(N, 2).astype(np.float64).view(np.complex128)
+        frequency = np.angle(iq[1:]*np.conj(iq[:-1]))*self.SAMPLE_RATE/(2*np.pi)
+        t = np.arange(N - 1)/self.SAMPLE_RATE
+        np.testing.assert_allclose(frequency, 5000. + 1000.*np.sin(2*np.pi*500.*t), rtol=0, atol=1.)
+
+    def test_psk_symbols(self):
+        # At baseband, the symbol centres fall in the quadrant of their bits
+        samples_per_symbol = 96
+        waveform = Waveform.Waveform()
+        for shape, bits_per_symbol in (("bpsk", 1), ("qpsk", 2)):
+            modulator = self._modulator(shape, "lrs", frequency=0.)
+            iq = modulator.read(200*samples_per_symbol, 2).astype(np.float64).view(np.complex128)
+            centres = iq[::samples_per_symbol]
+            # Symbols are drawn from SPAN - 1 before the first sample
+            bits = waveform.lrsBits(1, (203 + Modulation.SPAN)*bits_per_symbol)[0]
+            bits = bits[(Modulation.SPAN - 1)*bits_per_symbol:].astype(bool)
+            np.testing.assert_array_equal(centres.real < 0, bits[0::bits_per_symbol][:200])
+            if shape == "qpsk":
+                np.testing.assert_array_equal(centres.imag < 0, bits[1::2][:200])
+            else:
+                np.testing.assert_allclose(centres.imag, 0., atol=AMP*1e-5)
+
+    def test_pulse(self):
+        pulse = Modulation.rootRaisedCosine(0.35)
+        self.assertEqual(len(pulse), 2*Modulation.SPAN*Modulation.OVERSAMPLE + 1)
+        self.assertTrue(np.all(np.isfinite(pulse)))
+        np.testing.assert_allclose(pulse, pulse[::-1])
+        self.assertAlmostEqual(np.sum(pulse[::Modulation.OVERSAMPLE]**2), 1.)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, self._modulator, "ook", "tone")
+        self.assertRaises(ValueError, self._modulator, "am", "speech")
+        self.assertRaises(ValueError, self._modulator, "am", "tone", message_frequency=0.)
+        self.assertRaises(ValueError, self._modulator, "am", "tone", message_frequency=self.SAMPLE_RATE)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,6 +41,38 @@ class Waveforms(object):
             cxi=axi
         return outbuff
     
+    def generate_sincos(self, amp, n, p=0, dp=0, spa=1):
+        outbuff = range(n*abs(spa))
+        cxr = amp*math.cos(p*TWOPI)
+        cxi = amp*math.sin(p*TWOPI)
+        dxr = math.cos(dp*TWOPI)
+        dxi = math.sin(dp*TWOPI)
+        if spa==2:
+            for i in range(0, n*2, 2):
+                outbuff[i] = cxr
+                outbuff[i+1] = cxi
+                axr = (cxr*dxr) - (cxi*dxi)
+                axi = (cxr*dxi) + (cxi*dxr)
+                cxr=axr
+                cxi=axi
+        elif spa==1:
+            for i in range(n):
+                outbuff[i] = cxi
+                axr = (cxr*dxr) - (cxi*dxi)
+                axi = (cxr*dxi) + (cxi*dxr)
+                cxr=axr
+                cxi=axi
+        elif spa==-1:
+            for i in range(n):
+                outbuff[i] = amp*math.sin(p*TWOPI)
+                p += dp
+        elif spa==-2:
+            for i in range(0, n*2, 2):
+                outbuff[i] = amp*math.cos(p*TWOPI)
+                outbuff[i+1] = amp*math.sin(p*TWOPI)
+                p += dp
+        return outbuff
+    
     def generate_lrs(self, magnitude, n, spa=1, lrs=1):
         outbuff = range(n*spa)
         factor = (magnitude/2.0/self.B1G)
@@ -117,3 +149,59 @@ class Waveforms(object):
             fp += dp
             
         return outbuff
+    
+    def generate_pulse(self, amp, n, p=0, dp=0, spa=1):
+        outbuff = range(n*spa)
+        value = 0.0
+        famp = float(amp)
+        
+        for i in range(0, n*spa, spa):
+            if p >= 1.0:
+                value = famp
+                p -= 1.0
+            else:
+                value = 0.0
+            outbuff[i] = value
+            if spa == 2:
+                outbuff[i+1] = value
+            p += dp
+            
+        return outbuff
+    
+    def generate_constant(self, amp, n, spa=1):
+        return [float(amp)]*(n*spa)
+    
+    def generate_ramp(self, amp, n, spa=1, data=0):
+        outbuff = range(n*spa)
+        for i in range(0, n*spa, spa):
+            outbuff[i] = data
+            if spa == 2:
+                outbuff[i+1] = data
+            data = data + 1
+            if data >= amp:
+                data = int(-amp)
+        return outbuff, data
+    
+    def generate_whitenoise(self, sdev, n, spa=1, seed=123456789):
+        A = 67081293.0
+        BI = 14181771.0/67108864.0
+        T26 = 67108864.0
+        outbuff = range(n*spa)
+        factor = -2.0 / math.log(10.0)
+        sis = float(seed)/T26
+        i = 0
+        while i < n*spa:
+            sis = sis*A + BI
+            sis = sis - float(int(sis))
+            v1 = sis+sis-1
+            sis = sis*A + BI
+            sis = sis - float(int(sis))
+            v2 = sis+sis-1
+            sum1 = v1*v1 + v2*v2
+            if sum1 >= 1.0 or sum1 < 1e-20: continue
+            sum1 = sdev * math.sqrt(factor*math.log(sum1)/sum1)
+            outbuff[i] = v1*sum1
+            if (i+1) < n*spa:
+                outbuff[i+1] = v2*sum1
+            i += 2
+        return outbuff, int(sis*T26)